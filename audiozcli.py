@@ -0,0 +1,265 @@
+"""Headless batch downloader, no Qt needed.
+
+Takes plugin URLs and/or search terms and downloads them with a fixed number
+of releases in flight. Every event is printed to stdout as one JSON object per
+line, so a wrapper script can follow along:
+
+    python audiozcli.py --concurrency 3 https://audioz.download/software/... "some plugin"
+    python audiozcli.py --file batch.txt --extract > progress.jsonl
+
+Credentials come from settings.json (shared with the GUI) unless given on the
+command line or through AUDIOZ_COOKIE / RD_TOKEN.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from audiozcore import (
+    Settings,
+    HttpCache,
+    ResolutionCache,
+    TransferRegistry,
+    JobStore,
+    MetricsServer,
+    DownloadHooks,
+    ReleaseDownloader,
+    make_session,
+    search_page,
+    extract_release,
+    tracer,
+    metrics,
+)
+
+class JsonEmitter:
+    """Writes one JSON event per line, progress is throttled per job"""
+
+    def __init__(self, stream=sys.stdout, progress_interval=1.0, verbose=False):
+        self.stream = stream
+        self.progress_interval = progress_interval
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.last_progress = {}
+
+    def emit(self, event, **fields):
+        line = json.dumps({"time": round(time.time(), 3), "event": event, **fields})
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def hooks(self, job_id):
+        def log(message, level):
+            if self.verbose or level in ("ERROR", "WARNING", "SUCCESS"):
+                self.emit("log", job=job_id, level=level, message=message)
+
+        def progress(filename, job, current, total):
+            now = time.monotonic()
+            key = (job, filename)
+            if current < total and now - self.last_progress.get(key, 0) < self.progress_interval:
+                return
+            self.last_progress[key] = now
+            self.emit("progress", job=job, file=filename, bytes=current, total=total)
+
+        return DownloadHooks(
+            log=log,
+            status=lambda job, status: self.emit("status", job=job, status=status),
+            progress=progress,
+            file_started=lambda filename, job: self.emit("file", job=job, file=filename),
+            part_progress=lambda job, part, parts: self.emit("part", job=job, part=part, parts=parts),
+        )
+
+def is_plugin_url(item):
+    return item.startswith("http://") or item.startswith("https://")
+
+def expand_items(items, settings, per_term, emitter, http_cache):
+    """Search terms are replaced by the URLs of their first results"""
+    urls = []
+    session = None
+    for item in items:
+        if is_plugin_url(item):
+            urls.append(item)
+            continue
+        session = session or make_session(settings.cookie_string)
+        try:
+            results = search_page(session, item, settings.base_url, 1, http_cache)
+        except Exception as e:
+            emitter.emit("search_failed", term=item, error=str(e))
+            continue
+        picked = results[:per_term]
+        emitter.emit("search", term=item, results=len(results), picked=[r["url"] for r in picked])
+        urls.extend(r["url"] for r in picked)
+    # The same release can come from several terms
+    return list(dict.fromkeys(urls))
+
+def run_job(job_id, url, args, settings, emitter, shared, downloaders, grouped_links=None):
+    http_cache, resolution_cache, transfers, job_store = shared
+    downloader = ReleaseDownloader(
+        url,
+        settings.cookie_string,
+        settings.base_url,
+        settings.rd_access_token,
+        None,
+        job_id,
+        settings.max_retries,
+        settings.retry_delay,
+        http_cache,
+        grouped_links,
+        resolution_cache,
+        transfers,
+        emitter.hooks(job_id),
+        job_store,
+    )
+    downloaders[job_id] = downloader
+    emitter.emit("job_started", job=job_id, url=url)
+    started = time.monotonic()
+    try:
+        ok = downloader.run()
+    except Exception as e:
+        emitter.emit("log", job=job_id, level="ERROR", message=str(e))
+        ok = False
+
+    if ok and args.extract and downloader.grouped_links:
+        folders = extract_release(
+            downloader.grouped_links,
+            args.delete_archives,
+            lambda message, level: emitter.emit("log", job=job_id, level=level, message=message),
+        )
+        emitter.emit("extracted", job=job_id, folders=folders)
+        if job_store:
+            job_store.update_job(job_id, extract_state="done" if folders else "failed")
+
+    emitter.emit(
+        "job_finished",
+        job=job_id,
+        url=url,
+        ok=ok,
+        cancelled=not downloader.is_running,
+        failed_parts=downloader.failed_parts,
+        seconds=round(time.monotonic() - started, 2),
+    )
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download audioz releases without the GUI.")
+    parser.add_argument("items", nargs="*", help="plugin URLs or search terms")
+    parser.add_argument("--file", help="read more items from this file, one per line, # starts a comment")
+    parser.add_argument("--concurrency", type=int, default=2, help="releases downloaded at the same time")
+    parser.add_argument("--results-per-term", type=int, default=1, help="search results downloaded for each term")
+    parser.add_argument("--extract", action="store_true", help="extract each release once it completes")
+    parser.add_argument("--delete-archives", action="store_true", help="delete the parts after extracting")
+    parser.add_argument("--progress-interval", type=float, default=1.0, help="seconds between progress events per file")
+    parser.add_argument("--cookie", default=os.environ.get("AUDIOZ_COOKIE"))
+    parser.add_argument("--rd-token", default=os.environ.get("RD_TOKEN"))
+    parser.add_argument("--base-url")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk page cache")
+    parser.add_argument("--verbose", action="store_true", help="also print INFO and DEBUG log lines")
+    parser.add_argument("--job-store", help="record jobs and parts in this SQLite file")
+    parser.add_argument("--resume", action="store_true", help="also run the unfinished jobs recorded in --job-store")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this localhost port while running")
+    parser.add_argument("--trace", help="write per-stage timings to this file in Chrome trace format")
+    args = parser.parse_args(argv)
+
+    items = list(args.items)
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            items += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if args.resume and not args.job_store:
+        parser.error("--resume needs --job-store")
+    if not items and not args.resume:
+        parser.error("give at least one plugin URL or search term")
+
+    settings = Settings()
+    if args.cookie:
+        settings.cookie_string = args.cookie
+    if args.rd_token:
+        settings.rd_access_token = args.rd_token
+    if args.base_url:
+        settings.base_url = args.base_url.rstrip("/")
+    if not settings.cookie_string or not settings.rd_access_token:
+        parser.error("an audioz cookie and a Real-Debrid token are needed (settings.json, --cookie/--rd-token)")
+
+    emitter = JsonEmitter(progress_interval=args.progress_interval, verbose=args.verbose)
+    tracer.enabled = bool(args.trace)
+    http_cache = None
+    if settings.http_cache_enabled and not args.no_cache:
+        http_cache = HttpCache(max_bytes=settings.http_cache_size_mb * 1024 * 1024)
+    resolution_cache = ResolutionCache(ttl=settings.resolution_ttl_hours * 3600)
+    job_store = None
+    jobs = []
+    if args.job_store:
+        job_store = JobStore(args.job_store)
+        if args.resume:
+            jobs = [
+                (job["id"], job["url"], job["links"])
+                for job in job_store.load_jobs()
+                if job["state"] not in JobStore.FINISHED_STATES
+            ]
+        job_store.start()
+    shared = (http_cache, resolution_cache, TransferRegistry(), job_store)
+
+    # Job IDs must stay unique across runs that share a job store
+    run_id = int(time.time())
+    urls = expand_items(items, settings, args.results_per_term, emitter, http_cache)
+    resumed_urls = {url for _, url, _ in jobs}
+    for i, url in enumerate(urls, 1):
+        if url not in resumed_urls:
+            jobs.append((f"job{run_id}_{i}", url, None))
+            if job_store:
+                job_store.add_job(jobs[-1][0], url, url)
+    emitter.emit("batch_started", jobs=len(jobs), resumed=len(resumed_urls), concurrency=args.concurrency)
+
+    downloaders = {}
+
+    def cancel(signum, frame):
+        emitter.emit("cancelling")
+        for downloader in list(downloaders.values()):
+            downloader.stop()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, args.concurrency))
+    signal.signal(signal.SIGINT, cancel)
+    futures = []
+    metrics_server = None
+    if args.metrics_port:
+        # Up before any job starts, a port that is taken only costs the metrics
+        metrics.job_counts = lambda: {
+            "active": sum(f.running() for f in futures),
+            "queued": sum(not f.running() and not f.done() for f in futures),
+        }
+        metrics_server = MetricsServer(metrics, args.metrics_port)
+        try:
+            metrics_server.start()
+            emitter.emit("metrics", url=f"http://127.0.0.1:{metrics_server.port}/metrics")
+        except OSError as e:
+            emitter.emit("metrics_failed", port=args.metrics_port, error=str(e))
+            metrics_server = None
+    futures.extend(
+        pool.submit(run_job, job_id, url, args, settings, emitter, shared, downloaders, links)
+        for job_id, url, links in jobs
+    )
+    completed = 0
+    for future in futures:
+        try:
+            completed += bool(future.result())
+        except Exception:
+            pass
+    pool.shutdown()
+    if metrics_server:
+        metrics_server.stop()
+
+    if http_cache:
+        http_cache.flush()
+    if job_store:
+        job_store.close()
+    if args.trace:
+        tracer.export(args.trace)
+        emitter.emit("trace_summary", file=args.trace, stages=tracer.summary())
+    emitter.emit("batch_finished", jobs=len(jobs), completed=completed)
+    return 0 if jobs and completed == len(jobs) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
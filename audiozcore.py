@@ -0,0 +1,2354 @@
+"""Qt-free search, resolve, download and extract logic shared by the GUI and the CLI"""
+
+import re
+from urllib.parse import urljoin, urlparse
+from collections import defaultdict, OrderedDict, deque
+import os
+import json
+import time
+import zlib
+import hashlib
+import threading
+import queue
+import platform
+import itertools
+import socket
+import bisect
+from array import array
+
+DEFAULT_THEME = {
+    "accent": "#f61e5f",
+    "accent_light": "#ffbde0",
+    "desktop": "#101010",
+    "surface_bg": "#171717",
+    "surface_area": "#0d0d0d",
+    "control_bg": "#101010",
+    "detail_view_bg": "#202020",
+    "browser_bar": "#0d0d0d",
+    "tree_column_head_bg": "#232323",
+    "control_fg": "#a4a4a4",
+    "control_on_fg": "#0d0d0d",
+    "control_off_fg": "#adadad",
+    "control_disabled": "#a8a8a8",
+    "text_disabled": "#4d4d4d",
+    "selection_bg": "#b3b3b3",
+    "selection_fg": "#0d0d0d",
+    "surface_highlight": "#222222",
+    "main_focus": "#2a2a2a",
+    "control_contrast_frame": "#000000",
+    "control_selection_frame": "#373737",
+    "view_control_on": "#929292",
+    "view_control_off": "#747474",
+    "scrollbar_inner_handle": "#404040",
+    "scrollbar_hover": "#5a5a5a",
+    "alert": "#848484",
+}
+
+LOG_COLORS = {
+    "INFO": "#a4a4a4",
+    "SUCCESS": "#4CAF50",
+    "WARNING": "#FF9800",
+    "ERROR": "#f61e5f",
+    "DEBUG": "#2196F3",
+    "DOWNLOAD": "#BD3BD4",
+}
+
+SETTINGS_FILE = "settings.json"
+DOWNLOADS_FOLDER = "downloads"
+CACHE_FOLDER = "cache"
+LOGS_FOLDER = "logs"
+LOG_FILE = os.path.join(LOGS_FOLDER, "audioz.log")
+TRACE_FILE = os.path.join(LOGS_FOLDER, "trace.json")
+RESULTS_PER_PAGE = 30
+
+SEARCH_CACHE_FILE = os.path.join(CACHE_FOLDER, "search_cache.json")
+CATALOG_FILE = os.path.join(CACHE_FOLDER, "catalog.db")
+JOB_STORE_FILE = "jobs.db"
+RESOLUTION_CACHE_FILE = os.path.join(CACHE_FOLDER, "resolutions.json")
+
+# Overridden by benchmarks/e2e.py to point at a local stand-in
+RD_API_URL = "https://api.real-debrid.com/rest/1.0"
+
+# Seconds a cached response is served without asking the server again
+HTTP_CACHE_TTLS = {
+    "search": 10 * 60,
+    "listing": 0,
+    "plugin": 60 * 60,
+    "peeplink": 24 * 60 * 60,
+}
+
+class Settings:
+    def __init__(self):
+        self.cookie_string = ""
+        self.rd_access_token = ""
+        self.base_url = "https://audioz.download"
+        self.theme = DEFAULT_THEME.copy()
+        self.log_colors = LOG_COLORS.copy()
+        self.auto_extract = True
+        self.auto_delete = True
+        self.download_strategy = "auto"
+        self.max_retries = 3
+        self.retry_delay = 5
+        self.max_connections = 3
+        self.http_cache_enabled = True
+        self.http_cache_size_mb = 100
+        self.search_cache_ttl_minutes = 60
+        self.search_cache_persist = True
+        self.prefetch_enabled = True
+        self.prefetch_previous = False
+        self.prefetch_concurrency = 2
+        self.deep_search_pages = 5
+        self.deep_search_concurrency = 3
+        self.sync_max_pages = 20
+        self.sync_delay = 2
+        self.sync_interval_minutes = 0
+        self.show_thumbnails = True
+        self.speculative_resolve = True
+        self.resolution_ttl_hours = 24
+        self.log_max_lines = 5000
+        self.log_to_file = True
+        self.api_enabled = False
+        self.api_port = 8765
+        self.api_token = ""
+        self.throughput_minutes = 10
+        self.trace_enabled = False
+        self.metrics_enabled = False
+        self.metrics_port = 9765
+        self.load()
+
+    def load(self):
+        if os.path.exists(SETTINGS_FILE):
+            try:
+                with open(SETTINGS_FILE, "r") as f:
+                    data = json.load(f)
+                    self.cookie_string = data.get("cookie_string", "")
+                    self.rd_access_token = data.get("rd_access_token", "")
+                    self.base_url = data.get("base_url", "https://audioz.download")
+                    self.theme = data.get("theme", DEFAULT_THEME.copy())
+                    self.log_colors = data.get("log_colors", LOG_COLORS.copy())
+                    self.auto_extract = data.get("auto_extract", True)
+                    self.auto_delete = data.get("auto_delete", True)
+                    self.download_strategy = data.get("download_strategy", "auto")
+                    self.max_retries = data.get("max_retries", 3)
+                    self.retry_delay = data.get("retry_delay", 5)
+                    self.max_connections = data.get("max_connections", 3)
+                    self.http_cache_enabled = data.get("http_cache_enabled", True)
+                    self.http_cache_size_mb = data.get("http_cache_size_mb", 100)
+                    self.search_cache_ttl_minutes = data.get("search_cache_ttl_minutes", 60)
+                    self.search_cache_persist = data.get("search_cache_persist", True)
+                    self.prefetch_enabled = data.get("prefetch_enabled", True)
+                    self.prefetch_previous = data.get("prefetch_previous", False)
+                    self.prefetch_concurrency = data.get("prefetch_concurrency", 2)
+                    self.deep_search_pages = data.get("deep_search_pages", 5)
+                    self.deep_search_concurrency = data.get("deep_search_concurrency", 3)
+                    self.sync_max_pages = data.get("sync_max_pages", 20)
+                    self.sync_delay = data.get("sync_delay", 2)
+                    self.sync_interval_minutes = data.get("sync_interval_minutes", 0)
+                    self.show_thumbnails = data.get("show_thumbnails", True)
+                    self.speculative_resolve = data.get("speculative_resolve", True)
+                    self.resolution_ttl_hours = data.get("resolution_ttl_hours", 24)
+                    self.log_max_lines = data.get("log_max_lines", 5000)
+                    self.log_to_file = data.get("log_to_file", True)
+                    self.api_enabled = data.get("api_enabled", False)
+                    self.api_port = data.get("api_port", 8765)
+                    self.api_token = data.get("api_token", "")
+                    self.throughput_minutes = data.get("throughput_minutes", 10)
+                    self.trace_enabled = data.get("trace_enabled", False)
+                    self.metrics_enabled = data.get("metrics_enabled", False)
+                    self.metrics_port = data.get("metrics_port", 9765)
+
+            except Exception as e:
+                print(f"Error loading settings: {e}")
+
+    def save(self):
+        try:
+            data = {
+                "cookie_string": self.cookie_string,
+                "rd_access_token": self.rd_access_token,
+                "base_url": self.base_url,
+                "theme": self.theme,
+                "log_colors": self.log_colors,
+                "auto_extract": self.auto_extract,
+                "auto_delete": self.auto_delete,
+                "download_strategy": self.download_strategy,
+                "max_retries": self.max_retries,
+                "retry_delay": self.retry_delay,
+                "max_connections": self.max_connections,
+                "http_cache_enabled": self.http_cache_enabled,
+                "http_cache_size_mb": self.http_cache_size_mb,
+                "search_cache_ttl_minutes": self.search_cache_ttl_minutes,
+                "search_cache_persist": self.search_cache_persist,
+                "prefetch_enabled": self.prefetch_enabled,
+                "prefetch_previous": self.prefetch_previous,
+                "prefetch_concurrency": self.prefetch_concurrency,
+                "deep_search_pages": self.deep_search_pages,
+                "deep_search_concurrency": self.deep_search_concurrency,
+                "sync_max_pages": self.sync_max_pages,
+                "sync_delay": self.sync_delay,
+                "sync_interval_minutes": self.sync_interval_minutes,
+                "show_thumbnails": self.show_thumbnails,
+                "speculative_resolve": self.speculative_resolve,
+                "resolution_ttl_hours": self.resolution_ttl_hours,
+                "log_max_lines": self.log_max_lines,
+                "log_to_file": self.log_to_file,
+                "api_enabled": self.api_enabled,
+                "api_port": self.api_port,
+                "api_token": self.api_token,
+                "throughput_minutes": self.throughput_minutes,
+                "trace_enabled": self.trace_enabled,
+                "metrics_enabled": self.metrics_enabled,
+                "metrics_port": self.metrics_port,
+            }
+            with open(SETTINGS_FILE, "w") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+
+class LogFileWriter(threading.Thread):
+    """Appends log lines to a size-rotated file from its own thread"""
+
+    def __init__(self, path=LOG_FILE, max_bytes=5 * 1024 * 1024, backups=3):
+        super().__init__(daemon=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = queue.SimpleQueue()
+
+    def write(self, timestamp, level, message):
+        self.queue.put(f"[{timestamp}] [{level}] {message}\n")
+
+    def close(self):
+        self.queue.put(None)
+        self.join(timeout=2)
+
+    def rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def run(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        running = True
+        while running:
+            lines = [self.queue.get()]
+            # Write whatever else piled up in the same call
+            while True:
+                try:
+                    lines.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in lines:
+                running = False
+                lines = [line for line in lines if line is not None]
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                if os.path.getsize(self.path) > self.max_bytes:
+                    self.rotate()
+            except OSError as e:
+                print(f"Error writing log file: {e}")
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+NULL_SPAN = _NullSpan()
+
+class _Span:
+    def __init__(self, tracer, name, job, args):
+        self.tracer = tracer
+        self.name = name
+        self.job = job
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.start, time.perf_counter(), self.job, self.args)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+class Tracer:
+    """Timed spans per stage and job, exported as Chrome trace events.
+
+    While disabled, span() hands back a shared no-op context manager, so the
+    instrumented code pays one attribute check per stage.
+    """
+
+    def __init__(self, enabled=False, max_spans=100000):
+        self.enabled = enabled
+        self.spans = deque(maxlen=max_spans)
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+
+    def span(self, name, job=None, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, job, args)
+
+    def add(self, name, start, end, job=None, args=None):
+        span = (name, start, end, job or threading.current_thread().name, args or {})
+        with self.lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self.lock:
+            self.spans.clear()
+
+    def chrome_trace(self):
+        """Trace-event JSON for chrome://tracing or Perfetto, one track per job"""
+        with self.lock:
+            spans = list(self.spans)
+        tracks = {}
+        events = []
+        for name, start, end, job, args in spans:
+            if job not in tracks:
+                tracks[job] = len(tracks) + 1
+                events.append({
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tracks[job],
+                    "args": {"name": str(job)},
+                })
+            events.append({
+                "name": name,
+                "cat": "audioz",
+                "ph": "X",
+                "ts": round((start - self.origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": 1,
+                "tid": tracks[job],
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self):
+        """stage -> count, p50/p95/max and total in milliseconds"""
+        with self.lock:
+            spans = list(self.spans)
+        durations = defaultdict(list)
+        for name, start, end, job, args in spans:
+            durations[name].append((end - start) * 1000)
+        stats = {}
+        for name, values in durations.items():
+            values.sort()
+            stats[name] = {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "max_ms": round(values[-1], 2),
+                "total_ms": round(sum(values), 2),
+            }
+        return stats
+
+    def format_summary(self):
+        lines = [f"{'stage':<20} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}"]
+        for name, s in sorted(self.summary().items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{name:<20} {s['count']:>6} {s['p50_ms']:>10.1f} {s['p95_ms']:>10.1f} {s['max_ms']:>10.1f}")
+        return "\n".join(lines)
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+tracer = Tracer()
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """Counters, histograms and gauges rendered in the Prometheus text format"""
+
+    HELP = {
+        "audioz_bytes_downloaded_total": ("counter", "Bytes written to disk, by mirror host"),
+        "audioz_throughput_bytes_per_second": ("gauge", "Download rate over the last 10 seconds, all jobs together"),
+        "audioz_jobs": ("gauge", "Jobs by state"),
+        "audioz_rd_requests_total": ("counter", "Real-Debrid unrestrict calls by HTTP status"),
+        "audioz_rd_request_seconds": ("histogram", "Real-Debrid unrestrict call latency"),
+        "audioz_download_retries_total": ("counter", "Part downloads retried after an error"),
+        "audioz_download_fallbacks_total": ("counter", "Restarts without resume and switches to another mirror"),
+        "audioz_extractions_total": ("counter", "Extractions by result"),
+        "audioz_extract_seconds": ("histogram", "Time spent extracting one file of a release"),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {
+            "audioz_rd_request_seconds": Histogram((0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)),
+            "audioz_extract_seconds": Histogram((1, 5, 15, 30, 60, 120, 300, 600)),
+        }
+        self.bytes_total = 0
+        self.samples = deque(maxlen=11)
+        # Set by the app, returns {state: count} when scraped
+        self.job_counts = None
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] += amount
+
+    def observe(self, name, value):
+        with self.lock:
+            self.histograms[name].observe(value)
+
+    def add_bytes(self, host, amount):
+        now = time.monotonic()
+        with self.lock:
+            self.counters[("audioz_bytes_downloaded_total", (("host", host),))] += amount
+            self.bytes_total += amount
+            if not self.samples or now - self.samples[-1][0] >= 1:
+                self.samples.append((now, self.bytes_total))
+
+    def throughput(self):
+        now = time.monotonic()
+        with self.lock:
+            recent = [s for s in self.samples if now - s[0] <= 10]
+            total = self.bytes_total
+        if not recent or now - recent[0][0] < 0.5:
+            return 0.0
+        return (total - recent[0][1]) / (now - recent[0][0])
+
+    def render(self):
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = {
+                name: (h.buckets, list(h.counts), h.sum, h.count)
+                for name, h in self.histograms.items()
+            }
+        values = defaultdict(list)
+        for (name, labels), value in counters:
+            values[name].append((labels, value))
+        values["audioz_throughput_bytes_per_second"].append(((), round(self.throughput(), 1)))
+        if self.job_counts:
+            try:
+                for state, count in sorted(self.job_counts().items()):
+                    values["audioz_jobs"].append(((("state", state),), count))
+            except Exception as e:
+                print(f"Error counting jobs for metrics: {e}")
+
+        lines = []
+        for name, (kind, text) in self.HELP.items():
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                buckets, counts, total, count = histograms[name]
+                cumulative = 0
+                for bound, n in zip(buckets + ("+Inf",), counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum {total:.6f}")
+                lines.append(f"{name}_count {count}")
+                continue
+            for labels, value in values.get(name, []):
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                value = int(value) if float(value).is_integer() else value
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+class ThroughputHistory:
+    """Bytes per second over the last `size` samples, per job and for all jobs together.
+
+    Every series is a fixed array("d") used as a ring, so memory stays flat however long
+    the app runs and a sample costs one store per job.
+    """
+
+    def __init__(self, size=600):
+        self.size = size
+        self.total = array("d", bytes(8 * size))
+        self.jobs = {}
+        self.head = 0
+        self.count = 0
+        self.ticks = 0
+        self.last_seen = {}
+        self.last_bytes = {}
+        self.last_time = None
+
+    def sample(self, job_bytes, now=None):
+        """Record one sample from job_id -> bytes received so far by that job"""
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.last_time if self.last_time is not None else 0
+        self.last_time = now
+        aggregate = 0.0
+        for job_id, received in job_bytes.items():
+            series = self.jobs.get(job_id)
+            if series is None:
+                series = self.jobs[job_id] = array("d", bytes(8 * self.size))
+            # A job seen for the first time only starts counting from here
+            delta = received - self.last_bytes.get(job_id, received)
+            rate = max(delta, 0) / elapsed if elapsed > 0 else 0.0
+            series[self.head] = rate
+            aggregate += rate
+            self.last_seen[job_id] = self.ticks
+        for job_id in list(self.jobs):
+            if job_id in job_bytes:
+                continue
+            if self.ticks - self.last_seen[job_id] >= self.size:
+                # Scrolled out of the window entirely
+                del self.jobs[job_id]
+                del self.last_seen[job_id]
+            else:
+                self.jobs[job_id][self.head] = 0.0
+        self.total[self.head] = aggregate
+        self.last_bytes = dict(job_bytes)
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self.ticks += 1
+
+    def series(self, job_id=None):
+        """Samples of one job or of all jobs together, oldest first"""
+        ring = self.total if job_id is None else self.jobs.get(job_id)
+        if ring is None:
+            return array("d")
+        ordered = ring[self.head:] + ring[:self.head]
+        return ordered[self.size - self.count:]
+
+    def latest(self, job_id=None):
+        ring = self.total if job_id is None else self.jobs.get(job_id)
+        if ring is None or not self.count:
+            return 0.0
+        return ring[self.head - 1]
+
+def format_speed(bytes_per_second):
+    if bytes_per_second <= 0:
+        return ""
+    if bytes_per_second > 1024 * 1024:
+        return f"{bytes_per_second / (1024 * 1024):.1f} MB/s"
+    if bytes_per_second > 1024:
+        return f"{bytes_per_second / 1024:.1f} KB/s"
+    return f"{bytes_per_second:.1f} B/s"
+
+def parse_cookie_string(cookie_str):
+    cookies = {}
+    for part in cookie_str.split(";"):
+        part = part.strip()
+        if "=" in part:
+            name, val = part.split("=", 1)
+            cookies[name.strip()] = val.strip()
+    return cookies
+
+def make_session(cookie_string, session=None):
+    import requests
+
+    session = session or requests.Session()
+    for k, v in parse_cookie_string(cookie_string).items():
+        session.cookies.set(k, v, domain="audioz.download", path="/")
+    return session
+
+class HttpCache:
+    """On-disk cache for audioz/peeplink pages with ETag/Last-Modified revalidation"""
+
+    def __init__(self, folder=None, max_bytes=100 * 1024 * 1024):
+        self.folder = folder or os.path.join(CACHE_FOLDER, "http")
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.folder, "index.json")
+        self.lock = threading.Lock()
+        self.entries = None
+        self.dirty = False
+
+    def load(self):
+        self.entries = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Error loading HTTP cache index: {e}")
+                self.entries = {}
+
+    def save(self):
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.index_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving HTTP cache index: {e}")
+
+    def flush(self):
+        with self.lock:
+            if self.entries is not None and self.dirty:
+                self.save()
+
+    def clear(self):
+        with self.lock:
+            if self.entries is None:
+                self.load()
+            for key in list(self.entries):
+                self._remove(key)
+            self.save()
+
+    def _key(self, method, url, data):
+        raw = json.dumps([method, url, sorted((data or {}).items())], default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.folder, key + ".z")
+
+    def _read(self, key):
+        try:
+            with open(self._body_path(key), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except Exception:
+            return None
+
+    def _remove(self, key):
+        self.entries.pop(key, None)
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def _store(self, key, url, response):
+        body = zlib.compress(response.text.encode("utf-8"), 6)
+        now = time.time()
+        with self.lock:
+            try:
+                os.makedirs(self.folder, exist_ok=True)
+                with open(self._body_path(key), "wb") as f:
+                    f.write(body)
+            except OSError as e:
+                print(f"Error writing HTTP cache entry: {e}")
+                return
+            self.entries[key] = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "stored": now,
+                "accessed": now,
+                "size": len(body),
+            }
+            self._evict()
+            self.save()
+
+    def _evict(self):
+        total = sum(e["size"] for e in self.entries.values())
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["accessed"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.entries[key]["size"]
+            self._remove(key)
+
+    def request(self, session, method, url, kind, data=None, headers=None, timeout=30):
+        """Return the body for url, from disk when fresh or after a 304"""
+        key = self._key(method, url, data)
+        ttl = HTTP_CACHE_TTLS.get(kind, 0)
+        now = time.time()
+
+        with self.lock:
+            # The index is read on first use rather than at startup
+            if self.entries is None:
+                self.load()
+            entry = self.entries.get(key)
+        if entry and now - entry["stored"] < ttl:
+            body = self._read(key)
+            if body is not None:
+                with self.lock:
+                    entry["accessed"] = now
+                    self.dirty = True
+                return body
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        r = session.request(method, url, data=data, headers=request_headers, timeout=timeout)
+        if r.status_code == 304 and entry:
+            body = self._read(key)
+            if body is not None:
+                with self.lock:
+                    entry["stored"] = now
+                    entry["accessed"] = now
+                    self.save()
+                return body
+            # Cached body is gone, fetch it again without validators
+            r = session.request(method, url, data=data, headers=headers, timeout=timeout)
+
+        r.raise_for_status()
+        self._store(key, url, r)
+        return r.text
+
+class SearchCache:
+    """Bounded LRU of parsed search pages keyed by (term, page, base_url)"""
+
+    def __init__(self, max_entries=200, max_bytes=16 * 1024 * 1024, ttl=3600, path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.loaded = False
+
+    @staticmethod
+    def make_key(term, page, base_url):
+        return (" ".join(term.lower().split()), int(page), base_url.rstrip("/").lower())
+
+    def get(self, term, page, base_url):
+        if not self.loaded:
+            self.load()
+        key = self.make_key(term, page, base_url)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["stored"] > self.ttl:
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry["results"]
+
+    def put(self, term, page, base_url, results):
+        if not self.loaded:
+            self.load()
+        key = self.make_key(term, page, base_url)
+        self._remove(key)
+        size = len(json.dumps(results))
+        self.entries[key] = {"stored": time.time(), "results": results, "size": size}
+        self.total_bytes += size
+        while self.entries and (
+            len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.total_bytes -= entry["size"]
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def load(self):
+        self.loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            now = time.time()
+            for term, page, base_url, stored, results in data:
+                if now - stored <= self.ttl:
+                    self.put(term, page, base_url, results)
+                    self.entries[self.make_key(term, page, base_url)]["stored"] = stored
+        except Exception as e:
+            print(f"Error loading search cache: {e}")
+
+    def save(self):
+        if not self.path or not self.loaded:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            data = [
+                [term, page, base_url, entry["stored"], entry["results"]]
+                for (term, page, base_url), entry in self.entries.items()
+            ]
+            with open(self.path, "w") as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"Error saving search cache: {e}")
+
+class Catalog:
+    """Local SQLite index of every search result seen, with ranked full-text search"""
+
+    FIELDS = ("url", "title", "author", "date", "description", "image_url")
+
+    def __init__(self, path=CATALOG_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = None
+        self.has_fts = False
+
+    def _db(self):
+        """Opens the database on first use, call with the lock held"""
+        if self.conn is not None:
+            return self.conn
+        import sqlite3
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                title TEXT,
+                author TEXT,
+                date TEXT,
+                description TEXT,
+                image_url TEXT,
+                first_seen REAL,
+                last_seen REAL
+            )"""
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        try:
+            conn.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    title, author, description,
+                    content='entries', content_rowid='rowid',
+                    tokenize='unicode61 remove_diacritics 2'
+                );
+                CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                    INSERT INTO entries_fts(rowid, title, author, description)
+                    VALUES (new.rowid, new.title, new.author, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                    INSERT INTO entries_fts(entries_fts, rowid, title, author, description)
+                    VALUES ('delete', old.rowid, old.title, old.author, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN
+                    INSERT INTO entries_fts(entries_fts, rowid, title, author, description)
+                    VALUES ('delete', old.rowid, old.title, old.author, old.description);
+                    INSERT INTO entries_fts(rowid, title, author, description)
+                    VALUES (new.rowid, new.title, new.author, new.description);
+                END;
+                """
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, fall back to LIKE matching
+            self.has_fts = False
+        conn.commit()
+        self.conn = conn
+        return conn
+
+    def upsert(self, results):
+        """Insert or refresh results, returns how many URLs were new"""
+        if not results:
+            return 0
+        now = time.time()
+        urls = [r["url"] for r in results]
+        with self.lock:
+            placeholders = ",".join("?" * len(urls))
+            conn = self._db()
+            known = {
+                row[0]
+                for row in conn.execute(
+                    f"SELECT url FROM entries WHERE url IN ({placeholders})", urls
+                )
+            }
+            conn.executemany(
+                """INSERT INTO entries
+                    (url, title, author, date, description, image_url, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    title = excluded.title,
+                    author = excluded.author,
+                    date = excluded.date,
+                    description = excluded.description,
+                    image_url = excluded.image_url,
+                    last_seen = excluded.last_seen""",
+                [
+                    tuple(r.get(field) for field in self.FIELDS) + (now, now)
+                    for r in results
+                ],
+            )
+            conn.commit()
+        return len(set(urls) - known)
+
+    def contains(self, url):
+        with self.lock:
+            row = self._db().execute(
+                "SELECT 1 FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        return row is not None
+
+    def count(self):
+        with self.lock:
+            return self._db().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self._db().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self.lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value)),
+            )
+            conn.commit()
+
+    def search(self, query, limit=200):
+        tokens = re.findall(r"\w+", query.lower())
+        if not tokens:
+            return []
+        columns = ", ".join("e." + field for field in self.FIELDS)
+        with self.lock:
+            conn = self._db()
+            if self.has_fts:
+                match = " ".join(f'"{token}"*' for token in tokens)
+                rows = conn.execute(
+                    f"""SELECT {columns} FROM entries_fts
+                    JOIN entries e ON e.rowid = entries_fts.rowid
+                    WHERE entries_fts MATCH ?
+                    ORDER BY bm25(entries_fts, 10.0, 2.0, 1.0), e.first_seen DESC
+                    LIMIT ?""",
+                    (match, limit),
+                ).fetchall()
+            else:
+                where = " AND ".join("e.title LIKE ?" for _ in tokens)
+                rows = conn.execute(
+                    f"""SELECT {columns} FROM entries e WHERE {where}
+                    ORDER BY e.first_seen DESC LIMIT ?""",
+                    [f"%{token}%" for token in tokens] + [limit],
+                ).fetchall()
+        return [dict(zip(self.FIELDS, row)) for row in rows]
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+class ResolutionCache:
+    """Persistent plugin URL -> grouped mirror links, dropped once every mirror of a part fails"""
+
+    def __init__(self, path=RESOLUTION_CACHE_FILE, ttl=24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = None
+
+    def load(self):
+        self.entries = {}
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            print(f"Error loading resolution cache: {e}")
+            self.entries = {}
+
+    def save(self):
+        if not self.path:
+            return
+        try:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving resolution cache: {e}")
+
+    def get(self, plugin_url):
+        with self.lock:
+            if self.entries is None:
+                self.load()
+            entry = self.entries.get(plugin_url)
+            if not entry:
+                return None
+            if time.time() - entry["stored"] > self.ttl:
+                del self.entries[plugin_url]
+                self.save()
+                return None
+            # JSON object keys are strings, part numbers are ints everywhere else
+            return {
+                base: {int(part): dict(hosts) for part, hosts in parts.items()}
+                for base, parts in entry["links"].items()
+            }
+
+    def put(self, plugin_url, grouped_links):
+        with self.lock:
+            if self.entries is None:
+                self.load()
+            self.entries[plugin_url] = {
+                "stored": time.time(),
+                "links": {
+                    base: {str(part): dict(hosts) for part, hosts in parts.items()}
+                    for base, parts in grouped_links.items()
+                },
+                "failed": {},
+            }
+            self.save()
+
+    def invalidate(self, plugin_url):
+        with self.lock:
+            if self.entries is None:
+                self.load()
+            if self.entries.pop(plugin_url, None):
+                self.save()
+
+    def mark_failed(self, plugin_url, file_base, part_num, host):
+        """Record a dead mirror, returns True when that part has no mirrors left"""
+        with self.lock:
+            if self.entries is None:
+                self.load()
+            entry = self.entries.get(plugin_url)
+            if not entry:
+                return False
+            hosts = entry["links"].get(file_base, {}).get(str(part_num), {})
+            failed = entry["failed"].setdefault(f"{file_base}|{part_num}", [])
+            if host not in failed:
+                failed.append(host)
+            if hosts and set(hosts) <= set(failed):
+                del self.entries[plugin_url]
+                self.save()
+                return True
+            self.save()
+            return False
+
+class JobStore(threading.Thread):
+    """Durable record of download jobs and their parts, written in batches from its own thread"""
+
+    FINISHED_STATES = ("completed", "failed", "cancelled")
+
+    def __init__(self, path=JOB_STORE_FILE, flush_interval=1.0):
+        super().__init__(daemon=True)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()
+        self.conn = None
+
+    def _db(self):
+        if self.conn is not None:
+            return self.conn
+        import sqlite3
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                url TEXT,
+                title TEXT,
+                state TEXT,
+                priority INTEGER DEFAULT 0,
+                links TEXT,
+                extract_state TEXT,
+                created REAL,
+                updated REAL
+            );
+            CREATE TABLE IF NOT EXISTS parts (
+                job_id TEXT,
+                file_base TEXT,
+                part INTEGER,
+                state TEXT,
+                bytes INTEGER DEFAULT 0,
+                total INTEGER DEFAULT 0,
+                PRIMARY KEY (job_id, file_base, part)
+            );
+            """
+        )
+        conn.commit()
+        self.conn = conn
+        return conn
+
+    def add_job(self, job_id, url, title, priority=0, state="queued"):
+        self.queue.put(("add", job_id, url, title, priority, state))
+
+    def update_job(self, job_id, **fields):
+        """Fields: state, priority, links (grouped links dict) and extract_state"""
+        if "links" in fields:
+            fields["links"] = json.dumps(fields["links"])
+        self.queue.put(("job", job_id, fields))
+
+    def update_part(self, job_id, file_base, part, state=None, bytes_done=None, total=None):
+        self.queue.put(("part", job_id, file_base, part, state, bytes_done, total))
+
+    def remove_job(self, job_id):
+        self.queue.put(("remove", job_id))
+
+    def flush(self, timeout=5):
+        """Waits until everything queued so far is on disk"""
+        if not self.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put(("flush", done))
+        done.wait(timeout)
+
+    def close(self):
+        if self.is_alive():
+            self.queue.put(None)
+            self.join(timeout=5)
+
+    def load_jobs(self):
+        """Every stored job with its parts, oldest first"""
+        import sqlite3
+
+        if not os.path.exists(self.path):
+            return []
+        self.flush()
+        try:
+            conn = sqlite3.connect(self.path)
+            conn.row_factory = sqlite3.Row
+            jobs = [dict(row) for row in conn.execute("SELECT * FROM jobs ORDER BY created")]
+            parts = defaultdict(list)
+            for row in conn.execute("SELECT * FROM parts ORDER BY file_base, part"):
+                parts[row["job_id"]].append(dict(row))
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error loading job store: {e}")
+            return []
+        for job in jobs:
+            links = json.loads(job["links"]) if job["links"] else None
+            # JSON object keys are strings, part numbers are ints everywhere else
+            job["links"] = links and {
+                base: {int(part): hosts for part, hosts in part_links.items()}
+                for base, part_links in links.items()
+            }
+            job["parts"] = parts.get(job["id"], [])
+        return jobs
+
+    def part_states(self, job_id):
+        """(file_base, part) -> state for one job, read straight from disk"""
+        import sqlite3
+
+        self.flush()
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            conn = sqlite3.connect(self.path)
+            rows = conn.execute(
+                "SELECT file_base, part, state FROM parts WHERE job_id = ?", (job_id,)
+            ).fetchall()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error loading job store: {e}")
+            return {}
+        return {(file_base, part): state for file_base, part, state in rows}
+
+    def apply(self, conn, ops):
+        now = time.time()
+        # Progress for the same part only needs its latest value
+        progress = {}
+        for op in ops:
+            kind = op[0]
+            if kind == "add":
+                _, job_id, url, title, priority, state = op
+                conn.execute(
+                    """INSERT INTO jobs (id, url, title, state, priority, created, updated)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET state = excluded.state, updated = excluded.updated""",
+                    (job_id, url, title, state, priority, now, now),
+                )
+            elif kind == "job":
+                _, job_id, fields = op
+                columns = ", ".join(f"{name} = ?" for name in fields)
+                conn.execute(
+                    f"UPDATE jobs SET {columns}, updated = ? WHERE id = ?",
+                    (*fields.values(), now, job_id),
+                )
+            elif kind == "part":
+                _, job_id, file_base, part, state, bytes_done, total = op
+                previous = progress.get((job_id, file_base, part), (None, None, None))
+                progress[(job_id, file_base, part)] = (
+                    state if state is not None else previous[0],
+                    bytes_done if bytes_done is not None else previous[1],
+                    total if total is not None else previous[2],
+                )
+            elif kind == "remove":
+                self.write_parts(conn, progress)
+                progress = {}
+                conn.execute("DELETE FROM parts WHERE job_id = ?", (op[1],))
+                conn.execute("DELETE FROM jobs WHERE id = ?", (op[1],))
+        self.write_parts(conn, progress)
+        conn.commit()
+
+    def write_parts(self, conn, progress):
+        conn.executemany(
+            """INSERT INTO parts (job_id, file_base, part, state, bytes, total)
+            VALUES (?, ?, ?, COALESCE(?, 'pending'), COALESCE(?, 0), COALESCE(?, 0))
+            ON CONFLICT(job_id, file_base, part) DO UPDATE SET
+                state = COALESCE(?, state),
+                bytes = COALESCE(?, bytes),
+                total = COALESCE(?, total)""",
+            [
+                (job_id, file_base, part, state, bytes_done, total, state, bytes_done, total)
+                for (job_id, file_base, part), (state, bytes_done, total) in progress.items()
+            ],
+        )
+
+    def run(self):
+        running = True
+        while running:
+            try:
+                ops = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Give progress updates a moment to pile up so they share one commit
+            time.sleep(self.flush_interval if ops[0] and ops[0][0] == "part" else 0)
+            while True:
+                try:
+                    ops.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            waiters = [op[1] for op in ops if op and op[0] == "flush"]
+            if None in ops:
+                running = False
+            ops = [op for op in ops if op and op[0] != "flush"]
+            try:
+                self.apply(self._db(), ops)
+            except Exception as e:
+                print(f"Error writing job store: {e}")
+            for done in waiters:
+                done.set()
+        if self.conn:
+            self.conn.close()
+
+class TransferRegistry:
+    """Single-flight table of the part files currently being written, keyed by path"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.transfers = {}
+
+    def claim(self, filepath, owner):
+        """Returns (transfer, is_owner), non-owners should wait on transfer["done"]"""
+        with self.lock:
+            transfer = self.transfers.get(filepath)
+            if transfer is None:
+                transfer = {
+                    "owner": owner,
+                    "done": threading.Event(),
+                    "ok": False,
+                    "current": 0,
+                    "total": 0,
+                    "followers": set(),
+                }
+                self.transfers[filepath] = transfer
+                return transfer, True
+            return transfer, transfer["owner"] == owner
+
+    def release(self, filepath, transfer):
+        with self.lock:
+            if self.transfers.get(filepath) is transfer:
+                del self.transfers[filepath]
+            followers = list(transfer["followers"])
+        transfer["done"].set()
+        for wakeup in followers:
+            wakeup.set()
+
+def post_search(session, term, base_url, search_start=1, cache=None):
+    url = base_url + "/"
+    payload = {
+        "do": "search",
+        "subaction": "search",
+        "search_start": search_start,
+        "full_search": 1,
+        "result_from": (search_start - 1) * RESULTS_PER_PAGE + 1,
+        "story": term,
+        "titleonly": 3,
+        "replyless": 0,
+        "replylimit": 0,
+        "searchdate": 0,
+        "beforeafter": "after",
+        "sortby": "date",
+        "resorder": "desc",
+        "searchuser": "",
+        "showposts": 0,
+        "catlist[]": 0,
+    }
+    headers = {"Referer": base_url + "/", "User-Agent": "Mozilla/5.0"}
+    if cache:
+        return cache.request(session, "POST", url, "search", data=payload, headers=headers)
+    r = session.post(url, data=payload, headers=headers, timeout=30)
+    r.raise_for_status()
+    return r.text
+
+def parse_search_results(html, base_url):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    articles = soup.find_all("article")
+    results = []
+    for art in articles:
+        title_tag = art.find(["h1", "h2", "h3"])
+        link_tag = art.find("a", class_="permalink") or art.find("a", href=True)
+        author_tag = art.find("span", class_="author")
+        time_tag = art.find("time")
+
+        img_tag = art.find("img")
+        image_url = None
+        if img_tag and img_tag.get("data-src"):
+            image_url = img_tag["data-src"]
+        elif img_tag and img_tag.get("src"):
+            image_url = img_tag["src"]
+
+        if image_url and image_url.startswith("/"):
+            image_url = urljoin(base_url, image_url)
+
+        title = title_tag.get_text(strip=True) if title_tag else None
+        href = link_tag["href"] if link_tag and link_tag.get("href") else None
+        if href and href.startswith("/"):
+            href = urljoin(base_url, href)
+        author = author_tag.get_text(strip=True) if author_tag else None
+        date = time_tag.get_text(strip=True) if time_tag else None
+
+        desc_section = art.find("section", class_="descr")
+        description = desc_section.get_text(strip=True) if desc_section else None
+
+        if title and href:
+            results.append({
+                "title": title,
+                "url": href,
+                "author": author,
+                "date": date,
+                "image_url": image_url,
+                "description": description,
+            })
+    return results
+
+def search_page(session, term, base_url, page=1, cache=None):
+    return parse_search_results(post_search(session, term, base_url, page, cache), base_url)
+
+def fetch_listing_page(session, base_url, page=1, cache=None):
+    """Newest-first release listing, page 1 is the front page"""
+    url = base_url + "/" if page <= 1 else f"{base_url}/page/{page}/"
+    headers = {"User-Agent": "Mozilla/5.0", "Referer": base_url + "/"}
+    if cache:
+        return cache.request(session, "GET", url, "listing", headers=headers)
+    r = session.get(url, headers=headers, timeout=30)
+    r.raise_for_status()
+    return r.text
+
+def fetch_plugin_page(session, plugin_url, base_url, cache=None):
+    headers = {"User-Agent": "Mozilla/5.0", "Referer": base_url + "/"}
+    if cache:
+        return cache.request(session, "GET", plugin_url, "plugin", headers=headers)
+    r = session.get(plugin_url, headers=headers, timeout=30)
+    r.raise_for_status()
+    return r.text
+
+def find_peeplink(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    dl_block = soup.find("div", class_="DL_Blocks download")
+    if dl_block:
+        a = dl_block.find("a", href=True)
+        if a and "peeplink.in" in a["href"]:
+            return a["href"]
+    for a in soup.find_all("a", href=True):
+        if "peeplink.in" in a["href"]:
+            return a["href"]
+    m = re.search(r"(https?://peeplink\.in/[A-Za-z0-9]+)", html)
+    if m:
+        return m.group(1)
+    return None
+
+def fetch_peeplink_urls(peeplink_url, cache=None, session=None, timeout=30):
+    import requests
+
+    session = session or requests
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if cache:
+        html = cache.request(session, "GET", peeplink_url, "peeplink", headers=headers, timeout=timeout)
+    else:
+        r = session.get(peeplink_url, headers=headers, timeout=timeout)
+        r.raise_for_status()
+        html = r.text
+    return group_peeplink_links(html)
+
+def group_peeplink_links(html):
+    """file base -> part number -> host -> mirror URL, from a peeplink page"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    article = soup.find("article")
+    if not article:
+        return {}
+
+    urls_by_host = defaultdict(list)
+    for a in article.find_all("a", href=True):
+        href = a["href"].strip()
+        if not href:
+            continue
+        host = urlparse(href).netloc.lower()
+        fname = href.split("/")[-1]
+        base = fname.split(".part")[0] if ".part" in fname else fname
+        part_num = int(fname.split(".part")[1].split(".")[0]) if ".part" in fname else 1
+        urls_by_host[host].append((base, part_num, href))
+
+    grouped = defaultdict(lambda: defaultdict(dict))
+    for host, lst in urls_by_host.items():
+        for base, part_num, url in lst:
+            grouped[base][part_num][host] = url
+    return grouped
+
+def resolve_release(session, plugin_url, base_url, cache=None):
+    """Plugin page -> peeplink -> grouped mirror links, None when there is no peeplink"""
+    with tracer.span("fetch_plugin_page", url=plugin_url):
+        plugin_html = fetch_plugin_page(session, plugin_url, base_url, cache)
+    with tracer.span("find_peeplink"):
+        peeplink = find_peeplink(plugin_html)
+    if not peeplink:
+        return None
+    with tracer.span("fetch_peeplink_urls", url=peeplink):
+        return fetch_peeplink_urls(peeplink, cache, session)
+
+def rd_unrestrict(url, token, session=None):
+    import requests
+
+    session = session or requests
+    api_url = f"{RD_API_URL}/unrestrict/link"
+    headers = {"Authorization": f"Bearer {token}"}
+    data = {"link": url}
+    started = time.perf_counter()
+    try:
+        r = session.post(api_url, headers=headers, data=data, timeout=30)
+    except Exception:
+        metrics.inc("audioz_rd_requests_total", status="error")
+        raise
+    finally:
+        metrics.observe("audioz_rd_request_seconds", time.perf_counter() - started)
+    metrics.inc("audioz_rd_requests_total", status=str(r.status_code))
+    if r.status_code != 200:
+        return None
+    return r.json()["download"]
+
+def extract_archive(filepath, destination=None):
+    """Extract archive, automatically handling multi-part archives"""
+    import zipfile
+    import tarfile
+
+    if not os.path.exists(filepath):
+        return None
+        
+    if not destination:
+        # Use the archive name without extension as folder name
+        base_name = os.path.splitext(os.path.basename(filepath))[0]
+        # Remove .part01 etc. from the name
+        base_name = re.sub(r'\.part\d+', '', base_name)
+        destination = os.path.join(DOWNLOADS_FOLDER, base_name)
+    
+    os.makedirs(destination, exist_ok=True)
+    ext = os.path.splitext(filepath)[1].lower()
+    
+    try:
+        if ext == ".zip":
+            with zipfile.ZipFile(filepath, "r") as zip_ref:
+                zip_ref.extractall(destination)
+        elif ext in [".tar", ".gz", ".bz2", ".tgz"]:
+            with tarfile.open(filepath, "r:*") as tar_ref:
+                tar_ref.extractall(destination) # I'm not sure if this actually works, I haven't seen .tar files go around audioz, yet.
+        elif ext == ".rar":
+            import rarfile
+
+            # For RAR files, try to extract with multi-part support
+            try:
+                with rarfile.RarFile(filepath, "r") as rar_ref:
+                    rar_ref.extractall(destination)
+            except rarfile.NeedFirstVolume:
+                # If it's a multi-part RAR, find all parts
+                base_dir = os.path.dirname(filepath)
+                base_name = os.path.basename(filepath)
+                
+                # Find all part files
+                part_files = []
+                for f in os.listdir(base_dir):
+                    if f.startswith(base_name.split('.part')[0]) and f.endswith('.rar'):
+                        part_files.append(os.path.join(base_dir, f))
+                
+                # Sort parts numerically
+                part_files.sort(key=lambda x: int(re.search(r'\.part(\d+)', x).group(1)) if re.search(r'\.part(\d+)', x) else 0)
+                
+                if part_files:
+                    # Use the first part to extract all
+                    with rarfile.RarFile(part_files[0], "r") as rar_ref:
+                        rar_ref.extractall(destination)
+        else:
+            return None
+        return destination
+    except Exception as e:
+        print(f"Extraction error: {e}")
+        return None
+
+def open_folder(path):
+    import subprocess
+
+    if platform.system() == "Windows":
+        subprocess.Popen(f'explorer "{path}"')
+    elif platform.system() == "Darwin":
+        subprocess.Popen(["open", path])
+    else:
+        subprocess.Popen(["xdg-open", path])
+
+def abort_response(response):
+    """Shut the socket under a streaming response, a read blocked on it in another thread returns at once"""
+    connection = getattr(response.raw, "connection", None) or getattr(response.raw, "_connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is None:
+        # urllib3 2 hands the socket over to http.client once the headers are read
+        fp = getattr(getattr(response.raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(fp, "raw", None), "_sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+def make_abortable_session():
+    """A requests session with an abort() that shuts every socket it opened, cutting off
+    requests still waiting for headers, later requests fail at once"""
+    import weakref
+    import requests
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    sockets = weakref.WeakSet()
+    lock = threading.Lock()
+    aborted = []
+
+    def shut(sock):
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def tracked(base):
+        class Connection(base):
+            def connect(self):
+                super().connect()
+                with lock:
+                    sockets.add(self.sock)
+                    if aborted:
+                        shut(self.sock)
+
+        return Connection
+
+    class HTTPPool(HTTPConnectionPool):
+        ConnectionCls = tracked(HTTPConnectionPool.ConnectionCls)
+
+    class HTTPSPool(HTTPSConnectionPool):
+        ConnectionCls = tracked(HTTPSConnectionPool.ConnectionCls)
+
+    session = requests.Session()
+    for adapter in session.adapters.values():
+        adapter.poolmanager.pool_classes_by_scheme = {"http": HTTPPool, "https": HTTPSPool}
+
+    def abort():
+        with lock:
+            aborted.append(True)
+            for sock in list(sockets):
+                shut(sock)
+        session.close()
+
+    session.abort = abort
+    return session
+
+class DownloadHooks:
+    """Callbacks a ReleaseDownloader reports through, any left out are ignored"""
+
+    def __init__(
+        self,
+        log=None,
+        status=None,
+        progress=None,
+        file_started=None,
+        part_progress=None,
+        finished=None,
+    ):
+        noop = lambda *args: None
+        self.log = log or noop  # message, level
+        self.status = status or noop  # job_id, status
+        self.progress = progress or noop  # filename, job_id, current, total
+        self.file_started = file_started or noop  # filename, job_id
+        self.part_progress = part_progress or noop  # job_id, current_part, total_parts
+        self.finished = finished or noop  # job_id
+
+class DownloadScheduler:
+    """Hands out a fixed number of connection slots, highest priority first.
+
+    Owners need .priority, .is_running and an .unpaused event. When a waiter outranks a slot holder
+    and no slot is free, the lowest-priority holder gets slot["preempted"] set
+    and is expected to hand its slot back at the next chunk.
+    """
+
+    def __init__(self, slots=3):
+        self.slots = slots
+        self.cond = threading.Condition()
+        self.holders = []
+        self.waiting = []
+        self.order = itertools.count()
+
+    def _rank(self, entry):
+        return (-entry["owner"].priority, entry["seq"])
+
+    def _preempt(self):
+        """Call with the lock held"""
+        waiting = sorted(self.waiting, key=self._rank)
+        # Slots that are free or already being handed back can serve waiters without preempting
+        available = self.slots - len(self.holders) + sum(1 for h in self.holders if h["preempted"])
+        for entry in waiting[max(available, 0):]:
+            candidates = [
+                h for h in self.holders
+                if not h["preempted"] and h["owner"].priority < entry["owner"].priority
+            ]
+            if not candidates:
+                break
+            victim = min(candidates, key=lambda h: (h["owner"].priority, -h["seq"]))
+            victim["preempted"] = True
+
+    def acquire(self, owner):
+        """Blocks until owner may open a connection, returns None if it stopped or paused meanwhile"""
+        with self.cond:
+            entry = {"owner": owner, "seq": next(self.order), "preempted": False}
+            self.waiting.append(entry)
+            self._preempt()
+            while True:
+                if not owner.is_running or not owner.unpaused.is_set():
+                    self.waiting.remove(entry)
+                    self.cond.notify_all()
+                    return None
+                if len(self.holders) < self.slots and min(self.waiting, key=self._rank) is entry:
+                    break
+                self.cond.wait()
+            self.waiting.remove(entry)
+            self.holders.append(entry)
+            # The next waiter may be able to take another free slot
+            self.cond.notify_all()
+            return entry
+
+    def release(self, slot):
+        with self.cond:
+            if slot in self.holders:
+                self.holders.remove(slot)
+            self.cond.notify_all()
+
+    def update(self, slots=None):
+        """Re-rank after priorities or the slot count changed"""
+        with self.cond:
+            if slots is not None:
+                self.slots = slots
+            self._preempt()
+            self.cond.notify_all()
+
+    def counts(self):
+        with self.cond:
+            return {"active": len(self.holders), "queued": len(self.waiting)}
+
+    def is_full(self):
+        with self.cond:
+            return len(self.holders) >= self.slots
+
+    def wake(self):
+        with self.cond:
+            self.cond.notify_all()
+
+class ReleaseDownloader:
+    """Resolves one release and downloads its parts through Real-Debrid, without any Qt"""
+
+    def __init__(
+        self,
+        url,
+        cookie_string,
+        base_url,
+        rd_token,
+        host_order=None,
+        job_id=None,
+        max_retries=3,
+        retry_delay=5,
+        http_cache=None,
+        grouped_links=None,
+        resolution_cache=None,
+        transfers=None,
+        hooks=None,
+        job_store=None,
+        scheduler=None,
+        priority=0,
+    ):
+        self.url = url
+        self.cookie_string = cookie_string
+        self.base_url = base_url
+        self.rd_token = rd_token
+        self.host_order = host_order or []
+        self.job_id = job_id or str(id(self))
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.http_cache = http_cache
+        self.grouped_links = grouped_links
+        self.resolution_cache = resolution_cache
+        self.transfers = transfers
+        self.hooks = hooks or DownloadHooks()
+        self.job_store = job_store
+        self.scheduler = scheduler
+        self.priority = priority
+        self.part_states = {}
+        self.current_file_base = None
+        self.current_host = ""
+        self.bytes_received = 0
+        self.last_store_write = 0
+        self.current_transfer = None
+        self.is_running = True
+        self.cancelled = threading.Event()
+        self.wakeup = threading.Event()
+        self.unpaused = threading.Event()
+        self.unpaused.set()
+        self.response = None
+        self.response_lock = threading.Lock()
+        # Every request of the job goes through this, so stop() can cut off any of them
+        self.session = make_session(cookie_string, make_abortable_session())
+        self.current_part = 0
+        self.current_max_part = 0
+        self.total_parts = 0
+        self.failed_parts = 0
+        # Last job state, the GUI reads it once the job has finished
+        self.state = "queued"
+
+    def download_file_with_progress(self, url, filename, slot=None):
+        """Download file with resume support, False if it had to stop early, raises on errors"""
+        os.makedirs(DOWNLOADS_FOLDER, exist_ok=True)
+        filepath = os.path.join(DOWNLOADS_FOLDER, filename)
+
+        # Check if file already exists for resume
+        downloaded_size = 0
+        if os.path.exists(filepath):
+            downloaded_size = os.path.getsize(filepath)
+            self.hooks.log(f"Resuming download: {filename} ({downloaded_size} bytes already downloaded)", "INFO")
+
+        self.hooks.file_started(filename, self.job_id)
+
+        headers = {}
+        if downloaded_size > 0:
+            headers['Range'] = f'bytes={downloaded_size}-'
+
+        try:
+            with tracer.span("ttfb", self.job_id, part=filename, resumed_from=downloaded_size):
+                response = self.session.get(url, stream=True, timeout=(10, 30), headers=headers)
+            with self.response_lock:
+                self.response = response
+            if self.should_yield(slot):
+                # Cancelled or paused while the headers were on their way
+                response.close()
+                return False
+
+            # Handle resume
+            if downloaded_size > 0 and response.status_code == 416:
+                self.hooks.log(f"File already complete: {filename}", "SUCCESS")
+                return True
+            elif downloaded_size > 0 and response.status_code == 206:  # Partial content
+                total_size = downloaded_size + int(response.headers.get('content-length', 0))
+            else:
+                response.raise_for_status()
+                total_size = int(response.headers.get("content-length", 0))
+                if downloaded_size > 0:
+                    # Server doesn't support resume, start over
+                    downloaded_size = 0
+                    metrics.inc("audioz_download_fallbacks_total", kind="no_resume")
+                    self.hooks.log(f"Server doesn't support resume, restarting: {filename}", "WARNING")
+
+            mode = 'ab' if downloaded_size > 0 else 'wb'
+            started_at = downloaded_size
+            with tracer.span("transfer", self.job_id, part=filename) as span, open(filepath, mode) as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if self.should_yield(slot):
+                        # Paused, preempted or cancelled, the partial file is continued later
+                        response.close()
+                        span.set(bytes=downloaded_size - started_at, stopped=True)
+                        return False
+                    if chunk:
+                        f.write(chunk)
+                        downloaded_size += len(chunk)
+                        self.bytes_received += len(chunk)
+                        metrics.add_bytes(self.current_host, len(chunk))
+                        if self.current_transfer:
+                            self.current_transfer["current"] = downloaded_size
+                            self.current_transfer["total"] = total_size
+                        if self.job_store and time.monotonic() - self.last_store_write >= 0.5:
+                            self.last_store_write = time.monotonic()
+                            self.job_store.update_part(
+                                self.job_id,
+                                self.current_file_base,
+                                self.current_part,
+                                bytes_done=downloaded_size,
+                                total=total_size,
+                            )
+                        if total_size > 0:
+                            self.hooks.progress(
+                                filename,
+                                self.job_id,
+                                downloaded_size,
+                                total_size,
+                            )
+                span.set(bytes=downloaded_size - started_at)
+
+            return True
+
+        except Exception:
+            if self.should_yield(slot):
+                # The socket was shut on purpose by stop() or pause()
+                return False
+            raise
+        finally:
+            with self.response_lock:
+                self.response = None
+
+    def stop(self):
+        self.is_running = False
+        self.cancelled.set()
+        self.wakeup.set()
+        self.unpaused.set()
+        self.interrupt()
+        self.session.abort()
+        if self.scheduler:
+            self.scheduler.wake()
+
+    def interrupt(self):
+        """Abort the transfer in flight, if any"""
+        with self.response_lock:
+            if self.response is not None:
+                abort_response(self.response)
+
+    def should_yield(self, slot):
+        return (
+            not self.is_running
+            or not self.unpaused.is_set()
+            or (slot is not None and slot["preempted"])
+        )
+
+    def fetch(self, url, filename):
+        """Download one part inside a connection slot, giving the slot back while paused, preempted or backing off"""
+        retries = 0
+        while True:
+            slot = None
+            if self.scheduler:
+                if self.scheduler.is_full():
+                    self.hooks.status(self.job_id, "Queued")
+                slot = self.scheduler.acquire(self)
+                if slot is None:
+                    if not self.wait_if_paused():
+                        return False
+                    continue
+                self.hooks.part_progress(self.job_id, self.current_part, self.current_max_part)
+            error = None
+            try:
+                if self.download_file_with_progress(url, filename, slot=slot):
+                    return True
+            except Exception as e:
+                error = e
+            finally:
+                if slot:
+                    self.scheduler.release(slot)
+            if error is not None:
+                if retries >= self.max_retries:
+                    raise error
+                retries += 1
+                metrics.inc("audioz_download_retries_total")
+                self.hooks.log(f"Download failed, retrying ({retries}/{self.max_retries}): {error}", "WARNING")
+                # Other jobs can use the slot meanwhile, pause and stop end the wait early
+                self.wakeup.clear()
+                if self.is_running and self.unpaused.is_set():
+                    self.wakeup.wait(self.retry_delay)
+            elif slot and slot["preempted"] and self.is_running:
+                self.hooks.log(f"{filename} paused for a higher priority download", "INFO")
+            if not self.wait_if_paused():
+                return False
+
+    def pause(self):
+        self.unpaused.clear()
+        self.wakeup.set()
+        self.interrupt()
+        self.set_state("paused")
+        if self.scheduler:
+            self.scheduler.wake()
+
+    def resume(self):
+        self.unpaused.set()
+        self.set_state("running")
+
+    def set_state(self, state):
+        self.state = state
+        if self.job_store:
+            self.job_store.update_job(self.job_id, state=state)
+
+    def set_part_state(self, file_base, part_num, state, bytes_done=None):
+        self.part_states[(file_base, part_num)] = state
+        if self.job_store:
+            self.job_store.update_part(self.job_id, file_base, part_num, state, bytes_done)
+
+    def wait_if_paused(self):
+        """Blocks while paused, returns False if the job was stopped meanwhile"""
+        if not self.unpaused.is_set():
+            self.hooks.status(self.job_id, "Paused")
+            self.unpaused.wait()
+            if self.is_running and self.current_part:
+                self.hooks.part_progress(self.job_id, self.current_part, self.current_max_part)
+        return self.is_running
+
+    def mark_mirror_failed(self, file_base, part_num, host):
+        if self.resolution_cache and self.resolution_cache.mark_failed(
+            self.url, file_base, part_num, host
+        ):
+            self.hooks.log(
+                f"Every mirror for part {part_num} failed, links will be resolved again next time",
+                "WARNING",
+            )
+
+    def resolve_links(self, session):
+        self.hooks.status(self.job_id, "Fetching page...")
+        try:
+            with tracer.span("fetch_plugin_page", self.job_id, url=self.url):
+                plugin_html = fetch_plugin_page(
+                    session, self.url, self.base_url, self.http_cache
+                )
+        except Exception as e:
+            if not self.is_running:
+                return None
+            self.hooks.status(self.job_id, "Error")
+            self.hooks.log(f"Failed to fetch plugin page: {e}", "ERROR")
+            return None
+        if not self.is_running:
+            return None
+
+        with tracer.span("find_peeplink", self.job_id):
+            peeplink = find_peeplink(plugin_html)
+        if not peeplink:
+            self.hooks.status(self.job_id, "No peeplink")
+            self.hooks.log("Peeplink not found.", "WARNING")
+            return None
+
+        self.hooks.status(self.job_id, "Processing links...")
+        try:
+            with tracer.span("fetch_peeplink_urls", self.job_id, url=peeplink):
+                grouped_links = fetch_peeplink_urls(peeplink, self.http_cache, session)
+        except Exception as e:
+            if not self.is_running:
+                return None
+            self.hooks.status(self.job_id, "Error")
+            self.hooks.log(f"Failed to fetch peeplink page: {e}", "ERROR")
+            return None
+        if not grouped_links:
+            self.hooks.status(self.job_id, "No links")
+            self.hooks.log("No links found.", "WARNING")
+            return None
+        return grouped_links
+
+    def download_part(self, file_base, parts, part_num, max_part):
+        filename = f"{file_base}.part{part_num}.rar"
+        traced_from = time.perf_counter()
+        filepath = os.path.join(DOWNLOADS_FOLDER, filename)
+        self.current_part = part_num
+        self.current_max_part = max_part
+        self.current_file_base = file_base
+        self.hooks.part_progress(self.job_id, part_num, max_part)
+
+        transfer = None
+        if self.transfers:
+            transfer, is_owner = self.transfers.claim(filepath, self.job_id)
+            if not is_owner:
+                if self.follow_transfer(filename, transfer):
+                    return True
+                # The other worker gave up on it, try it ourselves
+                transfer, is_owner = self.transfers.claim(filepath, self.job_id)
+                if not is_owner:
+                    return False
+
+        try:
+            # Check if part already exists and is complete
+            if os.path.exists(filepath) and (
+                not self.job_store or self.part_states.get((file_base, part_num)) == "done"
+            ):
+                # Without a job store we can't tell a finished part from an interrupted one
+                file_size = os.path.getsize(filepath)
+                self.hooks.log(f"Part {part_num}/{max_part} already exists ({file_size} bytes), skipping", "INFO")
+                if transfer:
+                    transfer["ok"] = True
+                self.set_part_state(file_base, part_num, "done", file_size)
+                return True
+            # Anything else on disk is a partial file, the Range request below continues it
+            self.set_part_state(file_base, part_num, "downloading")
+
+            self.current_transfer = transfer
+            for host in self.host_order:
+                if not self.is_running:
+                    break
+                url = parts.get(part_num, {}).get(host)
+                if url:
+                    self.current_host = host
+                    with tracer.span("rd_unrestrict", self.job_id, host=host, part=filename) as span:
+                        try:
+                            rd_link = rd_unrestrict(url, self.rd_token, self.session)
+                        except Exception as e:
+                            rd_link = None
+                            if self.is_running:
+                                self.hooks.log(f"Real-Debrid request failed for {filename}: {e}", "ERROR")
+                        span.set(ok=bool(rd_link))
+                    if not self.is_running:
+                        break
+                    if rd_link:
+                        try:
+                            if not self.fetch(rd_link, filename):
+                                break
+                            self.hooks.log(f"Downloaded {filename}", "SUCCESS")
+                            if transfer:
+                                transfer["ok"] = True
+                            self.set_part_state(file_base, part_num, "done", os.path.getsize(filepath))
+                            return True
+                        except Exception as e:
+                            self.hooks.log(f"Failed {filename}: {e}", "ERROR")
+                    self.mark_mirror_failed(file_base, part_num, host)
+                    metrics.inc("audioz_download_fallbacks_total", kind="mirror")
+
+            if self.is_running:
+                self.hooks.log(f"Part {part_num} could not be downloaded.", "WARNING")
+            self.set_part_state(file_base, part_num, "failed" if self.is_running else "pending")
+            return False
+        finally:
+            self.current_transfer = None
+            if transfer:
+                self.transfers.release(filepath, transfer)
+            if tracer.enabled:
+                tracer.add("part", traced_from, time.perf_counter(), self.job_id, {"part": filename})
+
+    def follow_transfer(self, filename, transfer):
+        """Mirror another worker's progress on the same file instead of downloading it twice"""
+        self.hooks.log(f"{filename} is already being downloaded, following that transfer", "INFO")
+        self.hooks.file_started(filename, self.job_id)
+        # Woken at once by the owner finishing or by stop(), otherwise twice a second for progress
+        transfer["followers"].add(self.wakeup)
+        try:
+            while not transfer["done"].is_set():
+                if not self.is_running:
+                    return False
+                if transfer["total"] > 0:
+                    self.hooks.progress(
+                        filename, self.job_id, transfer["current"], transfer["total"]
+                    )
+                self.wakeup.wait(0.5)
+                self.wakeup.clear()
+        finally:
+            transfer["followers"].discard(self.wakeup)
+        return transfer["ok"] and self.is_running
+
+    def run(self):
+        """Returns True when every part of the release is on disk"""
+        with tracer.span("job", self.job_id, url=self.url) as span:
+            ok = self.download_release()
+            span.set(ok=ok, failed_parts=self.failed_parts)
+        return ok
+
+    def download_release(self):
+        self.hooks.status(self.job_id, "Preparing...")
+        self.set_state("running" if self.unpaused.is_set() else "paused")
+        if self.job_store:
+            self.part_states = self.job_store.part_states(self.job_id)
+
+        grouped_links = self.grouped_links
+        if not grouped_links and self.resolution_cache:
+            grouped_links = self.resolution_cache.get(self.url)
+        if grouped_links:
+            self.hooks.log("Using previously resolved links", "DEBUG")
+        else:
+            grouped_links = self.resolve_links(self.session)
+            if not grouped_links:
+                self.set_state("failed" if self.is_running else "cancelled")
+                self.hooks.finished(self.job_id)
+                return False
+            if self.resolution_cache:
+                self.resolution_cache.put(self.url, grouped_links)
+        self.grouped_links = grouped_links
+        if self.job_store:
+            self.job_store.update_job(self.job_id, links=grouped_links)
+
+        if not self.host_order:
+            all_hosts = sorted(
+                {
+                    h
+                    for base in grouped_links.values()
+                    for part in base.values()
+                    for h in part
+                }
+            )
+            self.host_order = all_hosts
+
+        # Calculate total parts
+        total_parts = 0
+        for file_base, parts in grouped_links.items():
+            total_parts += len(parts)
+        self.total_parts = total_parts
+
+        for file_base, parts in grouped_links.items():
+            if not self.is_running:
+                break
+            self.hooks.status(self.job_id, "Downloading...")
+            self.hooks.log(f"Downloading file: {file_base}", "DOWNLOAD")
+            max_part = max(parts.keys())
+
+            for part_num in range(1, max_part + 1):
+                if not self.wait_if_paused():
+                    break
+                if not self.download_part(file_base, parts, part_num, max_part) and self.is_running:
+                    self.failed_parts += 1
+
+        completed = self.is_running and not self.failed_parts
+        if completed:
+            self.set_state("completed")
+        else:
+            self.set_state("failed" if self.is_running else "cancelled")
+        if completed:
+            self.hooks.status(self.job_id, "Completed")
+            self.hooks.log("Download completed successfully", "SUCCESS")
+        elif self.is_running:
+            self.hooks.status(self.job_id, "Failed")
+            self.hooks.log(
+                f"Download finished with {self.failed_parts} part(s) that could not be downloaded",
+                "WARNING",
+            )
+        self.hooks.finished(self.job_id)
+        return completed
+
+def extract_release(grouped_links, delete_parts=False, log=None):
+    """Extract every downloaded file of a release from its first part, returns the folders"""
+    log = log or (lambda *args: None)
+    folders = []
+    for file_base, parts in grouped_links.items():
+        first_part = os.path.join(DOWNLOADS_FOLDER, f"{file_base}.part{min(parts)}.rar")
+        log(f"Extracting {os.path.basename(first_part)}", "INFO")
+        started = time.perf_counter()
+        with tracer.span("extract_archive", file=os.path.basename(first_part)):
+            folder = extract_archive(first_part)
+        metrics.observe("audioz_extract_seconds", time.perf_counter() - started)
+        metrics.inc("audioz_extractions_total", result="ok" if folder else "failed")
+        if not folder:
+            log(f"Failed to extract: {file_base}", "ERROR")
+            continue
+        folders.append(folder)
+        log(f"Extracted to: {folder}", "SUCCESS")
+        if delete_parts:
+            for part_num in parts:
+                part_path = os.path.join(DOWNLOADS_FOLDER, f"{file_base}.part{part_num}.rar")
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+    return folders
+
+def parse_priority(value):
+    """An int from a JSON priority field, None when it isn't one"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("+-").isdigit():
+        return int(value)
+    return None
+
+class ControlError(Exception):
+    """Raised by a control API backend to refuse a request with this status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ControlServer:
+    """Localhost HTTP/JSON API over a download queue, every request needs the token.
+
+    The backend provides enqueue(url, title, priority), list_jobs(), cancel(job_id),
+    pause(job_id), resume(job_id), approve(job_id) and set_priority(job_id, priority).
+    Job actions return False for an unknown job, a ControlError refuses the request.
+    """
+
+    def __init__(self, backend, token, port=8765, host="127.0.0.1"):
+        self.backend = backend
+        self.token = token
+        self.port = port
+        self.host = host
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        from http.server import ThreadingHTTPServer
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def make_handler(self):
+        import hmac
+        from http.server import BaseHTTPRequestHandler
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def reply(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def authorized(self):
+                header = self.headers.get("Authorization", "")
+                token = header[7:] if header.startswith("Bearer ") else self.headers.get("X-Token", "")
+                return hmac.compare_digest(token.encode("utf-8"), server.token.encode("utf-8"))
+
+            def read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if not length:
+                    return {}
+                return json.loads(self.rfile.read(length))
+
+            def handle_request(self, method):
+                if not self.authorized():
+                    return self.reply(401, {"error": "missing or wrong token"})
+                parts = [p for p in urlparse(self.path).path.split("/") if p]
+                try:
+                    body = self.read_json() if method == "POST" else {}
+                except ValueError:
+                    return self.reply(400, {"error": "body is not valid JSON"})
+                try:
+                    status, payload = server.dispatch(method, parts, body)
+                except ControlError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except TimeoutError:
+                    status, payload = 503, {"error": "the app did not answer in time"}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                self.reply(status, payload)
+
+            def do_GET(self):
+                self.handle_request("GET")
+
+            def do_POST(self):
+                self.handle_request("POST")
+
+        return Handler
+
+    def dispatch(self, method, parts, body):
+        if method == "GET" and parts == ["trace"]:
+            return 200, tracer.chrome_trace()
+        if method == "GET" and parts == ["trace", "summary"]:
+            return 200, {"enabled": tracer.enabled, "stages": tracer.summary()}
+        if not parts or parts[0] != "jobs":
+            return 404, {"error": "unknown endpoint"}
+        if not isinstance(body, dict):
+            return 400, {"error": "body must be a JSON object"}
+        if method == "GET" and len(parts) == 1:
+            return 200, {"jobs": self.backend.list_jobs()}
+        if method == "GET" and len(parts) == 2:
+            for job in self.backend.list_jobs():
+                if job["id"] == parts[1]:
+                    return 200, job
+            return 404, {"error": "unknown job"}
+        if method == "POST" and len(parts) == 1:
+            # Either a plugin URL or a search result as returned by parse_search_results
+            result = body.get("result") or {}
+            if not isinstance(result, dict):
+                return 400, {"error": "result must be a search result object"}
+            url = body.get("url") or result.get("url")
+            if not url or not isinstance(url, str):
+                return 400, {"error": "give a url or a search result"}
+            title = body.get("title") or result.get("title") or url
+            priority = parse_priority(body.get("priority", 0))
+            if priority is None:
+                return 400, {"error": "priority must be an integer"}
+            job_id = self.backend.enqueue(url, str(title), priority)
+            return 201, {"id": job_id}
+        if method == "POST" and len(parts) == 3:
+            job_id, action = parts[1], parts[2]
+            if action == "priority":
+                priority = parse_priority(body.get("priority"))
+                if priority is None:
+                    return 400, {"error": "give an integer priority"}
+                ok = self.backend.set_priority(job_id, priority)
+            elif action in ("cancel", "pause", "resume", "approve"):
+                ok = getattr(self.backend, action)(job_id)
+            else:
+                return 404, {"error": "unknown action"}
+            return (200, {"ok": True}) if ok else (404, {"error": "unknown or finished job"})
+        return 405, {"error": "method not allowed"}
+
+class MetricsServer:
+    """Serves Metrics.render() at /metrics for a Prometheus scraper, read-only and localhost by default"""
+
+    def __init__(self, registry, port=9765, host="127.0.0.1"):
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self.httpd = None
+
+    def start(self):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if urlparse(self.path).path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
@@ -1,17 +1,17 @@
 import sys
-import requests
-from bs4 import BeautifulSoup
-import re
-from urllib.parse import urljoin, urlparse
-from collections import defaultdict
 import time
+
+# Measured before the heavy imports so --startup-benchmark covers them
+STARTUP_TIME = time.perf_counter()
+
+from collections import defaultdict, OrderedDict
 import os
-import json
-import subprocess
-import platform
-import zipfile
-import tarfile
-import rarfile
+import hashlib
+import threading
+import queue
+import secrets
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 
 from PyQt6.QtWidgets import (
     QApplication,
@@ -21,17 +21,15 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QVBoxLayout,
     QHBoxLayout,
-    QListWidget,
-    QTextEdit,
-    QListWidgetItem,
+    QListView,
+    QPlainTextEdit,
     QMessageBox,
     QSplitter,
-    QProgressBar,
     QGroupBox,
     QScrollArea,
     QHeaderView,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
+    QStyledItemDelegate,
     QAbstractItemView,
     QToolBar,
     QStatusBar,
@@ -43,325 +41,92 @@ from PyQt6.QtWidgets import (
     QCheckBox,
     QComboBox,
     QTabWidget, QSpinBox, QFrame, QGridLayout, QSpacerItem, QSizePolicy,
+    QStyle,
+    QMenu,
 )
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize
-from PyQt6.QtGui import QPalette, QColor, QTextCursor, QTextCharFormat, QIntValidator
-
-DEFAULT_THEME = {
-    "accent": "#f61e5f",
-    "accent_light": "#ffbde0",
-    "desktop": "#101010",
-    "surface_bg": "#171717",
-    "surface_area": "#0d0d0d",
-    "control_bg": "#101010",
-    "detail_view_bg": "#202020",
-    "browser_bar": "#0d0d0d",
-    "tree_column_head_bg": "#232323",
-    "control_fg": "#a4a4a4",
-    "control_on_fg": "#0d0d0d",
-    "control_off_fg": "#adadad",
-    "control_disabled": "#a8a8a8",
-    "text_disabled": "#4d4d4d",
-    "selection_bg": "#b3b3b3",
-    "selection_fg": "#0d0d0d",
-    "surface_highlight": "#222222",
-    "main_focus": "#2a2a2a",
-    "control_contrast_frame": "#000000",
-    "control_selection_frame": "#373737",
-    "view_control_on": "#929292",
-    "view_control_off": "#747474",
-    "scrollbar_inner_handle": "#404040",
-    "scrollbar_hover": "#5a5a5a",
-    "alert": "#848484",
-}
-
-LOG_COLORS = {
-    "INFO": "#a4a4a4",
-    "SUCCESS": "#4CAF50",
-    "WARNING": "#FF9800",
-    "ERROR": "#f61e5f",
-    "DEBUG": "#2196F3",
-    "DOWNLOAD": "#BD3BD4",
-}
-
-SETTINGS_FILE = "settings.json"
-DOWNLOADS_FOLDER = "downloads"
-
-class Settings:
-    def __init__(self):
-        self.cookie_string = ""
-        self.rd_access_token = ""
-        self.base_url = "https://audioz.download"
-        self.theme = DEFAULT_THEME.copy()
-        self.log_colors = LOG_COLORS.copy()
-        self.auto_extract = True
-        self.auto_delete = True
-        self.download_strategy = "auto"
-        self.max_retries = 3
-        self.retry_delay = 5
-        self.load()
-
-    def load(self):
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                with open(SETTINGS_FILE, "r") as f:
-                    data = json.load(f)
-                    self.cookie_string = data.get("cookie_string", "")
-                    self.rd_access_token = data.get("rd_access_token", "")
-                    self.base_url = data.get("base_url", "https://audioz.download")
-                    self.theme = data.get("theme", DEFAULT_THEME.copy())
-                    self.log_colors = data.get("log_colors", LOG_COLORS.copy())
-                    self.auto_extract = data.get("auto_extract", True)
-                    self.auto_delete = data.get("auto_delete", True)
-                    self.download_strategy = data.get("download_strategy", "auto")
-                    self.max_retries = data.get("max_retries", 3)
-                    self.retry_delay = data.get("retry_delay", 5)
-
-            except Exception as e:
-                print(f"Error loading settings: {e}")
-
-    def save(self):
-        try:
-            data = {
-                "cookie_string": self.cookie_string,
-                "rd_access_token": self.rd_access_token,
-                "base_url": self.base_url,
-                "theme": self.theme,
-                "log_colors": self.log_colors,
-                "auto_extract": self.auto_extract,
-                "auto_delete": self.auto_delete,
-                "download_strategy": self.download_strategy,
-                "max_retries": self.max_retries,
-                "retry_delay": self.retry_delay,
-            }
-            with open(SETTINGS_FILE, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-
-def parse_cookie_string(cookie_str):
-    cookies = {}
-    for part in cookie_str.split(";"):
-        part = part.strip()
-        if "=" in part:
-            name, val = part.split("=", 1)
-            cookies[name.strip()] = val.strip()
-    return cookies
-
-def post_search(session, term, base_url, search_start=1):
-    url = base_url + "/"
-    payload = {
-        "do": "search",
-        "subaction": "search",
-        "search_start": search_start,
-        "full_search": 1,
-        "result_from": (search_start - 1) * 30 + 1,
-        "story": term,
-        "titleonly": 3,
-        "replyless": 0,
-        "replylimit": 0,
-        "searchdate": 0,
-        "beforeafter": "after",
-        "sortby": "date",
-        "resorder": "desc",
-        "searchuser": "",
-        "showposts": 0,
-        "catlist[]": 0,
-    }
-    headers = {"Referer": base_url + "/", "User-Agent": "Mozilla/5.0"}
-    r = session.post(url, data=payload, headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.text
-
-def parse_search_results(html, base_url):
-    soup = BeautifulSoup(html, "html.parser")
-    articles = soup.find_all("article")
-    results = []
-    for art in articles:
-        title_tag = art.find(["h1", "h2", "h3"])
-        link_tag = art.find("a", class_="permalink") or art.find("a", href=True)
-        author_tag = art.find("span", class_="author")
-        time_tag = art.find("time")
-
-        img_tag = art.find("img")
-        image_url = None
-        if img_tag and img_tag.get("data-src"):
-            image_url = img_tag["data-src"]
-        elif img_tag and img_tag.get("src"):
-            image_url = img_tag["src"]
-
-        if image_url and image_url.startswith("/"):
-            image_url = urljoin(base_url, image_url)
-
-        title = title_tag.get_text(strip=True) if title_tag else None
-        href = link_tag["href"] if link_tag and link_tag.get("href") else None
-        if href and href.startswith("/"):
-            href = urljoin(base_url, href)
-        author = author_tag.get_text(strip=True) if author_tag else None
-        date = time_tag.get_text(strip=True) if time_tag else None
-
-        desc_section = art.find("section", class_="descr")
-        description = desc_section.get_text(strip=True) if desc_section else None
-
-        if title and href:
-            results.append({
-                "title": title,
-                "url": href,
-                "author": author,
-                "date": date,
-                "image_url": image_url,
-                "description": description,
-            })
-    return results
-
-def fetch_plugin_page(session, plugin_url, base_url):
-    headers = {"User-Agent": "Mozilla/5.0", "Referer": base_url + "/"}
-    r = session.get(plugin_url, headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.text
-
-def find_peeplink(html):
-    soup = BeautifulSoup(html, "html.parser")
-    dl_block = soup.find("div", class_="DL_Blocks download")
-    if dl_block:
-        a = dl_block.find("a", href=True)
-        if a and "peeplink.in" in a["href"]:
-            return a["href"]
-    for a in soup.find_all("a", href=True):
-        if "peeplink.in" in a["href"]:
-            return a["href"]
-    m = re.search(r"(https?://peeplink\.in/[A-Za-z0-9]+)", html)
-    if m:
-        return m.group(1)
-    return None
-
-def fetch_peeplink_urls(peeplink_url):
-    headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(peeplink_url, headers=headers)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-    article = soup.find("article")
-    if not article:
-        return {}
-
-    urls_by_host = defaultdict(list)
-    for a in article.find_all("a", href=True):
-        href = a["href"].strip()
-        if not href:
-            continue
-        host = urlparse(href).netloc.lower()
-        fname = href.split("/")[-1]
-        base = fname.split(".part")[0] if ".part" in fname else fname
-        part_num = int(fname.split(".part")[1].split(".")[0]) if ".part" in fname else 1
-        urls_by_host[host].append((base, part_num, href))
-
-    grouped = defaultdict(lambda: defaultdict(dict))
-    for host, lst in urls_by_host.items():
-        for base, part_num, url in lst:
-            grouped[base][part_num][host] = url
-    return grouped
-
-def rd_unrestrict(url, token):
-    api_url = "https://api.real-debrid.com/rest/1.0/unrestrict/link"
-    headers = {"Authorization": f"Bearer {token}"}
-    data = {"link": url}
-    r = requests.post(api_url, headers=headers, data=data)
-    if r.status_code != 200:
-        return None
-    return r.json()["download"]
-
-def extract_archive(filepath, destination=None):
-    """Extract archive, automatically handling multi-part archives"""
-    if not os.path.exists(filepath):
-        return None
-        
-    if not destination:
-        # Use the archive name without extension as folder name
-        base_name = os.path.splitext(os.path.basename(filepath))[0]
-        # Remove .part01 etc. from the name
-        base_name = re.sub(r'\.part\d+', '', base_name)
-        destination = os.path.join(DOWNLOADS_FOLDER, base_name)
-    
-    os.makedirs(destination, exist_ok=True)
-    ext = os.path.splitext(filepath)[1].lower()
-    
-    try:
-        if ext == ".zip":
-            with zipfile.ZipFile(filepath, "r") as zip_ref:
-                zip_ref.extractall(destination)
-        elif ext in [".tar", ".gz", ".bz2", ".tgz"]:
-            with tarfile.open(filepath, "r:*") as tar_ref:
-                tar_ref.extractall(destination) # I'm not sure if this actually works, I haven't seen .tar files go around audioz, yet.
-        elif ext == ".rar":
-            # For RAR files, try to extract with multi-part support
-            try:
-                with rarfile.RarFile(filepath, "r") as rar_ref:
-                    rar_ref.extractall(destination)
-            except rarfile.NeedFirstVolume:
-                # If it's a multi-part RAR, find all parts
-                base_dir = os.path.dirname(filepath)
-                base_name = os.path.basename(filepath)
-                
-                # Find all part files
-                part_files = []
-                for f in os.listdir(base_dir):
-                    if f.startswith(base_name.split('.part')[0]) and f.endswith('.rar'):
-                        part_files.append(os.path.join(base_dir, f))
-                
-                # Sort parts numerically
-                part_files.sort(key=lambda x: int(re.search(r'\.part(\d+)', x).group(1)) if re.search(r'\.part(\d+)', x) else 0)
-                
-                if part_files:
-                    # Use the first part to extract all
-                    with rarfile.RarFile(part_files[0], "r") as rar_ref:
-                        rar_ref.extractall(destination)
-        else:
-            return None
-        return destination
-    except Exception as e:
-        print(f"Extraction error: {e}")
-        return None
+from PyQt6.QtCore import (
+    Qt,
+    QObject,
+    QThread,
+    QTimer,
+    pyqtSignal,
+    QSize,
+    QPoint,
+    QEvent,
+    QRectF,
+    QPointF,
+    QModelIndex,
+    QAbstractTableModel,
+    QAbstractListModel,
+)
+from PyQt6.QtGui import QPalette, QColor, QTextCursor, QTextCharFormat, QIntValidator, QImage, QPixmap, QIcon, QPainter, QPolygonF
+
+from audiozcore import (
+    DEFAULT_THEME,
+    LOG_COLORS,
+    DOWNLOADS_FOLDER,
+    TRACE_FILE,
+    CACHE_FOLDER,
+    RESULTS_PER_PAGE,
+    SEARCH_CACHE_FILE,
+    Settings,
+    LogFileWriter,
+    HttpCache,
+    SearchCache,
+    Catalog,
+    ResolutionCache,
+    TransferRegistry,
+    JobStore,
+    DownloadScheduler,
+    ControlServer,
+    ControlError,
+    MetricsServer,
+    DownloadHooks,
+    ReleaseDownloader,
+    ThroughputHistory,
+    format_speed,
+    make_session,
+    search_page,
+    fetch_listing_page,
+    parse_search_results,
+    resolve_release,
+    extract_release,
+    tracer,
+    metrics,
+)
 
-def open_folder(path):
-    if platform.system() == "Windows":
-        subprocess.Popen(f'explorer "{path}"')
-    elif platform.system() == "Darwin":
-        subprocess.Popen(["open", path])
-    else:
-        subprocess.Popen(["xdg-open", path])
+THUMBNAIL_FOLDER = os.path.join(CACHE_FOLDER, "thumbs")
+THUMBNAIL_SIZE = 64
 
 class SearchWorker(QThread):
     results_signal = pyqtSignal(list, int)
     log_signal = pyqtSignal(str, str)
     no_results_signal = pyqtSignal(int)
 
-    def __init__(self, term, cookie_string, base_url, search_start=1):
+    def __init__(self, term, cookie_string, base_url, search_start=1, http_cache=None):
         super().__init__()
         self.term = term
         self.cookie_string = cookie_string
         self.base_url = base_url
         self.search_start = search_start
+        self.http_cache = http_cache
 
     def run(self):
-        cookies = parse_cookie_string(self.cookie_string)
-        session = requests.Session()
-        for k, v in cookies.items():
-            session.cookies.set(k, v, domain="audioz.download", path="/")
+        session = make_session(self.cookie_string)
 
         self.log_signal.emit(
             f"Searching for '{self.term}' (Page {self.search_start})...",
             "INFO",
         )
         try:
-            html = post_search(
-                session, self.term, self.base_url, self.search_start
+            results = search_page(
+                session, self.term, self.base_url, self.search_start, self.http_cache
             )
         except Exception as e:
             self.log_signal.emit(f"Search failed: {e}", "ERROR")
             return
 
-        results = parse_search_results(html, self.base_url)
         if not results:
             self.no_results_signal.emit(self.search_start)
             return
@@ -369,6 +134,418 @@ class SearchWorker(QThread):
         # self.log_signal.emit(f"Found {len(results)} results", "SUCCESS")
         self.results_signal.emit(results, self.search_start)
 
+class DeepSearchWorker(QThread):
+    results_signal = pyqtSignal(list, int)  # new deduplicated results, page
+    page_results_signal = pyqtSignal(list, int)  # full page, for the search cache
+    log_signal = pyqtSignal(str, str)
+    done_signal = pyqtSignal(int)
+
+    def __init__(
+        self,
+        term,
+        cookie_string,
+        base_url,
+        max_pages=5,
+        concurrency=3,
+        http_cache=None,
+    ):
+        super().__init__()
+        self.term = term
+        self.cookie_string = cookie_string
+        self.base_url = base_url
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.http_cache = http_cache
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+
+    def fetch_page(self, page):
+        if not self.is_running:
+            return None
+        session = make_session(self.cookie_string)
+        return search_page(session, self.term, self.base_url, page, self.http_cache)
+
+    def run(self):
+        self.log_signal.emit(
+            f"Deep searching for '{self.term}' (Pages 1-{self.max_pages})...",
+            "INFO",
+        )
+        seen_urls = set()
+        last_page = self.max_pages
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {
+                pool.submit(self.fetch_page, page): page
+                for page in range(1, self.max_pages + 1)
+            }
+            for future in as_completed(futures):
+                page = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    if not future.cancelled():
+                        self.log_signal.emit(f"Search page {page} failed: {e}", "WARNING")
+                    continue
+                if not self.is_running:
+                    for f in futures:
+                        f.cancel()
+                    continue
+                if page > last_page or results is None:
+                    continue
+
+                # Nothing exists past an empty or short page, skip what has not started yet
+                if len(results) < RESULTS_PER_PAGE:
+                    last_page = page if results else page - 1
+                    for f, p in futures.items():
+                        if p > last_page:
+                            f.cancel()
+                if not results:
+                    continue
+
+                self.page_results_signal.emit(results, page)
+                new_results = []
+                for result in results:
+                    if result["url"] not in seen_urls:
+                        seen_urls.add(result["url"])
+                        new_results.append(result)
+                if new_results:
+                    self.results_signal.emit(new_results, page)
+
+        self.done_signal.emit(len(seen_urls))
+
+class CatalogSyncWorker(QThread):
+    log_signal = pyqtSignal(str, str)
+    done_signal = pyqtSignal(int)
+
+    def __init__(
+        self,
+        cookie_string,
+        base_url,
+        catalog,
+        http_cache=None,
+        max_pages=20,
+        delay=2,
+    ):
+        super().__init__()
+        self.cookie_string = cookie_string
+        self.base_url = base_url
+        self.catalog = catalog
+        self.http_cache = http_cache
+        self.max_pages = max_pages
+        self.delay = delay
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        session = make_session(self.cookie_string)
+
+        self.log_signal.emit("Syncing catalog with the newest releases...", "INFO")
+        # Top of the listing when the last complete sync started. Searches also fill the
+        # catalog, so a release being known doesn't mean the sync got that far.
+        watermark = set(self.catalog.get_meta("sync_watermark", []))
+        # Left by a sync that ran out of pages before reaching the watermark. Releases only
+        # move further down the listing, so carrying on from that page skips nothing.
+        backfill = self.catalog.get_meta("sync_backfill")
+        first_page = backfill["page"] if backfill else 1
+        head = backfill["head"] if backfill else []
+        total_new = 0
+        complete = False
+        for page in range(first_page, first_page + self.max_pages):
+            if self.stop_event.is_set():
+                break
+            try:
+                html = fetch_listing_page(session, self.base_url, page, self.http_cache)
+            except Exception as e:
+                self.log_signal.emit(f"Catalog sync failed on page {page}: {e}", "ERROR")
+                break
+
+            results = parse_search_results(html, self.base_url)
+            if not results:
+                complete = True
+                break
+            if page == 1:
+                head = [r["url"] for r in results[:10]]
+            total_new += self.catalog.upsert(results)
+
+            # The listing is newest first, so reaching the last sync's top means we have caught up
+            if watermark & {r["url"] for r in results}:
+                complete = True
+                break
+            if page == first_page + self.max_pages - 1:
+                if watermark:
+                    self.catalog.set_meta("sync_backfill", {"page": page, "head": head})
+                    self.log_signal.emit(
+                        f"Catalog sync has not caught up yet, the next sync continues from page {page}",
+                        "INFO",
+                    )
+                else:
+                    # A first sync only ever covers max_pages
+                    complete = True
+                break
+            if self.stop_event.wait(self.delay):
+                break
+
+        if complete and head:
+            self.catalog.set_meta("sync_watermark", head)
+            self.catalog.set_meta("sync_backfill", None)
+
+        self.log_signal.emit(
+            f"Catalog sync finished: {total_new} new releases ({self.catalog.count()} indexed)",
+            "SUCCESS",
+        )
+        self.done_signal.emit(total_new)
+
+class SearchPrefetcher(QObject):
+    """Quietly loads neighbouring search pages into the search cache"""
+
+    def __init__(self, search_cache, max_concurrent=2, catalog=None):
+        super().__init__()
+        self.search_cache = search_cache
+        self.catalog = catalog
+        self.max_concurrent = max_concurrent
+        self.generation = 0
+        self.term = None
+        self.pending = []
+        self.running = set()
+        self.workers = set()
+
+    def cancel(self):
+        # Running searches cannot be interrupted, their results are dropped instead
+        self.generation += 1
+        self.pending.clear()
+        self.running.clear()
+
+    def prefetch(self, term, pages, cookie_string, base_url, http_cache=None):
+        if term != self.term:
+            self.cancel()
+            self.term = term
+        for page in pages:
+            key = (page, base_url)
+            if page < 1 or key in self.running or any(p[0] == page for p in self.pending):
+                continue
+            if self.search_cache.get(term, page, base_url) is not None:
+                continue
+            self.pending.append((page, cookie_string, base_url, http_cache))
+        self._start_next()
+
+    def _start_next(self):
+        # Workers of a cancelled term still hold a connection until they finish, so they count too
+        while self.pending and len(self.workers) < self.max_concurrent:
+            page, cookie_string, base_url, http_cache = self.pending.pop(0)
+            worker = SearchWorker(self.term, cookie_string, base_url, page, http_cache)
+            generation = self.generation
+            term = self.term
+            key = (page, base_url)
+            self.running.add(key)
+            self.workers.add(worker)
+
+            def on_results(results, page, term=term, base_url=base_url, generation=generation):
+                if generation == self.generation:
+                    self.search_cache.put(term, page, base_url, results)
+                if self.catalog:
+                    self.catalog.upsert(results)
+
+            def on_finished(worker=worker, key=key, generation=generation):
+                self.workers.discard(worker)
+                if generation == self.generation:
+                    self.running.discard(key)
+                self._start_next()
+
+            worker.results_signal.connect(on_results)
+            worker.finished.connect(on_finished)
+            worker.start()
+
+class ResolveWorker(QThread):
+    resolved_signal = pyqtSignal(str, object)
+
+    def __init__(self, url, cookie_string, base_url, http_cache=None):
+        super().__init__()
+        self.url = url
+        self.cookie_string = cookie_string
+        self.base_url = base_url
+        self.http_cache = http_cache
+
+    def run(self):
+        session = make_session(self.cookie_string)
+        try:
+            grouped_links = resolve_release(session, self.url, self.base_url, self.http_cache)
+        except Exception:
+            grouped_links = None
+        self.resolved_signal.emit(self.url, grouped_links or None)
+
+class SpeculativeResolver(QObject):
+    """Resolves mirror links for results the user is looking at, before Download is clicked"""
+
+    def __init__(self, resolution_cache, max_concurrent=2, max_queued=4):
+        super().__init__()
+        self.resolution_cache = resolution_cache
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.pending = []
+        self.running = {}
+
+    def get(self, url):
+        return self.resolution_cache.get(url)
+
+    def request(self, url, cookie_string, base_url, http_cache=None):
+        if self.get(url) is not None or url in self.running:
+            return
+        if url in self.pending:
+            self.pending.remove(url)
+        # Most recently hovered first, drop what the user has moved away from
+        self.pending.insert(0, url)
+        del self.pending[self.max_queued:]
+        self._context = (cookie_string, base_url, http_cache)
+        self._start_next()
+
+    def _start_next(self):
+        while self.pending and len(self.running) < self.max_concurrent:
+            url = self.pending.pop(0)
+            worker = ResolveWorker(url, *self._context)
+            self.running[url] = worker
+            worker.resolved_signal.connect(self._on_resolved)
+            worker.finished.connect(lambda url=url: self._on_finished(url))
+            worker.start()
+
+    def _on_resolved(self, url, grouped_links):
+        if grouped_links:
+            self.resolution_cache.put(url, grouped_links)
+
+    def _on_finished(self, url):
+        self.running.pop(url, None)
+        self._start_next()
+
+class ThumbnailLoader(QObject):
+    """Fetches and downscales result thumbnails off the GUI thread"""
+
+    thumbnail_ready = pyqtSignal(str, QPixmap)
+    _image_ready = pyqtSignal(str, QImage)
+
+    def __init__(
+        self,
+        base_url,
+        max_workers=4,
+        max_bytes=32 * 1024 * 1024,
+        folder=THUMBNAIL_FOLDER,
+        max_disk_bytes=64 * 1024 * 1024,
+    ):
+        super().__init__()
+        self.base_url = base_url
+        self.max_bytes = max_bytes
+        self.folder = folder
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_bytes = None
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.pixmaps = OrderedDict()
+        self.total_bytes = 0
+        self.pending = set()
+        self.wanted = set()
+        self.lock = threading.Lock()
+        self._image_ready.connect(self._on_image_ready)
+
+    def cached(self, url):
+        pixmap = self.pixmaps.get(url)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(url)
+        return pixmap
+
+    def set_wanted(self, urls):
+        """Only these URLs are worth fetching, anything else still queued is skipped"""
+        with self.lock:
+            self.wanted = set(urls)
+        for url in urls:
+            if url in self.pixmaps:
+                continue
+            with self.lock:
+                if url in self.pending:
+                    continue
+                self.pending.add(url)
+            self.pool.submit(self._load, url)
+
+    def _disk_path(self, url):
+        return os.path.join(self.folder, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".png")
+
+    def _load(self, url):
+        import requests
+
+        try:
+            with self.lock:
+                if url not in self.wanted:
+                    return
+            path = self._disk_path(url)
+            image = QImage(path) if os.path.exists(path) else QImage()
+            if not image.isNull():
+                # The mtime is the disk cache's LRU clock
+                os.utime(path)
+            else:
+                headers = {"User-Agent": "Mozilla/5.0", "Referer": self.base_url + "/"}
+                r = requests.get(url, headers=headers, timeout=15)
+                r.raise_for_status()
+                image = QImage.fromData(r.content)
+                if image.isNull():
+                    return
+                image = image.scaled(
+                    THUMBNAIL_SIZE,
+                    THUMBNAIL_SIZE,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+                self._save(path, image)
+            self._image_ready.emit(url, image)
+        except Exception:
+            pass
+        finally:
+            with self.lock:
+                self.pending.discard(url)
+
+    def _save(self, path, image):
+        """Write a thumbnail to disk, dropping the least recently used ones past max_disk_bytes"""
+        os.makedirs(self.folder, exist_ok=True)
+        if not image.save(path, "PNG"):
+            return
+        with self.lock:
+            if self.disk_bytes is None:
+                self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.folder))
+            else:
+                self.disk_bytes += os.path.getsize(path)
+            if self.disk_bytes <= self.max_disk_bytes:
+                return
+            entries = sorted(os.scandir(self.folder), key=lambda entry: entry.stat().st_mtime)
+            # Trim to 90% so the folder isn't scanned again on the very next save
+            for entry in entries:
+                if self.disk_bytes <= self.max_disk_bytes * 0.9:
+                    break
+                if entry.path == path:
+                    continue
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                    self.disk_bytes -= size
+                except OSError:
+                    pass
+
+    def _on_image_ready(self, url, image):
+        # QPixmap may only be created on the GUI thread
+        pixmap = QPixmap.fromImage(image)
+        size = pixmap.width() * pixmap.height() * 4
+        old = self.pixmaps.pop(url, None)
+        if old is not None:
+            self.total_bytes -= old.width() * old.height() * 4
+        self.pixmaps[url] = pixmap
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self.pixmaps) > 1:
+            _, old = self.pixmaps.popitem(last=False)
+            self.total_bytes -= old.width() * old.height() * 4
+        self.thumbnail_ready.emit(url, pixmap)
+
+    def shutdown(self):
+        with self.lock:
+            self.wanted = set()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
 class DownloadWorker(QThread):
     log_signal = pyqtSignal(str, str)
     progress_signal = pyqtSignal(str, str, int, int)
@@ -385,246 +562,569 @@ class DownloadWorker(QThread):
         rd_token,
         host_order=None,
         worker_id=None,
-        download_strategy="auto",
         max_retries=3,
         retry_delay=5,
+        http_cache=None,
+        grouped_links=None,
+        resolution_cache=None,
+        transfers=None,
+        job_store=None,
+        scheduler=None,
+        priority=0,
     ):
         super().__init__()
-        self.url = url
-        self.cookie_string = cookie_string
-        self.base_url = base_url
-        self.rd_token = rd_token
-        self.host_order = host_order or []
         self.worker_id = worker_id or str(id(self))
-        self.download_strategy = download_strategy
-        self.max_retries = max_retries
-        self.retry_delay = retry_delay
-        self.is_running = True
-        self.current_part = 0
-        self.total_parts = 0
+        self.downloader = ReleaseDownloader(
+            url,
+            cookie_string,
+            base_url,
+            rd_token,
+            host_order,
+            self.worker_id,
+            max_retries,
+            retry_delay,
+            http_cache,
+            grouped_links,
+            resolution_cache,
+            transfers,
+            DownloadHooks(
+                log=self.log_signal.emit,
+                status=self.status_signal.emit,
+                progress=self.progress_signal.emit,
+                file_started=self.download_started.emit,
+                part_progress=self.part_progress_signal.emit,
+                finished=self.download_finished.emit,
+            ),
+            job_store,
+            scheduler,
+            priority,
+        )
 
-    def download_file_with_progress(self, url, filename, retry_count=0):
-        """Download file with resume support and retries"""
-        os.makedirs(DOWNLOADS_FOLDER, exist_ok=True)
-        filepath = os.path.join(DOWNLOADS_FOLDER, filename)
+    def stop(self):
+        self.downloader.stop()
 
-        # Check if file already exists for resume
-        downloaded_size = 0
-        if os.path.exists(filepath):
-            downloaded_size = os.path.getsize(filepath)
-            self.log_signal.emit(f"Resuming download: {filename} ({downloaded_size} bytes already downloaded)", "INFO")
+    def pause(self):
+        self.downloader.pause()
 
-        self.download_started.emit(filename, self.worker_id)
-        
-        headers = {}
-        if downloaded_size > 0:
-            headers['Range'] = f'bytes={downloaded_size}-'
+    def resume(self):
+        self.downloader.resume()
 
-        try:
-            response = requests.get(url, stream=True, timeout=30, headers=headers)
-            
-            # Handle resume
-            if downloaded_size > 0 and response.status_code == 416:
-                self.log_signal.emit(f"File already complete: {filename}", "SUCCESS")
-                return True
-            elif downloaded_size > 0 and response.status_code == 206:  # Partial content
-                total_size = downloaded_size + int(response.headers.get('content-length', 0))
-            else:
-                response.raise_for_status()
-                total_size = int(response.headers.get("content-length", 0))
-                if downloaded_size > 0:
-                    # Server doesn't support resume, start over
-                    downloaded_size = 0
-                    self.log_signal.emit(f"Server doesn't support resume, restarting: {filename}", "WARNING")
-
-            mode = 'ab' if downloaded_size > 0 else 'wb'
-            with open(filepath, mode) as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk and self.is_running:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0:
-                            self.progress_signal.emit(
-                                filename,
-                                self.worker_id,
-                                downloaded_size,
-                                total_size,
-                            )
-                    elif not self.is_running:
-                        break
-            
-            return True
+    def run(self):
+        self.downloader.run()
 
-        except Exception as e:
-            if retry_count < self.max_retries:
-                self.log_signal.emit(f"Download failed, retrying ({retry_count + 1}/{self.max_retries}): {e}", "WARNING")
-                time.sleep(self.retry_delay)
-                return self.download_file_with_progress(url, filename, retry_count + 1)
-            else:
-                raise e
+class ExtractWorker(QThread):
+    log_signal = pyqtSignal(str, str)
+    extracted_signal = pyqtSignal(str, object)
 
-    def stop(self):
-        self.is_running = False
+    def __init__(self, job_id, grouped_links, delete_parts=False):
+        super().__init__()
+        self.job_id = job_id
+        self.grouped_links = grouped_links
+        self.delete_parts = delete_parts
 
     def run(self):
-        self.status_signal.emit(self.worker_id, "Preparing...")
-        cookies = parse_cookie_string(self.cookie_string)
-        session = requests.Session()
-        for k, v in cookies.items():
-            session.cookies.set(k, v, domain="audioz.download", path="/")
-
-        self.status_signal.emit(self.worker_id, "Fetching page...")
         try:
-            plugin_html = fetch_plugin_page(session, self.url, self.base_url)
+            folders = extract_release(self.grouped_links, self.delete_parts, self.log_signal.emit)
         except Exception as e:
-            self.status_signal.emit(self.worker_id, "Error")
-            self.log_signal.emit(f"Failed to fetch plugin page: {e}", "ERROR")
-            self.download_finished.emit(self.worker_id)
-            return
+            self.log_signal.emit(f"Error extracting: {e}", "ERROR")
+            folders = []
+        self.extracted_signal.emit(self.job_id, folders)
+
+class SearchResultsModel(QAbstractListModel):
+    """Search results that grow a page at a time as the view scrolls to the end"""
+
+    fetch_more_requested = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+        self.rows_by_url = {}
+        self.image_rows = defaultdict(list)
+        self.icons = {}
+        self.next_page = 1
+        self.has_more = False
+        self.loading = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        result = self.results[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            lines = [result["title"]]
+            if result.get("author"):
+                lines.append(f"By: {result['author']}")
+            if result.get("date"):
+                lines.append(result["date"])
+            return "\n".join(lines)
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.icons.get(result.get("image_url"))
+        if role == Qt.ItemDataRole.UserRole:
+            return result
+        return None
 
-        peeplink = find_peeplink(plugin_html)
-        if not peeplink:
-            self.status_signal.emit(self.worker_id, "No peeplink")
-            self.log_signal.emit("Peeplink not found.", "WARNING")
-            self.download_finished.emit(self.worker_id)
+    def reset(self, has_more=False):
+        self.beginResetModel()
+        self.results = []
+        self.rows_by_url = {}
+        self.image_rows = defaultdict(list)
+        # Only the current results keep icons, ThumbnailLoader's LRU holds the rest
+        self.icons = {}
+        self.next_page = 1
+        self.has_more = has_more
+        self.loading = False
+        self.endResetModel()
+
+    def append_results(self, results):
+        new_results = [r for r in results if r["url"] not in self.rows_by_url]
+        if not new_results:
             return
+        first = len(self.results)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_results) - 1)
+        for row, result in enumerate(new_results, first):
+            self.results.append(result)
+            self.rows_by_url[result["url"]] = row
+            if result.get("image_url"):
+                self.image_rows[result["image_url"]].append(row)
+        self.endInsertRows()
+
+    def append_page(self, results, page):
+        self.append_results(results)
+        self.next_page = page + 1
+        # A short page is the last one
+        self.has_more = len(results) >= RESULTS_PER_PAGE
+        self.loading = False
+
+    def end_of_results(self):
+        self.has_more = False
+        self.loading = False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        self.loading = True
+        self.fetch_more_requested.emit(self.next_page)
+
+    def set_thumbnail(self, image_url, pixmap):
+        rows = self.image_rows.get(image_url)
+        if not rows:
+            return
+        self.icons[image_url] = QIcon(pixmap)
+        for row in rows:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
 
-        self.status_signal.emit(self.worker_id, "Processing links...")
-        grouped_links = fetch_peeplink_urls(peeplink)
-        if not grouped_links:
-            self.status_signal.emit(self.worker_id, "No links")
-            self.log_signal.emit("No links found.", "WARNING")
-            self.download_finished.emit(self.worker_id)
+class SearchResultsWindow(QDialog):
+    """One results window reused by every search, rows are fetched as the user scrolls"""
+
+    download_requested = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.resize(800, 600)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.model = SearchResultsModel(self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        # Rows all have the same height, so the view can skip measuring each one
+        self.view.setUniformItemSizes(True)
+        self.view.setWordWrap(False)
+        self.view.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.view.setMouseTracking(True)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.view.doubleClicked.connect(lambda index: self.download_requested.emit(self.current_result()))
+        layout.addWidget(self.view)
+
+        button_layout = QHBoxLayout()
+        self.download_btn = QPushButton("Download Selected")
+        self.close_btn = QPushButton("Close")
+        button_layout.addWidget(self.download_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_btn)
+        layout.addLayout(button_layout)
+
+        self.download_btn.clicked.connect(lambda: self.download_requested.emit(self.current_result()))
+        self.close_btn.clicked.connect(self.close)
+
+    def apply_styles(self, dialog_style, button_style):
+        self.setStyleSheet(dialog_style)
+        self.download_btn.setStyleSheet(button_style)
+        self.close_btn.setStyleSheet(button_style)
+
+    def begin(self, title, status_text, has_more=False):
+        self.setWindowTitle(title)
+        self.status_label.setText(status_text)
+        self.model.reset(has_more)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def set_status(self, text):
+        self.status_label.setText(text)
+
+    def current_result(self):
+        index = self.view.currentIndex()
+        return index.data(Qt.ItemDataRole.UserRole) if index.isValid() else None
+
+    def visible_results(self):
+        viewport = self.view.viewport()
+        first = self.view.indexAt(QPoint(0, 0)).row()
+        last = self.view.indexAt(QPoint(0, viewport.height() - 1)).row()
+        if first < 0:
+            return []
+        if last < 0:
+            last = self.model.rowCount() - 1
+        return self.model.results[first:last + 1]
+
+class ControlBridge(QObject):
+    """Runs control API calls on the GUI thread and hands the answers back to the HTTP threads"""
+
+    _call_signal = pyqtSignal(object)
+
+    def __init__(self, gui, timeout=5):
+        super().__init__(gui)
+        self.gui = gui
+        self.timeout = timeout
+        self._call_signal.connect(self._run)
+
+    def _run(self, call):
+        try:
+            call["result"] = call["fn"]()
+        except Exception as e:
+            call["error"] = e
+        call["done"].set()
+
+    def call(self, fn):
+        call = {"fn": fn, "done": threading.Event()}
+        self._call_signal.emit(call)
+        if not call["done"].wait(self.timeout):
+            raise TimeoutError()
+        if "error" in call:
+            raise call["error"]
+        return call.get("result")
+
+    def enqueue(self, url, title, priority=0):
+        if not self.gui.settings.rd_access_token:
+            raise ControlError(409, "no Real-Debrid token configured")
+        return self.call(lambda: self.gui.enqueue_download(url, title, priority))
+
+    def list_jobs(self):
+        return self.call(self.gui.job_snapshots)
+
+    def cancel(self, job_id):
+        return self.call(lambda: self.gui.cancel_download(job_id))
+
+    def pause(self, job_id):
+        return self.call(lambda: self.gui.pause_download(job_id))
+
+    def resume(self, job_id):
+        return self.call(lambda: self.gui.resume_download(job_id))
+
+    def approve(self, job_id):
+        return self.call(lambda: self.gui.approve_download(job_id))
+
+    def set_priority(self, job_id, priority):
+        return self.call(lambda: self.gui.set_job_priority(job_id, priority))
+
+class LogPipeline(QObject):
+    """Collects log lines from any thread and writes them to the log view in batches"""
+
+    def __init__(self, log_area, status_label, log_colors, file_writer=None, max_batch=500):
+        super().__init__(log_area)
+        self.log_area = log_area
+        self.status_label = status_label
+        self.file_writer = file_writer
+        self.max_batch = max_batch
+        self.queue = queue.SimpleQueue()
+        self.set_colors(log_colors)
+        self.timer = QTimer(self)
+        self.timer.setInterval(100)
+        self.timer.timeout.connect(self.drain)
+        self.timer.start()
+
+    def set_colors(self, log_colors):
+        self.formats = {}
+        for level, color in {**LOG_COLORS, **log_colors}.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            self.formats[level] = text_format
+
+    def push(self, message, level="INFO"):
+        """Safe to call from worker threads, nothing here touches widgets"""
+        timestamp = time.strftime("%H:%M:%S")
+        self.queue.put((timestamp, level, message))
+        if self.file_writer:
+            self.file_writer.write(timestamp, level, message)
+
+    def drain(self):
+        entries = []
+        while len(entries) < self.max_batch:
+            try:
+                entries.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if not entries:
             return
 
-        if not self.host_order:
-            all_hosts = sorted(
-                {
-                    h
-                    for base in grouped_links.values()
-                    for part in base.values()
-                    for h in part
-                }
+        scrollbar = self.log_area.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        document = self.log_area.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for timestamp, level, message in entries:
+            if not document.isEmpty():
+                cursor.insertBlock()
+            cursor.insertText(
+                f"[{timestamp}] {message}",
+                self.formats.get(level, self.formats["INFO"]),
             )
-            self.host_order = all_hosts
+        cursor.endEditBlock()
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
 
-        # Calculate total parts
-        total_parts = 0
-        for file_base, parts in grouped_links.items():
-            total_parts += len(parts)
-        self.total_parts = total_parts
+        self.status_label.setText(entries[-1][2])
 
-        for file_base, parts in grouped_links.items():
-            if not self.is_running:
-                break
-            self.status_signal.emit(self.worker_id, "Downloading...")
-            self.log_signal.emit(f"Downloading file: {file_base}", "DOWNLOAD")
-            max_part = max(parts.keys())
-            
-            # Manual download strategy: ask for each part
-            if self.download_strategy == "manual":
-                for part_num in range(1, max_part + 1):
-                    if not self.is_running:
-                        break
-                    
-                    # Check if part already exists
-                    filename = f"{file_base}.part{part_num}.rar"
-                    filepath = os.path.join(DOWNLOADS_FOLDER, filename)
-                    if os.path.exists(filepath):
-                        file_size = os.path.getsize(filepath)
-                        self.log_signal.emit(f"Part {part_num}/{max_part} already exists ({file_size} bytes), skipping", "INFO")
-                        self.current_part = part_num
-                        self.part_progress_signal.emit(self.worker_id, part_num, max_part)
-                        continue
-                    
-                    # Ask user if they want to download this part
-                    self.log_signal.emit(f"Part {part_num}/{max_part} available. Download? (Check status column)", "INFO")
-                    self.current_part = part_num
-                    self.part_progress_signal.emit(self.worker_id, part_num, max_part)
-                    
-                    # Wait for user confirmation (implemented via status checking)
-                    # In a real implementation, you'd want a proper dialog
-                    # For now, we'll just proceed after a short delay
-                    time.sleep(1)
-                    
-                    success = False
-                    for host in self.host_order:
-                        if not self.is_running:
-                            break
-                        url = parts.get(part_num, {}).get(host)
-                        if url:
-                            rd_link = rd_unrestrict(url, self.rd_token)
-                            if rd_link:
-                                try:
-                                    self.download_file_with_progress(
-                                        rd_link, filename
-                                    )
-                                    self.log_signal.emit(
-                                        f"Downloaded {filename}", "SUCCESS"
-                                    )
-                                    success = True
-                                    break
-                                except Exception as e:
-                                    self.log_signal.emit(
-                                        f"Failed {filename}: {e}", "ERROR"
-                                    )
-                    if not success:
-                        self.log_signal.emit(
-                            f"Part {part_num} could not be downloaded.", "WARNING"
-                        )
-                    time.sleep(1)
-            
-            # Auto download strategy: download all parts automatically
-            else:
-                for part_num in range(1, max_part + 1):
-                    if not self.is_running:
-                        break
-                    
-                    # Check if part already exists and is complete
-                    filename = f"{file_base}.part{part_num}.rar"
-                    filepath = os.path.join(DOWNLOADS_FOLDER, filename)
-                    if os.path.exists(filepath):
-                        # For now, we'll skip existing files. realistically we should verify file integrity
-                        file_size = os.path.getsize(filepath)
-                        self.log_signal.emit(f"Part {part_num}/{max_part} already exists ({file_size} bytes), skipping", "INFO")
-                        self.current_part = part_num
-                        self.part_progress_signal.emit(self.worker_id, part_num, max_part)
-                        continue
-                    
-                    self.current_part = part_num
-                    self.part_progress_signal.emit(self.worker_id, part_num, max_part)
-                    
-                    success = False
-                    for host in self.host_order:
-                        if not self.is_running:
-                            break
-                        url = parts.get(part_num, {}).get(host)
-                        if url:
-                            rd_link = rd_unrestrict(url, self.rd_token)
-                            if rd_link:
-                                try:
-                                    self.download_file_with_progress(
-                                        rd_link, filename
-                                    )
-                                    self.log_signal.emit(
-                                        f"Downloaded {filename}", "SUCCESS"
-                                    )
-                                    success = True
-                                    break
-                                except Exception as e:
-                                    self.log_signal.emit(
-                                        f"Failed {filename}: {e}", "ERROR"
-                                    )
-                    if not success:
-                        self.log_signal.emit(
-                            f"Part {part_num} could not be downloaded.", "WARNING"
-                        )
-                    time.sleep(1)
-
-        if self.is_running:
-            self.status_signal.emit(self.worker_id, "Completed")
-            self.log_signal.emit("Download completed successfully", "SUCCESS")
-        self.download_finished.emit(self.worker_id)
+class DownloadsModel(QAbstractTableModel):
+    """Rows of download jobs addressed by stable job IDs, repainted in batches"""
+
+    COLUMNS = ["Name", "Status", "Progress", "Speed", "Actions"]
+    NAME, STATUS, PROGRESS, SPEED, ACTIONS = range(5)
+    JobRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = []
+        self.rows = {}
+        self.dirty_rows = set()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(100)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self.jobs[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.NAME:
+                return job["title"]
+            if column == self.STATUS:
+                return job["status"]
+            if column == self.PROGRESS:
+                return job["progress"]
+            if column == self.SPEED:
+                return job["speed"]
+            if column == self.ACTIONS:
+                return job["action"]
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column == self.SPEED:
+            return Qt.AlignmentFlag.AlignCenter
+        elif role == self.JobRole:
+            return job
+        return None
+
+    def add_job(self, job_id, title, status="Queued"):
+        row = len(self.jobs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.jobs.append({
+            "id": job_id,
+            "title": title,
+            "status": status,
+            "progress": 0,
+            "speed": "",
+            "action": "Cancel",
+            "active": True,
+            "priority": 0,
+        })
+        self.rows[job_id] = row
+        self.endInsertRows()
+        return row
+
+    def job(self, job_id):
+        row = self.rows.get(job_id)
+        return self.jobs[row] if row is not None else None
+
+    def row_of(self, job_id):
+        return self.rows.get(job_id)
+
+    def update_job(self, job_id, **fields):
+        row = self.rows.get(job_id)
+        if row is None:
+            return
+        self.jobs[row].update(fields)
+        self.dirty_rows.add(row)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        """Emit one dataChanged per contiguous run of changed rows"""
+        rows = sorted(self.dirty_rows)
+        self.dirty_rows.clear()
+        last_column = len(self.COLUMNS) - 1
+        start = prev = None
+        for row in rows + [None]:
+            if start is not None and (row is None or row != prev + 1):
+                self.dataChanged.emit(self.index(start, 0), self.index(prev, last_column))
+                start = None
+            if row is not None and start is None:
+                start = row
+            prev = row
+
+    def remove_jobs(self, predicate):
+        self.beginResetModel()
+        self.jobs = [job for job in self.jobs if not predicate(job)]
+        self.rows = {job["id"]: row for row, job in enumerate(self.jobs)}
+        self.dirty_rows.clear()
+        self.endResetModel()
+
+class ProgressDelegate(QStyledItemDelegate):
+    def __init__(self, theme, parent=None):
+        super().__init__(parent)
+        self.theme = theme
+
+    def paint(self, painter, option, index):
+        job = index.data(DownloadsModel.JobRole)
+        value = index.data() or 0
+        t = self.theme
+        rect = QRectF(option.rect.adjusted(4, 10, -4, -10))
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(t["surface_highlight"] if job["active"] else t["text_disabled"]))
+        painter.drawRoundedRect(rect, 3, 3)
+        if value > 0:
+            chunk = QRectF(rect)
+            chunk.setWidth(rect.width() * min(value, 100) / 100)
+            painter.setBrush(QColor(t["accent"] if job["active"] else t["control_disabled"]))
+            painter.drawRoundedRect(chunk, 3, 3)
+        painter.setPen(QColor(t["control_fg"] if job["active"] else t["control_disabled"]))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, f"{value}%")
+        painter.restore()
+
+class ActionDelegate(QStyledItemDelegate):
+    """Paints the Cancel button instead of hosting a real QPushButton per row"""
+
+    clicked = pyqtSignal(str)
+
+    def __init__(self, theme, parent=None):
+        super().__init__(parent)
+        self.theme = theme
+
+    def button_rect(self, option):
+        return QRectF(option.rect.adjusted(6, 8, -6, -8))
+
+    def paint(self, painter, option, index):
+        job = index.data(DownloadsModel.JobRole)
+        t = self.theme
+        rect = self.button_rect(option)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver) and job["active"]
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if job["active"]:
+            painter.setBrush(QColor(t["main_focus"] if hovered else t["surface_highlight"]))
+            painter.setPen(QColor(t["accent"] if hovered else t["control_selection_frame"]))
+        else:
+            painter.setBrush(QColor(t["text_disabled"]))
+            painter.setPen(QColor(t["control_selection_frame"]))
+        painter.drawRoundedRect(rect, 2, 2)
+        painter.setPen(QColor(t["control_fg"] if job["active"] else t["surface_area"]))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, index.data())
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            job = index.data(DownloadsModel.JobRole)
+            if job["active"] and self.button_rect(option).contains(event.position()):
+                self.clicked.emit(job["id"])
+                return True
+        return False
+
+class ThroughputGraph(QWidget):
+    """Aggregate speed over the history window, selected jobs drawn on top, painted by hand"""
+
+    def __init__(self, history, theme, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.theme = theme
+        self.job_ids = []
+        self.setMinimumHeight(60)
+        self.setMaximumHeight(120)
+
+    def points(self, series, rect, peak):
+        """One point per pixel at most, keeping the highest sample of each bucket"""
+        step = max(1, -(-len(series) // max(int(rect.width()), 1)))
+        x_step = rect.width() / max(self.history.size - 1, 1)
+        offset = self.history.size - len(series)
+        points = []
+        for i in range(0, len(series), step):
+            value = max(series[i:i + step])
+            points.append(QPointF(
+                rect.left() + (offset + i) * x_step,
+                rect.bottom() - value / peak * rect.height(),
+            ))
+        return points
+
+    def paintEvent(self, event):
+        t = self.theme
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(t["surface_area"]))
+        rect = QRectF(self.rect().adjusted(0, 18, 0, -1))
+
+        total = self.history.series()
+        jobs = [self.history.series(job_id) for job_id in self.job_ids]
+        peak = max([max(total, default=0.0)] + [max(series, default=0.0) for series in jobs])
+        minutes = self.history.size // 60
+        painter.setPen(QColor(t["control_fg"]))
+        if peak <= 0:
+            painter.drawText(
+                self.rect().adjusted(6, 2, -6, 0),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                f"No download traffic in the last {minutes} min",
+            )
+            return
+        painter.drawText(
+            self.rect().adjusted(6, 2, -6, 0),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+            f"{format_speed(self.history.latest()) or '0 B/s'} now, peak {format_speed(peak)} over {minutes} min",
+        )
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        outline = self.points(total, rect, peak)
+        area = QPolygonF([QPointF(outline[0].x(), rect.bottom())] + outline + [QPointF(outline[-1].x(), rect.bottom())])
+        fill = QColor(t["accent"])
+        fill.setAlpha(60)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(fill)
+        painter.drawPolygon(area)
+        painter.setPen(QColor(t["accent"]))
+        painter.drawPolyline(QPolygonF(outline))
+        painter.setPen(QColor(t["accent_light"]))
+        for series in jobs:
+            if len(series) > 1:
+                painter.drawPolyline(QPolygonF(self.points(series, rect, peak)))
 
 class SettingsDialog(QDialog):
     def __init__(self, settings, parent=None):
@@ -655,7 +1155,7 @@ class SettingsDialog(QDialog):
 
         self.strategy_combo = QComboBox()
         self.strategy_combo.addItem("Auto - Instant Start", "auto")
-        self.strategy_combo.addItem("Manual - Confirm Parts", "manual")
+        self.strategy_combo.addItem("Manual - Approve First", "manual")
         self.strategy_combo.setCurrentIndex(0 if self.settings.download_strategy == "auto" else 1)
         dl_form.addRow("Workflow Mode:", self.strategy_combo)
 
@@ -666,6 +1166,20 @@ class SettingsDialog(QDialog):
         self.auto_delete_cb = QCheckBox("Clean up: Delete source archive after extraction")
         self.auto_delete_cb.setChecked(self.settings.auto_delete)
         dl_form.addRow("", self.auto_delete_cb)
+
+        self.thumbnails_cb = QCheckBox("Show cover thumbnails in search results")
+        self.thumbnails_cb.setChecked(self.settings.show_thumbnails)
+        dl_form.addRow("", self.thumbnails_cb)
+
+        self.speculative_cb = QCheckBox("Resolve links of selected results in the background")
+        self.speculative_cb.setChecked(self.settings.speculative_resolve)
+        dl_form.addRow("", self.speculative_cb)
+
+        self.throughput_spin = QSpinBox()
+        self.throughput_spin.setRange(1, 240)
+        self.throughput_spin.setValue(self.settings.throughput_minutes)
+        self.throughput_spin.setSuffix(" minutes")
+        dl_form.addRow("Speed Graph History:", self.throughput_spin)
         
         gen_layout.addWidget(dl_group)
 
@@ -684,6 +1198,81 @@ class SettingsDialog(QDialog):
         self.retry_delay_spin.setValue(self.settings.retry_delay)
         self.retry_delay_spin.setSuffix(" seconds")
         net_form.addRow("Wait Between Retries:", self.retry_delay_spin)
+
+        self.connections_spin = QSpinBox()
+        self.connections_spin.setRange(1, 16)
+        self.connections_spin.setValue(self.settings.max_connections)
+        self.connections_spin.setSuffix(" downloads")
+        net_form.addRow("Simultaneous Downloads:", self.connections_spin)
+
+        self.trace_cb = QCheckBox("Record per-stage timings to logs/trace.json")
+        self.trace_cb.setChecked(self.settings.trace_enabled)
+        net_form.addRow("", self.trace_cb)
+
+        self.http_cache_cb = QCheckBox("Cache audioz and peeplink pages on disk")
+        self.http_cache_cb.setChecked(self.settings.http_cache_enabled)
+        net_form.addRow("", self.http_cache_cb)
+
+        self.http_cache_spin = QSpinBox()
+        self.http_cache_spin.setRange(10, 2000)
+        self.http_cache_spin.setValue(self.settings.http_cache_size_mb)
+        self.http_cache_spin.setSuffix(" MB")
+        net_form.addRow("Page Cache Size:", self.http_cache_spin)
+
+        self.search_ttl_spin = QSpinBox()
+        self.search_ttl_spin.setRange(1, 24 * 60)
+        self.search_ttl_spin.setValue(self.settings.search_cache_ttl_minutes)
+        self.search_ttl_spin.setSuffix(" minutes")
+        net_form.addRow("Keep Search Results:", self.search_ttl_spin)
+
+        self.resolution_ttl_spin = QSpinBox()
+        self.resolution_ttl_spin.setRange(1, 24 * 30)
+        self.resolution_ttl_spin.setValue(self.settings.resolution_ttl_hours)
+        self.resolution_ttl_spin.setSuffix(" hours")
+        net_form.addRow("Keep Resolved Links:", self.resolution_ttl_spin)
+
+        self.search_persist_cb = QCheckBox("Remember search results between sessions")
+        self.search_persist_cb.setChecked(self.settings.search_cache_persist)
+        net_form.addRow("", self.search_persist_cb)
+
+        self.prefetch_cb = QCheckBox("Prefetch the next search page in the background")
+        self.prefetch_cb.setChecked(self.settings.prefetch_enabled)
+        net_form.addRow("", self.prefetch_cb)
+
+        self.prefetch_prev_cb = QCheckBox("Also prefetch the previous page")
+        self.prefetch_prev_cb.setChecked(self.settings.prefetch_previous)
+        net_form.addRow("", self.prefetch_prev_cb)
+
+        self.prefetch_spin = QSpinBox()
+        self.prefetch_spin.setRange(1, 4)
+        self.prefetch_spin.setValue(self.settings.prefetch_concurrency)
+        self.prefetch_spin.setSuffix(" pages")
+        net_form.addRow("Concurrent Prefetches:", self.prefetch_spin)
+
+        self.deep_pages_spin = QSpinBox()
+        self.deep_pages_spin.setRange(2, 50)
+        self.deep_pages_spin.setValue(self.settings.deep_search_pages)
+        self.deep_pages_spin.setSuffix(" pages")
+        net_form.addRow("Deep Search Depth:", self.deep_pages_spin)
+
+        self.deep_concurrency_spin = QSpinBox()
+        self.deep_concurrency_spin.setRange(1, 8)
+        self.deep_concurrency_spin.setValue(self.settings.deep_search_concurrency)
+        self.deep_concurrency_spin.setSuffix(" requests")
+        net_form.addRow("Deep Search Parallelism:", self.deep_concurrency_spin)
+
+        self.sync_interval_spin = QSpinBox()
+        self.sync_interval_spin.setRange(0, 24 * 60)
+        self.sync_interval_spin.setValue(self.settings.sync_interval_minutes)
+        self.sync_interval_spin.setSuffix(" minutes")
+        self.sync_interval_spin.setSpecialValueText("Manual only")
+        net_form.addRow("Catalog Sync Interval:", self.sync_interval_spin)
+
+        self.sync_delay_spin = QSpinBox()
+        self.sync_delay_spin.setRange(0, 60)
+        self.sync_delay_spin.setValue(self.settings.sync_delay)
+        self.sync_delay_spin.setSuffix(" seconds")
+        net_form.addRow("Delay Between Sync Pages:", self.sync_delay_spin)
         
         gen_layout.addWidget(net_group)
         gen_layout.addStretch()
@@ -726,6 +1315,43 @@ class SettingsDialog(QDialog):
         auth_form.addRow("RD API Token:", token_row)
 
         acc_layout.addWidget(auth_group)
+
+        api_group = QGroupBox("Control API")
+        api_form = QFormLayout(api_group)
+
+        self.api_cb = QCheckBox("Accept download commands over HTTP (localhost only)")
+        self.api_cb.setChecked(self.settings.api_enabled)
+        api_form.addRow("", self.api_cb)
+
+        self.api_port_spin = QSpinBox()
+        self.api_port_spin.setRange(1024, 65535)
+        self.api_port_spin.setValue(self.settings.api_port)
+        api_form.addRow("Port:", self.api_port_spin)
+
+        self.api_token_input = QLineEdit()
+        self.api_token_input.setText(self.settings.api_token)
+        self.api_token_input.setPlaceholderText("Generated when the API first starts")
+        self.api_token_input.setEchoMode(QLineEdit.EchoMode.Password)
+
+        api_token_row = QHBoxLayout()
+        api_token_row.addWidget(self.api_token_input)
+        self.btn_view_api_token = QPushButton("👁")
+        self.btn_view_api_token.setFixedSize(30, 30)
+        self.btn_view_api_token.setCheckable(True)
+        self.btn_view_api_token.clicked.connect(lambda: self.toggle_visibility(self.api_token_input, self.btn_view_api_token))
+        api_token_row.addWidget(self.btn_view_api_token)
+        api_form.addRow("API Token:", api_token_row)
+
+        self.metrics_cb = QCheckBox("Serve Prometheus metrics at /metrics (localhost only, no token)")
+        self.metrics_cb.setChecked(self.settings.metrics_enabled)
+        api_form.addRow("", self.metrics_cb)
+
+        self.metrics_port_spin = QSpinBox()
+        self.metrics_port_spin.setRange(1024, 65535)
+        self.metrics_port_spin.setValue(self.settings.metrics_port)
+        api_form.addRow("Metrics Port:", self.metrics_port_spin)
+
+        acc_layout.addWidget(api_group)
         
         info_box = QLabel("Note: These tokens are stored locally in settings.json. Never share this file.")
         info_box.setWordWrap(True)
@@ -825,27 +1451,330 @@ class SettingsDialog(QDialog):
         self.settings.rd_access_token = self.token_input.text().strip()
         self.settings.auto_extract = self.auto_extract_cb.isChecked()
         self.settings.auto_delete = self.auto_delete_cb.isChecked()
+        self.settings.show_thumbnails = self.thumbnails_cb.isChecked()
+        self.settings.speculative_resolve = self.speculative_cb.isChecked()
+        self.settings.throughput_minutes = self.throughput_spin.value()
         self.settings.download_strategy = self.strategy_combo.currentData()
         self.settings.max_retries = self.retries_spin.value()
         self.settings.retry_delay = self.retry_delay_spin.value()
+        self.settings.max_connections = self.connections_spin.value()
+        self.settings.trace_enabled = self.trace_cb.isChecked()
+        self.settings.http_cache_enabled = self.http_cache_cb.isChecked()
+        self.settings.http_cache_size_mb = self.http_cache_spin.value()
+        self.settings.search_cache_ttl_minutes = self.search_ttl_spin.value()
+        self.settings.resolution_ttl_hours = self.resolution_ttl_spin.value()
+        self.settings.search_cache_persist = self.search_persist_cb.isChecked()
+        self.settings.prefetch_enabled = self.prefetch_cb.isChecked()
+        self.settings.prefetch_previous = self.prefetch_prev_cb.isChecked()
+        self.settings.prefetch_concurrency = self.prefetch_spin.value()
+        self.settings.deep_search_pages = self.deep_pages_spin.value()
+        self.settings.deep_search_concurrency = self.deep_concurrency_spin.value()
+        self.settings.sync_interval_minutes = self.sync_interval_spin.value()
+        self.settings.sync_delay = self.sync_delay_spin.value()
+        self.settings.api_enabled = self.api_cb.isChecked()
+        self.settings.api_port = self.api_port_spin.value()
+        self.settings.api_token = self.api_token_input.text().strip()
+        self.settings.metrics_enabled = self.metrics_cb.isChecked()
+        self.settings.metrics_port = self.metrics_port_spin.value()
         self.settings.save()
         self.accept()
 
+def theme_key(theme):
+    return tuple(sorted(theme.items()))
+
+@lru_cache(maxsize=4)
+def main_stylesheet(key):
+    t = dict(key)
+
+    stylesheet = """
+        QMainWindow {
+            background-color: """ + t["desktop"] + """;
+            color: """ + t["control_fg"] + """;
+        }
+        QToolBar {
+            background-color: """ + t["browser_bar"] + """;
+            border: none;
+            spacing: 5px;
+            padding: 5px;
+        }
+        QToolBar QPushButton {
+            background-color: """ + t["surface_highlight"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            border-radius: 3px;
+            padding: 8px 12px;
+            color: """ + t["control_fg"] + """;
+        }
+        QToolBar QPushButton:hover {
+            background-color: """ + t["main_focus"] + """;
+            border: 1px solid """ + t["accent"] + """;
+        }
+        QToolBar QPushButton:pressed {
+            background-color: """ + t["accent"] + """;
+            color: """ + t["control_on_fg"] + """;
+        }
+        QLineEdit {
+            background-color: """ + t["surface_bg"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            border-radius: 3px;
+            padding: 8px;
+            color: """ + t["control_fg"] + """;
+            font-size: 12px;
+            selection-background-color: """ + t["accent"] + """;
+            selection-color: """ + t["control_on_fg"] + """;
+        }
+        QLineEdit:focus {
+            border: 1px solid """ + t["accent"] + """;
+        }
+        QTableView {
+            background-color: """ + t["surface_bg"] + """;
+            border: none;
+            gridline-color: """ + t["control_selection_frame"] + """;
+            color: """ + t["control_fg"] + """;
+            font-size: 11px;
+        }
+        QTableView::item {
+            padding: 4px;
+            border-bottom: 1px solid """ + t["control_selection_frame"] + """;
+        }
+        QTableView::item:selected {
+            background-color: """ + t["surface_highlight"] + """;
+            color: """ + t["control_fg"] + """;
+        }
+        QHeaderView::section {
+            background-color: """ + t["tree_column_head_bg"] + """;
+            color: """ + t["control_fg"] + """;
+            padding: 6px;
+            border: none;
+            font-weight: bold;
+        }
+        QProgressBar {
+            border: none;
+            background-color: """ + t["surface_highlight"] + """;
+            border-radius: 3px;
+            text-align: center;
+            color: """ + t["control_fg"] + """;
+        }
+        QProgressBar::chunk {
+            background-color: """ + t["accent"] + """;
+            border-radius: 3px;
+        }
+        QProgressBar:disabled {
+            background-color: """ + t["text_disabled"] + """;
+            color: """ + t["control_disabled"] + """;
+        }
+        QProgressBar::chunk:disabled {
+            background-color: """ + t["control_disabled"] + """;
+        }
+        QPlainTextEdit {
+            background-color: """ + t["surface_bg"] + """;
+            border: none;
+            color: """ + t["control_fg"] + """;
+            font-family: 'Courier New', monospace;
+            font-size: 10px;
+        }
+        QSplitter::handle {
+            background-color: """ + t["control_selection_frame"] + """;
+        }
+        QLabel {
+            color: """ + t["control_fg"] + """;
+        }
+        QGroupBox {
+            color: """ + t["control_fg"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            border-radius: 3px;
+            margin-top: 10px;
+            padding-top: 10px;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            subcontrol-position: top left;
+            padding: 0 5px;
+        }
+        QCheckBox {
+            color: """ + t["control_fg"] + """;
+            spacing: 5px;
+        }
+        QCheckBox::indicator {
+            width: 13px;
+            height: 13px;
+        }
+        QCheckBox::indicator:unchecked {
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            background-color: """ + t["surface_bg"] + """;
+        }
+        QCheckBox::indicator:checked {
+            border: 1px solid """ + t["accent"] + """;
+            background-color: """ + t["accent"] + """;
+        }
+        QComboBox {
+            background-color: """ + t["surface_bg"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            border-radius: 3px;
+            padding: 5px;
+            color: """ + t["control_fg"] + """;
+            min-width: 120px;
+        }
+        QComboBox::drop-down {
+            border: none;
+        }
+        QComboBox::down-arrow {
+            image: none;
+            border-left: 5px solid transparent;
+            border-right: 5px solid transparent;
+            border-top: 5px solid """ + t["control_fg"] + """;
+            width: 0px;
+            height: 0px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: """ + t["surface_bg"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            color: """ + t["control_fg"] + """;
+            selection-background-color: """ + t["accent"] + """;
+            selection-color: """ + t["control_on_fg"] + """;
+        }
+    """
+    return stylesheet
+
+@lru_cache(maxsize=4)
+def search_dialog_stylesheet(key):
+    t = dict(key)
+
+    dialog_style = """
+        QDialog { 
+            background-color: """ + t["desktop"] + """; 
+            color: """ + t["control_fg"] + """; 
+        }
+        QListView { 
+            background-color: """ + t["surface_bg"] + """; 
+            border: 1px solid """ + t["control_selection_frame"] + """; 
+            color: """ + t["control_fg"] + """;
+            font-size: 11px;
+        }
+        QListView::item { 
+            padding: 10px; 
+            border-bottom: 1px solid """ + t["control_selection_frame"] + """;
+            margin-top: 3px;
+            margin-bottom: 3px;
+        }
+        QListView::item:selected { 
+            background-color: """ + t["surface_highlight"] + """;
+            color: """ + t["control_fg"] + """;
+        }
+        QListView::item:hover { 
+            background-color: """ + t["surface_highlight"] + """; 
+        }
+        QPushButton {
+            background-color: """ + t["surface_highlight"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            border-radius: 3px;
+            padding: 10px 18px;
+            color: """ + t["control_fg"] + """;
+            font-size: 12px;
+        }
+        QPushButton:hover {
+            background-color: """ + t["main_focus"] + """;
+            border: 1px solid """ + t["accent"] + """;
+        }
+        QPushButton:pressed {
+            background-color: """ + t["accent"] + """;
+            color: """ + t["control_on_fg"] + """;
+        }
+        QPushButton:disabled {
+            background-color: """ + t["text_disabled"] + """;
+            color: """ + t["surface_area"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+        }
+    """
+    return dialog_style
+
+@lru_cache(maxsize=4)
+def small_button_stylesheet(key):
+    t = dict(key)
+
+    small_btn_style = """
+        QPushButton {
+            background-color: """ + t["surface_highlight"] + """;
+            color: """ + t["control_fg"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+            border-radius: 2px;
+            padding: 2px 6px;
+            font-size: 10px;
+            min-height: 20px;
+        }
+        QPushButton:hover {
+            background-color: """ + t["main_focus"] + """;
+            border: 1px solid """ + t["accent"] + """;
+        }
+        QPushButton:pressed {
+            background-color: """ + t["accent"] + """;
+            color: """ + t["control_on_fg"] + """;
+        }
+        QPushButton:disabled {
+            background-color: """ + t["text_disabled"] + """;
+            color: """ + t["surface_area"] + """;
+            border: 1px solid """ + t["control_selection_frame"] + """;
+        }
+    """
+    return small_btn_style
+
 class AudiozGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Audioz Downloader")
         self.resize(1200, 700)
+        self.applied_stylesheet = None
         self.active_downloads = {}
         self.download_workers = {}
+        self.awaiting_jobs = {}
+        self.resolve_workers = set()
+        self.extract_workers = set()
+        self.jobs_by_url = {}
+        self.transfers = TransferRegistry()
+        self.job_store = JobStore()
+        self.job_store.start()
         self.settings = Settings()
-        self.search_cache = {}
+        self.scheduler = DownloadScheduler(self.settings.max_connections)
+        tracer.enabled = self.settings.trace_enabled
+        self.search_cache = SearchCache(
+            ttl=self.settings.search_cache_ttl_minutes * 60,
+            path=SEARCH_CACHE_FILE if self.settings.search_cache_persist else None,
+        )
+        self.catalog = Catalog()
+        self.search_prefetcher = SearchPrefetcher(
+            self.search_cache, self.settings.prefetch_concurrency, self.catalog
+        )
         self.current_search_term = ""
+        self.deep_search_worker = None
+        self.search_workers = set()
+        self.search_generation = 0
+        self.results_window = None
+        self.hovered_result = None
+        self.http_cache = None
+
+        self.thumbnail_loader = ThumbnailLoader(self.settings.base_url)
+        self.resolution_cache = ResolutionCache(ttl=self.settings.resolution_ttl_hours * 3600)
+        self.speculative_resolver = SpeculativeResolver(self.resolution_cache)
+        self.sync_worker = None
+        self.sync_timer = QTimer(self)
+        self.sync_timer.timeout.connect(self.start_catalog_sync)
+        self.control_bridge = ControlBridge(self)
+        self.control_server = None
+        self.metrics_server = None
+        self.throughput = ThroughputHistory(self.settings.throughput_minutes * 60)
+        self.throughput_timer = QTimer(self)
+        self.throughput_timer.timeout.connect(self.sample_throughput)
+        metrics.job_counts = self.job_counts
 
         os.makedirs(DOWNLOADS_FOLDER, exist_ok=True)
+        self.update_http_cache()
+        self.update_sync_timer()
 
         self.apply_theme()
         self.setup_ui()
+        self.restore_jobs()
+        self.update_control_server()
+        self.update_metrics_server()
+        self.throughput_timer.start(1000)
 
     def apply_theme(self):
         app = QApplication.instance()
@@ -882,155 +1811,11 @@ class AudiozGUI(QMainWindow):
 
         app.setPalette(palette)
 
-        stylesheet = """
-            QMainWindow {
-                background-color: """ + t["desktop"] + """;
-                color: """ + t["control_fg"] + """;
-            }
-            QToolBar {
-                background-color: """ + t["browser_bar"] + """;
-                border: none;
-                spacing: 5px;
-                padding: 5px;
-            }
-            QToolBar QPushButton {
-                background-color: """ + t["surface_highlight"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                border-radius: 3px;
-                padding: 8px 12px;
-                color: """ + t["control_fg"] + """;
-            }
-            QToolBar QPushButton:hover {
-                background-color: """ + t["main_focus"] + """;
-                border: 1px solid """ + t["accent"] + """;
-            }
-            QToolBar QPushButton:pressed {
-                background-color: """ + t["accent"] + """;
-                color: """ + t["control_on_fg"] + """;
-            }
-            QLineEdit {
-                background-color: """ + t["surface_bg"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                border-radius: 3px;
-                padding: 8px;
-                color: """ + t["control_fg"] + """;
-                font-size: 12px;
-                selection-background-color: """ + t["accent"] + """;
-                selection-color: """ + t["control_on_fg"] + """;
-            }
-            QLineEdit:focus {
-                border: 1px solid """ + t["accent"] + """;
-            }
-            QTableWidget {
-                background-color: """ + t["surface_bg"] + """;
-                border: none;
-                gridline-color: """ + t["control_selection_frame"] + """;
-                color: """ + t["control_fg"] + """;
-                font-size: 11px;
-            }
-            QTableWidget::item {
-                padding: 4px;
-                border-bottom: 1px solid """ + t["control_selection_frame"] + """;
-            }
-            QTableWidget::item:selected {
-                background-color: """ + t["surface_highlight"] + """;
-                color: """ + t["control_fg"] + """;
-            }
-            QHeaderView::section {
-                background-color: """ + t["tree_column_head_bg"] + """;
-                color: """ + t["control_fg"] + """;
-                padding: 6px;
-                border: none;
-                font-weight: bold;
-            }
-            QProgressBar {
-                border: none;
-                background-color: """ + t["surface_highlight"] + """;
-                border-radius: 3px;
-                text-align: center;
-                color: """ + t["control_fg"] + """;
-            }
-            QProgressBar::chunk {
-                background-color: """ + t["accent"] + """;
-                border-radius: 3px;
-            }
-            QProgressBar:disabled {
-                background-color: """ + t["text_disabled"] + """;
-                color: """ + t["control_disabled"] + """;
-            }
-            QProgressBar::chunk:disabled {
-                background-color: """ + t["control_disabled"] + """;
-            }
-            QTextEdit {
-                background-color: """ + t["surface_bg"] + """;
-                border: none;
-                color: """ + t["control_fg"] + """;
-                font-family: 'Courier New', monospace;
-                font-size: 10px;
-            }
-            QSplitter::handle {
-                background-color: """ + t["control_selection_frame"] + """;
-            }
-            QLabel {
-                color: """ + t["control_fg"] + """;
-            }
-            QGroupBox {
-                color: """ + t["control_fg"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                border-radius: 3px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 5px;
-            }
-            QCheckBox {
-                color: """ + t["control_fg"] + """;
-                spacing: 5px;
-            }
-            QCheckBox::indicator {
-                width: 13px;
-                height: 13px;
-            }
-            QCheckBox::indicator:unchecked {
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                background-color: """ + t["surface_bg"] + """;
-            }
-            QCheckBox::indicator:checked {
-                border: 1px solid """ + t["accent"] + """;
-                background-color: """ + t["accent"] + """;
-            }
-            QComboBox {
-                background-color: """ + t["surface_bg"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                border-radius: 3px;
-                padding: 5px;
-                color: """ + t["control_fg"] + """;
-                min-width: 120px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid """ + t["control_fg"] + """;
-                width: 0px;
-                height: 0px;
-            }
-            QComboBox QAbstractItemView {
-                background-color: """ + t["surface_bg"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                color: """ + t["control_fg"] + """;
-                selection-background-color: """ + t["accent"] + """;
-                selection-color: """ + t["control_on_fg"] + """;
-            }
-        """
-
-        self.setStyleSheet(stylesheet)
+        stylesheet = main_stylesheet(theme_key(t))
+        # Re-polishing every widget is the expensive part, skip it when nothing changed
+        if stylesheet is not self.applied_stylesheet:
+            self.setStyleSheet(stylesheet)
+            self.applied_stylesheet = stylesheet
 
     def setup_ui(self):
         central_widget = QWidget()
@@ -1052,10 +1837,20 @@ class AudiozGUI(QMainWindow):
         self.search_input.returnPressed.connect(self.start_search)
         toolbar.addWidget(self.search_input)
 
+        self.search_mode_combo = QComboBox()
+        self.search_mode_combo.addItem("Page by Page", "page")
+        self.search_mode_combo.addItem("Deep Search", "deep")
+        self.search_mode_combo.addItem("Local Catalog", "local")
+        toolbar.addWidget(self.search_mode_combo)
+
         self.search_btn = QPushButton("Search")
         self.search_btn.clicked.connect(self.start_search)
         toolbar.addWidget(self.search_btn)
 
+        self.sync_btn = QPushButton("Sync Catalog")
+        self.sync_btn.clicked.connect(self.start_catalog_sync)
+        toolbar.addWidget(self.sync_btn)
+
         self.settings_btn = QPushButton("Settings")
         self.settings_btn.clicked.connect(self.open_settings)
         toolbar.addWidget(self.settings_btn)
@@ -1067,11 +1862,9 @@ class AudiozGUI(QMainWindow):
         content_splitter = QSplitter(Qt.Orientation.Vertical)
         main_layout.addWidget(content_splitter)
 
-        self.downloads_table = QTableWidget()
-        self.downloads_table.setColumnCount(5)
-        self.downloads_table.setHorizontalHeaderLabels(
-            ["Name", "Status", "Progress", "Speed", "Actions"]
-        )
+        self.downloads_model = DownloadsModel(self)
+        self.downloads_table = QTableView()
+        self.downloads_table.setModel(self.downloads_model)
         self.downloads_table.setSelectionBehavior(
             QAbstractItemView.SelectionBehavior.SelectRows
         )
@@ -1079,11 +1872,23 @@ class AudiozGUI(QMainWindow):
             QAbstractItemView.EditTrigger.NoEditTriggers
         )
         self.downloads_table.setAlternatingRowColors(True)
+        self.downloads_table.setMouseTracking(True)
         self.downloads_table.verticalHeader().setVisible(False)
         self.downloads_table.verticalHeader().setDefaultSectionSize(40)
+        self.downloads_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+
+        self.progress_delegate = ProgressDelegate(self.settings.theme, self.downloads_table)
+        self.action_delegate = ActionDelegate(self.settings.theme, self.downloads_table)
+        self.action_delegate.clicked.connect(self.on_job_action)
+        self.downloads_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.downloads_table.customContextMenuRequested.connect(self.show_job_menu)
+        self.downloads_table.setItemDelegateForColumn(DownloadsModel.PROGRESS, self.progress_delegate)
+        self.downloads_table.setItemDelegateForColumn(DownloadsModel.ACTIONS, self.action_delegate)
 
         header = self.downloads_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        # ResizeToContents would measure every row on each update
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        header.resizeSection(0, 400)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
@@ -1093,50 +1898,192 @@ class AudiozGUI(QMainWindow):
 
         content_splitter.addWidget(self.downloads_table)
 
-        self.log_area = QTextEdit()
+        self.throughput_graph = ThroughputGraph(self.throughput, self.settings.theme)
+        self.downloads_table.selectionModel().selectionChanged.connect(self.on_download_selection)
+        content_splitter.addWidget(self.throughput_graph)
+
+        self.log_area = QPlainTextEdit()
         self.log_area.setMaximumHeight(200)
         self.log_area.setReadOnly(True)
+        self.log_area.setMaximumBlockCount(self.settings.log_max_lines)
         content_splitter.addWidget(self.log_area)
 
-        content_splitter.setSizes([500, 200])
+        content_splitter.setSizes([440, 60, 200])
 
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_label = QLabel("Ready")
         self.status_bar.addWidget(self.status_label)
 
+        self.log_file_writer = None
+        if self.settings.log_to_file:
+            self.log_file_writer = LogFileWriter()
+            self.log_file_writer.start()
+        self.log_pipeline = LogPipeline(
+            self.log_area,
+            self.status_label,
+            self.settings.log_colors,
+            self.log_file_writer,
+        )
+
+    def update_http_cache(self):
+        if not self.settings.http_cache_enabled:
+            if self.http_cache:
+                self.http_cache.flush()
+            self.http_cache = None
+            return
+        max_bytes = self.settings.http_cache_size_mb * 1024 * 1024
+        if self.http_cache:
+            self.http_cache.max_bytes = max_bytes
+        else:
+            self.http_cache = HttpCache(max_bytes=max_bytes)
+
+    def update_sync_timer(self):
+        if self.settings.sync_interval_minutes > 0:
+            self.sync_timer.start(self.settings.sync_interval_minutes * 60 * 1000)
+        else:
+            self.sync_timer.stop()
+
+    def update_control_server(self):
+        if self.control_server and (
+            not self.settings.api_enabled
+            or self.control_server.port != self.settings.api_port
+            or self.control_server.token != self.settings.api_token
+        ):
+            self.control_server.stop()
+            self.control_server = None
+        if not self.settings.api_enabled or self.control_server:
+            return
+        if not self.settings.api_token:
+            self.settings.api_token = secrets.token_urlsafe(24)
+            self.settings.save()
+        server = ControlServer(self.control_bridge, self.settings.api_token, self.settings.api_port)
+        try:
+            server.start()
+        except OSError as e:
+            self.log(f"Control API could not listen on port {self.settings.api_port}: {e}", "ERROR")
+            return
+        self.control_server = server
+        self.log(f"Control API listening on http://127.0.0.1:{server.port}", "INFO")
+
+    def update_metrics_server(self):
+        if self.metrics_server and (
+            not self.settings.metrics_enabled
+            or self.metrics_server.port != self.settings.metrics_port
+        ):
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if not self.settings.metrics_enabled or self.metrics_server:
+            return
+        server = MetricsServer(metrics, self.settings.metrics_port)
+        try:
+            server.start()
+        except OSError as e:
+            self.log(f"Metrics could not listen on port {self.settings.metrics_port}: {e}", "ERROR")
+            return
+        self.metrics_server = server
+        self.log(f"Metrics served at http://127.0.0.1:{server.port}/metrics", "INFO")
+
+    def export_trace(self):
+        try:
+            tracer.export(TRACE_FILE)
+        except OSError as e:
+            print(f"Error writing trace: {e}")
+            return
+        self.log(f"Stage timings written to {TRACE_FILE}:\n{tracer.format_summary()}", "DEBUG")
+
+    def start_catalog_sync(self):
+        if self.sync_worker and self.sync_worker.isRunning():
+            return
+        if not self.settings.cookie_string:
+            self.log("Catalog sync needs a cookie string, see Settings", "WARNING")
+            return
+        self.sync_worker = CatalogSyncWorker(
+            self.settings.cookie_string,
+            self.settings.base_url,
+            self.catalog,
+            self.http_cache,
+            self.settings.sync_max_pages,
+            self.settings.sync_delay,
+        )
+        self.sync_worker.log_signal.connect(self.log, Qt.ConnectionType.DirectConnection)
+        self.sync_worker.start()
+
+    def closeEvent(self, event):
+        if self.sync_worker and self.sync_worker.isRunning():
+            self.sync_worker.stop()
+            self.sync_worker.wait()
+        if self.control_server:
+            self.control_server.stop()
+        for worker in list(self.extract_workers):
+            # A half-extracted folder is worse than a slower exit
+            worker.wait()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if tracer.spans:
+            self.export_trace()
+        if self.http_cache:
+            self.http_cache.flush()
+        if self.settings.search_cache_persist:
+            self.search_cache.save()
+        self.catalog.close()
+        self.thumbnail_loader.shutdown()
+        if self.log_file_writer:
+            self.log_file_writer.close()
+        # Running jobs stay "running" in the store and are picked up again next start
+        self.job_store.close()
+        super().closeEvent(event)
+
     def open_settings(self):
         dialog = SettingsDialog(self.settings, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.apply_theme()
+            if self.results_window:
+                self.results_window.apply_styles(self.search_dialog_style(), self.small_button_style())
+                size = THUMBNAIL_SIZE if self.settings.show_thumbnails else 0
+                self.results_window.view.setIconSize(QSize(size, size))
+            self.log_pipeline.set_colors(self.settings.log_colors)
+            self.progress_delegate.theme = self.settings.theme
+            self.action_delegate.theme = self.settings.theme
+            self.throughput_graph.theme = self.settings.theme
+            if self.throughput.size != self.settings.throughput_minutes * 60:
+                self.throughput = ThroughputHistory(self.settings.throughput_minutes * 60)
+                self.throughput_graph.history = self.throughput
+            self.throughput_graph.update()
+            self.downloads_table.viewport().update()
+            self.update_http_cache()
+            self.search_cache.ttl = self.settings.search_cache_ttl_minutes * 60
+            self.search_cache.path = SEARCH_CACHE_FILE if self.settings.search_cache_persist else None
+            self.search_prefetcher.max_concurrent = self.settings.prefetch_concurrency
+            self.resolution_cache.ttl = self.settings.resolution_ttl_hours * 3600
+            self.update_sync_timer()
+            self.scheduler.update(self.settings.max_connections)
+            tracer.enabled = self.settings.trace_enabled
+            self.update_control_server()
+            self.update_metrics_server()
             self.log("Settings saved and theme updated", "SUCCESS")
 
     def clear_logs(self):
         self.log_area.clear()
-        self.downloads_table.setRowCount(0)
-        self.active_downloads.clear()
-        self.download_workers.clear()
-        self.search_cache.clear()
+        # Only finished rows go, running jobs keep their row, worker and store entry
+        finished = [job["id"] for job in self.downloads_model.jobs if not job["active"]]
+        self.downloads_model.remove_jobs(lambda job: not job["active"])
+        for job_id in finished:
+            self.active_downloads.pop(job_id, None)
+            self.job_store.remove_job(job_id)
         self.log("Logs cleared", "INFO")
 
     def log(self, message, level="INFO"):
-        timestamp = time.strftime("%H:%M:%S")
-        full_message = f"[{timestamp}] {message}"
-
-        text_format = QTextCharFormat()
-        text_format.setForeground(
-            QColor(self.settings.log_colors.get(level, LOG_COLORS["INFO"]))
-        )
-
-        cursor = self.log_area.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        cursor.insertText(full_message + "\n", text_format)
-
-        self.log_area.ensureCursorVisible()
-
-        self.status_label.setText(message)
+        self.log_pipeline.push(message, level)
 
     def start_search(self):
+        mode = self.search_mode_combo.currentData()
+        term = self.search_input.text().strip()
+        if mode == "local":
+            if term:
+                self.show_local_results(term)
+            return
+
         if not self.settings.cookie_string:
             QMessageBox.warning(
                 self,
@@ -1146,312 +2093,392 @@ class AudiozGUI(QMainWindow):
             self.open_settings()
             return
 
-        term = self.search_input.text().strip()
         if not term:
             QMessageBox.warning(
                 self, "Input Error", "Please enter a search term"
             )
             return
 
+        if term != self.current_search_term:
+            self.search_prefetcher.cancel()
         self.current_search_term = term
-        self.search_cache.clear()
-        self.load_search_page(term, 1)
+        self.search_generation += 1
+        if self.deep_search_worker:
+            self.deep_search_worker.stop()
+
+        if mode == "deep":
+            self.start_deep_search(term)
+        else:
+            self.get_results_window().begin(
+                f"Search Results - {term}", f"Searching for '{term}'...", has_more=True
+            )
+            self.load_search_page(term, 1)
+
+    def get_results_window(self):
+        """The results window is built the first time a search needs it"""
+        if self.results_window is None:
+            window = SearchResultsWindow(self)
+            window.apply_styles(self.search_dialog_style(), self.small_button_style())
+            window.download_requested.connect(self.download_from_search)
+            window.model.fetch_more_requested.connect(
+                lambda page: self.load_search_page(self.current_search_term, page)
+            )
+            window.finished.connect(self.on_results_window_closed)
+
+            if self.settings.show_thumbnails:
+                window.view.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            # Coalesce scroll and insert bursts into one visibility pass
+            self.thumbnail_timer = QTimer(window)
+            self.thumbnail_timer.setSingleShot(True)
+            self.thumbnail_timer.setInterval(50)
+            self.thumbnail_timer.timeout.connect(self.request_visible_thumbnails)
+            window.view.verticalScrollBar().valueChanged.connect(self.thumbnail_timer.start)
+            window.model.rowsInserted.connect(self.thumbnail_timer.start)
+            self.thumbnail_loader.thumbnail_ready.connect(window.model.set_thumbnail)
+
+            # Only resolve results the pointer or selection rests on
+            self.speculative_timer = QTimer(window)
+            self.speculative_timer.setSingleShot(True)
+            self.speculative_timer.setInterval(300)
+            self.speculative_timer.timeout.connect(self.resolve_hovered_result)
+            window.view.entered.connect(self.on_result_hovered)
+            window.view.selectionModel().currentChanged.connect(self.on_result_hovered)
+
+            self.results_window = window
+        return self.results_window
+
+    def on_results_window_closed(self):
+        if self.deep_search_worker:
+            self.deep_search_worker.stop()
+        self.thumbnail_loader.set_wanted([])
+
+    def request_visible_thumbnails(self):
+        if not self.settings.show_thumbnails:
+            return
+        model = self.results_window.model
+        wanted = []
+        for result in self.results_window.visible_results():
+            url = result.get("image_url")
+            if not url or url in model.icons:
+                continue
+            pixmap = self.thumbnail_loader.cached(url)
+            if pixmap is not None:
+                model.set_thumbnail(url, pixmap)
+            else:
+                wanted.append(url)
+        self.thumbnail_loader.set_wanted(wanted)
+
+    def on_result_hovered(self, index, *args):
+        if self.settings.speculative_resolve and index.isValid():
+            self.hovered_result = index.data(Qt.ItemDataRole.UserRole)
+            self.speculative_timer.start()
+
+    def resolve_hovered_result(self):
+        if self.hovered_result and self.settings.rd_access_token:
+            self.speculative_resolver.request(
+                self.hovered_result["url"],
+                self.settings.cookie_string,
+                self.settings.base_url,
+                self.http_cache,
+            )
 
     def load_search_page(self, term, page):
-        cache_key = f"{term}_{page}"
-        if cache_key in self.search_cache:
+        window = self.get_results_window()
+        window.model.loading = True
+        results = self.search_cache.get(term, page, self.settings.base_url)
+        if results is not None:
             self.log(f"Loading page {page} from cache...", "INFO")
-            results = self.search_cache[cache_key]
-            self.show_search_dialog(results, page)
+            self.show_search_page(results, page)
             return
 
-        # self.log_area.clear()
         self.status_label.setText(f"Searching for '{term}' (Page {page})...")
+        window.set_status(f"Loading page {page}...")
 
-        self.search_worker = SearchWorker(
-            term, self.settings.cookie_string, self.settings.base_url, page
+        generation = self.search_generation
+        worker = SearchWorker(
+            term,
+            self.settings.cookie_string,
+            self.settings.base_url,
+            page,
+            self.http_cache,
         )
-        self.search_worker.log_signal.connect(self.log)
-        self.search_worker.results_signal.connect(self.show_search_dialog)
-        self.search_worker.no_results_signal.connect(self.handle_no_results)
-        self.search_worker.start()
-
-    def handle_no_results(self, failed_page):
-        self.log(f"No results found on page {failed_page}", "WARNING")
-
-        if failed_page > 1:
-            previous_page = failed_page - 1
-            cache_key = f"{self.current_search_term}_{previous_page}"
-            if cache_key in self.search_cache:
-                self.log(f"Returning to page {previous_page} (cached)", "INFO")
-                results = self.search_cache[cache_key]
-                self.show_search_dialog(results, previous_page)
-            else:
-                self.log(f"Loading previous page {previous_page}", "INFO")
-                self.load_search_page(self.current_search_term, previous_page)
-        else:
-            self.show_search_dialog([], 1)
-
-    def show_search_dialog(self, results, current_page=1):
-        cache_key = f"{self.current_search_term}_{current_page}"
-        self.search_cache[cache_key] = results
-
+        self.search_workers.add(worker)
+
+        def on_results(results, page):
+            if generation == self.search_generation:
+                self.on_search_results(results, page)
+
+        def on_no_results(page):
+            if generation == self.search_generation:
+                self.handle_no_results(page)
+
+        def on_finished():
+            self.search_workers.discard(worker)
+            # A failed search leaves the page loading, stop asking for more
+            if generation == self.search_generation and window.model.loading:
+                window.model.end_of_results()
+                window.set_status(f"Page {page} could not be loaded, see the log")
+
+        worker.log_signal.connect(self.log, Qt.ConnectionType.DirectConnection)
+        worker.results_signal.connect(on_results)
+        worker.no_results_signal.connect(on_no_results)
+        worker.finished.connect(on_finished)
+        worker.start()
+
+    def remember_search_page(self, term, page, results):
+        self.search_cache.put(term, page, self.settings.base_url, results)
+        self.catalog.upsert(results)
+
+    def show_local_results(self, term):
+        started = time.perf_counter()
+        results = self.catalog.search(term)
+        elapsed_ms = (time.perf_counter() - started) * 1000
         self.log(
-            f"Found {len(results)} results on page {current_page}", "SUCCESS"
+            f"Local catalog: {len(results)} results for '{term}' in {elapsed_ms:.1f} ms",
+            "SUCCESS",
         )
+        self.search_generation += 1
+        window = self.get_results_window()
+        window.begin(
+            f"Local Catalog - {term}",
+            f"{len(results)} results from {self.catalog.count()} indexed releases",
+        )
+        window.model.append_results(results)
 
-        dialog = QDialog(self)
-        dialog.setWindowTitle(f"Search Results - Page {current_page}")
-        dialog.resize(800, 600)
-
-        t = self.settings.theme
-
-        dialog_style = """
-            QDialog { 
-                background-color: """ + t["desktop"] + """; 
-                color: """ + t["control_fg"] + """; 
-            }
-            QListWidget { 
-                background-color: """ + t["surface_bg"] + """; 
-                border: 1px solid """ + t["control_selection_frame"] + """; 
-                color: """ + t["control_fg"] + """;
-                font-size: 11px;
-            }
-            QListWidget::item { 
-                padding: 10px; 
-                border-bottom: 1px solid """ + t["control_selection_frame"] + """;
-                margin-top: 3px;
-                margin-bottom: 3px;
-            }
-            QListWidget::item:selected { 
-                background-color: """ + t["surface_highlight"] + """;
-                color: """ + t["control_fg"] + """;
-            }
-            QListWidget::item:hover { 
-                background-color: """ + t["surface_highlight"] + """; 
-            }
-            QPushButton {
-                background-color: """ + t["surface_highlight"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                border-radius: 3px;
-                padding: 10px 18px;
-                color: """ + t["control_fg"] + """;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: """ + t["main_focus"] + """;
-                border: 1px solid """ + t["accent"] + """;
-            }
-            QPushButton:pressed {
-                background-color: """ + t["accent"] + """;
-                color: """ + t["control_on_fg"] + """;
-            }
-            QPushButton:disabled {
-                background-color: """ + t["text_disabled"] + """;
-                color: """ + t["surface_area"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-            }
-        """
-
-        dialog.setStyleSheet(dialog_style)
+    def start_deep_search(self, term):
+        window = self.get_results_window()
+        window.begin(
+            f"Deep Search - {term}",
+            f"Searching pages 1-{self.settings.deep_search_pages}...",
+        )
 
-        layout = QVBoxLayout(dialog)
-        layout.setSpacing(15)
+        worker = DeepSearchWorker(
+            term,
+            self.settings.cookie_string,
+            self.settings.base_url,
+            self.settings.deep_search_pages,
+            self.settings.deep_search_concurrency,
+            self.http_cache,
+        )
+        self.deep_search_worker = worker
+        self.search_workers.add(worker)
+        generation = self.search_generation
+
+        def on_results(results, page):
+            if generation == self.search_generation:
+                window.model.append_results(results)
+                window.set_status(f"{window.model.rowCount()} results so far (page {page} arrived)")
+
+        def on_page_results(results, page):
+            self.remember_search_page(term, page, results)
+
+        def on_done(total):
+            if generation == self.search_generation:
+                window.set_status(f"{total} unique results")
+            self.log(f"Deep search found {total} unique results", "SUCCESS")
+
+        worker.log_signal.connect(self.log, Qt.ConnectionType.DirectConnection)
+        worker.results_signal.connect(on_results)
+        worker.page_results_signal.connect(on_page_results)
+        worker.done_signal.connect(on_done)
+        worker.finished.connect(lambda: self.search_workers.discard(worker))
+        worker.start()
 
-        results_list = QListWidget()
-        results_list.setWordWrap(True)
-
-        if results:
-            for result in results:
-                lines = [result["title"]]
-                if result.get("author"):
-                    lines.append(f"By: {result['author']}")
-                if result.get("date"):
-                    lines.append(result["date"])
-                item_text = "\n".join(lines)
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.ItemDataRole.UserRole, result)
-                results_list.addItem(item)
+    def handle_no_results(self, failed_page):
+        self.log(f"No results found on page {failed_page}", "WARNING")
+        model = self.results_window.model
+        model.end_of_results()
+        if model.rowCount():
+            self.results_window.set_status(f"All {model.rowCount()} results loaded")
         else:
-            item = QListWidgetItem("No results found on this page")
-            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEnabled)
-            results_list.addItem(item)
-
-        layout.addWidget(results_list)
-
-        pagination_layout = QHBoxLayout()
-        pagination_layout.setSpacing(10)
-
-        prev_btn = QPushButton("Previous Page")
-        next_btn = QPushButton("Next Page")
-
-        small_btn_style = """
-            QPushButton {
-                background-color: """ + t["surface_highlight"] + """;
-                color: """ + t["control_fg"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                border-radius: 2px;
-                padding: 2px 6px;
-                font-size: 10px;
-                min-height: 20px;
-            }
-            QPushButton:hover {
-                background-color: """ + t["main_focus"] + """;
-                border: 1px solid """ + t["accent"] + """;
-            }
-            QPushButton:pressed {
-                background-color: """ + t["accent"] + """;
-                color: """ + t["control_on_fg"] + """;
-            }
-            QPushButton:disabled {
-                background-color: """ + t["text_disabled"] + """;
-                color: """ + t["surface_area"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-            }
-        """
-
-        if current_page <= 1:
-            prev_btn.setEnabled(False)
-
-        prev_btn.setStyleSheet(small_btn_style)
-        next_btn.setStyleSheet(small_btn_style)
-
-        pagination_layout.addWidget(prev_btn)
-        pagination_layout.addStretch()
-        pagination_layout.addWidget(next_btn)
-
-        layout.addLayout(pagination_layout)
-
-        button_layout = QHBoxLayout()
-        button_layout.setSpacing(20)
-
-        download_btn = QPushButton("Download Selected")
-        cancel_btn = QPushButton("Close")
-
-        download_btn.setStyleSheet(small_btn_style)
-        cancel_btn.setStyleSheet(small_btn_style)
-
-        pagination_layout.addWidget(download_btn)
-        pagination_layout.addWidget(cancel_btn)
-
-        layout.addLayout(pagination_layout)
-
-        download_btn.clicked.connect(
-            lambda: self.download_from_search(
-                dialog, results_list.currentItem()
-            )
+            self.results_window.set_status("No results found")
+
+    def on_search_results(self, results, page):
+        self.remember_search_page(self.current_search_term, page, results)
+        self.show_search_page(results, page)
+
+    def show_search_page(self, results, page):
+        self.log(f"Found {len(results)} results on page {page}", "SUCCESS")
+        window = self.results_window
+        window.model.append_page(results, page)
+        more = "scroll down for more" if window.model.has_more else "end of results"
+        window.set_status(f"{window.model.rowCount()} results, {page} page(s) loaded, {more}")
+        self.prefetch_adjacent_pages(results, page)
+
+    def prefetch_adjacent_pages(self, results, page):
+        if not self.settings.prefetch_enabled:
+            return
+        pages = []
+        # A short page is the last one, there is nothing after it
+        if len(results) >= RESULTS_PER_PAGE:
+            pages.append(page + 1)
+        if self.settings.prefetch_previous and page > 1:
+            pages.append(page - 1)
+        self.search_prefetcher.prefetch(
+            self.current_search_term,
+            pages,
+            self.settings.cookie_string,
+            self.settings.base_url,
+            self.http_cache,
         )
-        cancel_btn.clicked.connect(dialog.close)
-
-        if not results:
-            download_btn.setEnabled(False)
-
-        def load_previous_page():
-            dialog.accept()
-            self.load_search_page(self.current_search_term, current_page - 1)
-
-        def load_next_page():
-            dialog.accept()
-            self.load_search_page(self.current_search_term, current_page + 1)
-
-        prev_btn.clicked.connect(load_previous_page)
-        next_btn.clicked.connect(load_next_page)
 
-        button_layout.addWidget(download_btn)
-        button_layout.addStretch()
-        button_layout.addWidget(cancel_btn)
-
-        layout.addLayout(button_layout)
+    def search_dialog_style(self):
+        return search_dialog_stylesheet(theme_key(self.settings.theme))
 
-        dialog.exec()
+    def small_button_style(self):
+        return small_button_stylesheet(theme_key(self.settings.theme))
 
-    def download_from_search(self, dialog, item):
-        if not item:
+    def download_from_search(self, result):
+        window = self.results_window
+        if not result:
             QMessageBox.warning(
-                dialog, "No Selection", "Please select a result to download"
+                window, "No Selection", "Please select a result to download"
             )
             return
 
         if not self.settings.rd_access_token:
             QMessageBox.warning(
-                dialog,
+                window,
                 "Configuration Required",
                 "Please configure your Real-Debrid API token in Settings first.",
             )
             return
 
-        result = item.data(Qt.ItemDataRole.UserRole)
-        dialog.accept()
+        window.accept()
         self.start_download_with_result(result)
 
     def start_download_with_result(self, result):
-        url = result["url"]
-        title = result["title"]
-
-        row = self.downloads_table.rowCount()
-        self.downloads_table.insertRow(row)
-        self.downloads_table.setRowHeight(row, 40)
-
-        name_item = QTableWidgetItem(title)
-        self.downloads_table.setItem(row, 0, name_item)
-
-        status_item = QTableWidgetItem("Queued")
-        self.downloads_table.setItem(row, 1, status_item)
-
-        progress_widget = QWidget()
-        progress_layout = QVBoxLayout(progress_widget)
-        progress_layout.setContentsMargins(2, 2, 2, 2)
-
-        progress_bar = QProgressBar()
-        progress_bar.setMinimum(0)
-        progress_bar.setMaximum(100)
-        progress_bar.setTextVisible(True)
-        progress_layout.addWidget(progress_bar)
-
-        self.downloads_table.setCellWidget(row, 2, progress_widget)
+        return self.enqueue_download(result["url"], result["title"])
 
-        speed_item = QTableWidgetItem("")
-        speed_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.downloads_table.setItem(row, 3, speed_item)
-
-        action_widget = QWidget()
-        action_layout = QHBoxLayout(action_widget)
-        action_layout.setContentsMargins(4, 2, 4, 6)
-
-        t = self.settings.theme
-
-        cancel_btn = QPushButton("Cancel")
-        cancel_style = """
-            QPushButton {
-                background-color: """ + t["surface_highlight"] + """;
-                color: """ + t["control_fg"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-                border-radius: 2px;
-                padding: 0px;
-                font-size: 10px;
-                min-height: 20px;
-            }
-            QPushButton:hover {
-                background-color: """ + t["main_focus"] + """;
-                border: 1px solid """ + t["accent"] + """;
-            }
-            QPushButton:pressed {
-                background-color: """ + t["accent"] + """;
-                color: """ + t["control_on_fg"] + """;
-            }
-            QPushButton:disabled {
-                background-color: """ + t["text_disabled"] + """;
-                color: """ + t["surface_area"] + """;
-                border: 1px solid """ + t["control_selection_frame"] + """;
-            }
-        """
-        cancel_btn.setStyleSheet(cancel_style)
-        action_layout.addWidget(cancel_btn)
-
-        self.downloads_table.setCellWidget(row, 4, action_widget)
+    def enqueue_download(self, url, title, priority=0):
+        running_id = self.jobs_by_url.get(url)
+        if running_id in self.download_workers or running_id in self.awaiting_jobs:
+            self.log(f"Already downloading {title}, showing the running transfer", "INFO")
+            self.downloads_table.selectRow(self.downloads_model.row_of(running_id))
+            return running_id
 
+        row = self.downloads_model.rowCount()
         worker_id = f"worker_{int(time.time() * 1000)}_{row}"
+        self.downloads_model.add_job(worker_id, title)
+        self.downloads_model.update_job(worker_id, priority=priority)
+        self.job_store.add_job(worker_id, url, title, priority)
+        self.jobs_by_url[url] = worker_id
+        if self.settings.download_strategy == "manual":
+            self.await_approval(worker_id, url, priority)
+            return worker_id
+        self.log(f"Starting download: {title}", "DOWNLOAD")
+        self.start_worker(worker_id, url, priority=priority)
+        return worker_id
+
+    def await_approval(self, job_id, url, priority=0, grouped_links=None):
+        """Park a job without a thread or connection until the user approves it"""
+        self.awaiting_jobs[job_id] = {"url": url, "links": grouped_links, "priority": priority}
+        self.downloads_model.update_job(job_id, action="Approve")
+        self.job_store.update_job(job_id, state="awaiting")
+        grouped_links = grouped_links or self.resolution_cache.get(url)
+        if grouped_links:
+            self.on_approval_links(job_id, url, grouped_links)
+            return
+
+        # Resolve now so the user sees what they are approving
+        self.downloads_model.update_job(job_id, status="Resolving links...")
+        worker = ResolveWorker(url, self.settings.cookie_string, self.settings.base_url, self.http_cache)
+        self.resolve_workers.add(worker)
+        worker.resolved_signal.connect(lambda url, links: self.on_approval_links(job_id, url, links))
+        worker.finished.connect(lambda: self.resolve_workers.discard(worker))
+        worker.start()
+
+    def on_approval_links(self, job_id, url, grouped_links):
+        pending = self.awaiting_jobs.get(job_id)
+        if pending is None:
+            # Approved or cancelled while resolving
+            return
+        if not grouped_links:
+            del self.awaiting_jobs[job_id]
+            self.downloads_model.update_job(job_id, status="No links", action="Failed", active=False)
+            self.job_store.update_job(job_id, state="failed")
+            self.log(f"No links found for {url}", "WARNING")
+            return
+        pending["links"] = grouped_links
+        self.resolution_cache.put(url, grouped_links)
+        self.job_store.update_job(job_id, links=grouped_links)
+        total_parts = sum(len(parts) for parts in grouped_links.values())
+        self.downloads_model.update_job(job_id, status=f"Awaiting approval ({total_parts} parts)")
+
+    def approve_download(self, job_id):
+        pending = self.awaiting_jobs.pop(job_id, None)
+        if pending is None:
+            return False
+        self.downloads_model.update_job(job_id, status="Queued", action="Cancel")
+        self.job_store.update_job(job_id, state="queued")
+        self.log(f"Approved download: {self.downloads_model.job(job_id)['title']}", "DOWNLOAD")
+        self.start_worker(job_id, pending["url"], pending["links"], pending["priority"])
+        return True
+
+    def approve_selected(self):
+        self.approve_many(self.selected_job_ids())
+
+    def approve_all(self):
+        self.approve_many(list(self.awaiting_jobs))
+
+    def approve_many(self, job_ids):
+        approved = sum(1 for job_id in job_ids if self.approve_download(job_id))
+        if approved:
+            self.log(f"Approved {approved} download(s)", "SUCCESS")
+
+    def selected_job_ids(self):
+        rows = sorted(index.row() for index in self.downloads_table.selectionModel().selectedRows())
+        return [self.downloads_model.jobs[row]["id"] for row in rows]
+
+    def on_job_action(self, job_id):
+        if job_id in self.awaiting_jobs:
+            self.approve_download(job_id)
+        else:
+            self.cancel_download(job_id)
+
+    def restore_jobs(self):
+        """Rebuild the downloads view from the job store and carry on with unfinished jobs"""
+        resumed = 0
+        for job in self.job_store.load_jobs():
+            parts = job["parts"]
+            done = sum(1 for part in parts if part["state"] == "done")
+            total_parts = sum(len(p) for p in job["links"].values()) if job["links"] else len(parts)
+            progress = int(done * 100 / total_parts) if total_parts else 0
+            state = job["state"]
+
+            status = state.capitalize()
+            if state == "completed" and job["extract_state"]:
+                status = "Extracted" if job["extract_state"] == "done" else "Extract failed"
+            self.downloads_model.add_job(job["id"], job["title"], status)
+            self.downloads_model.update_job(
+                job["id"], priority=job["priority"] or 0, progress=progress
+            )
+            if state in JobStore.FINISHED_STATES:
+                self.downloads_model.update_job(
+                    job["id"],
+                    progress=100 if state == "completed" else progress,
+                    action="Done" if state == "completed" else state.capitalize(),
+                    active=False,
+                )
+                continue
+            running_id = self.jobs_by_url.get(job["url"])
+            if running_id in self.download_workers or running_id in self.awaiting_jobs:
+                # The same release was queued twice before the restart
+                self.downloads_model.update_job(job["id"], status="Cancelled", action="Cancelled", active=False)
+                self.job_store.update_job(job["id"], state="cancelled")
+                continue
+            self.jobs_by_url[job["url"]] = job["id"]
+            if state == "awaiting":
+                self.await_approval(job["id"], job["url"], job["priority"] or 0, job["links"])
+                continue
+            self.start_worker(
+                job["id"], job["url"], job["links"], job["priority"] or 0, paused=state == "paused"
+            )
+            resumed += 1
+        if resumed:
+            self.log(f"Resuming {resumed} unfinished download(s) from the last session", "INFO")
 
+    def start_worker(self, worker_id, url, grouped_links=None, priority=0, paused=False):
         download_worker = DownloadWorker(
             url,
             self.settings.cookie_string,
@@ -1459,155 +2486,236 @@ class AudiozGUI(QMainWindow):
             self.settings.rd_access_token,
             None,
             worker_id,
-            self.settings.download_strategy,
             self.settings.max_retries,
             self.settings.retry_delay,
+            self.http_cache,
+            grouped_links,
+            self.resolution_cache,
+            self.transfers,
+            self.job_store,
+            self.scheduler,
+            priority,
         )
         self.download_workers[worker_id] = download_worker
+        self.jobs_by_url[url] = worker_id
         self.active_downloads[worker_id] = {
-            "row": row,
-            "progress_bar": progress_bar,
-            "status_item": status_item,
-            "speed_item": speed_item,
-            "start_time": time.time(),
-            "last_bytes": 0,
+            "url": url,
+            "file": "",
+            "bytes": 0,
+            "total": 0,
         }
 
-        download_worker.log_signal.connect(self.log)
+        download_worker.log_signal.connect(self.log, Qt.ConnectionType.DirectConnection)
         download_worker.progress_signal.connect(
-            lambda f, wid, c, t: self.update_progress(wid, c, t)
+            lambda f, wid, c, t: self.update_progress(wid, c, t, f)
         )
         download_worker.status_signal.connect(self.update_status)
         download_worker.part_progress_signal.connect(self.update_part_progress)
         download_worker.download_finished.connect(self.on_download_finished)
 
-        cancel_btn.clicked.connect(lambda: self.cancel_download(worker_id))
-
-        self.log(f"Starting download: {title}", "DOWNLOAD")
+        if paused:
+            # Blocks before its first part until resumed
+            download_worker.pause()
         download_worker.start()
 
+    def is_job_active(self, worker_id):
+        job = self.downloads_model.job(worker_id)
+        return worker_id in self.active_downloads and job is not None and job["active"]
+
     def update_status(self, worker_id, status):
-        if worker_id in self.active_downloads:
-            download_info = self.active_downloads[worker_id]
+        if self.is_job_active(worker_id):
             # Don't override part progress display
             if not status.startswith("Downloading..."):
-                download_info["status_item"].setText(status)
+                self.downloads_model.update_job(worker_id, status=status)
 
     def update_part_progress(self, worker_id, current_part, total_parts):
-        if worker_id in self.active_downloads:
-            download_info = self.active_downloads[worker_id]
+        if self.is_job_active(worker_id):
             status_text = f"Downloading... {current_part}/{total_parts}"
-            download_info["status_item"].setText(status_text)
+            self.downloads_model.update_job(worker_id, status=status_text)
 
-    def update_progress(self, worker_id, current, total):
-        if worker_id in self.active_downloads:
+    def update_progress(self, worker_id, current, total, filename=""):
+        if self.is_job_active(worker_id):
             download_info = self.active_downloads[worker_id]
-            progress_bar = download_info["progress_bar"]
+            download_info["file"] = filename
+            download_info["bytes"] = current
+            download_info["total"] = total
 
             if total > 0:
+                # The speed column is filled once a second by sample_throughput
                 progress = int((current / total) * 100)
-                progress_bar.setValue(progress)
-
-                current_time = time.time()
-                elapsed = current_time - download_info["start_time"]
-                if elapsed > 0:
-                    speed = current / elapsed
-                    if speed > 1024 * 1024:
-                        speed_text = f"{speed / (1024 * 1024):.1f} MB/s"
-                    elif speed > 1024:
-                        speed_text = f"{speed / 1024:.1f} KB/s"
-                    else:
-                        speed_text = f"{speed:.1f} B/s"
-                    download_info["speed_item"].setText(speed_text)
+                self.downloads_model.update_job(worker_id, progress=progress)
+
+    def sample_throughput(self):
+        job_bytes = {
+            job_id: worker.downloader.bytes_received
+            for job_id, worker in self.download_workers.items()
+        }
+        self.throughput.sample(job_bytes)
+        for job_id in job_bytes:
+            job = self.downloads_model.job(job_id)
+            speed = format_speed(self.throughput.latest(job_id))
+            if self.is_job_active(job_id) and job["speed"] != speed:
+                self.downloads_model.update_job(job_id, speed=speed)
+        if self.throughput_graph.isVisible():
+            self.throughput_graph.update()
+
+    def on_download_selection(self, *args):
+        self.throughput_graph.job_ids = self.selected_job_ids()
+        self.throughput_graph.update()
 
     def on_download_finished(self, worker_id):
-        if worker_id in self.active_downloads:
-            download_info = self.active_downloads[worker_id]
-            download_info["status_item"].setText("Completed")
-            download_info["speed_item"].setText("")
-            action_widget = self.downloads_table.cellWidget(download_info["row"], 4)
-            if action_widget:
-                cancel_btn = action_widget.layout().itemAt(0).widget()
-                cancel_btn.setEnabled(False)
-                cancel_btn.setText("Done")
-                download_info["progress_bar"].setEnabled(False)
-
-            # if self.settings.auto_extract:
-            #     self.auto_extract_download(worker_id)
+        worker = self.download_workers.get(worker_id)
+        state = worker.downloader.state if worker else "completed"
+        if self.is_job_active(worker_id):
+            self.downloads_model.update_job(
+                worker_id, status=state.capitalize(), speed="", action="Done", active=False
+            )
+            if state == "completed":
+                self.downloads_model.update_job(worker_id, progress=100)
+                if self.settings.auto_extract and worker.downloader.grouped_links:
+                    self.start_extraction(worker_id, worker.downloader.grouped_links)
 
         if worker_id in self.download_workers:
             del self.download_workers[worker_id]
-
-    def auto_extract_download(self, worker_id):
-        """Simplified auto-extraction that handles multi-part archives"""
-        if worker_id not in self.active_downloads:
-            return
-            
-        download_info = self.active_downloads[worker_id]
-        row_name = self.downloads_table.item(download_info["row"], 0).text()
-        
-        # Look for archive files in downloads folder
-        archive_files = []
-        for filename in os.listdir(DOWNLOADS_FOLDER):
-            if any(filename.endswith(ext) for ext in ['.zip', '.rar', '.tar', '.gz', '.7z']):
-                archive_files.append(filename)
-        
-        if not archive_files:
-            self.log("No archive files found for extraction", "INFO")
-            return
-        
-        # Try to extract each archive file
-        extracted_any = False
-        for filename in archive_files:
-            archive_path = os.path.join(DOWNLOADS_FOLDER, filename)
-            self.log(f"Auto-extracting: {filename}", "INFO")
-            
-            try:
-                extracted_folder = extract_archive(archive_path)
-                if extracted_folder:
-                    self.log(f"Successfully extracted to: {os.path.basename(extracted_folder)}", "SUCCESS")
-                    extracted_any = True
-                    
-                    if self.settings.auto_delete:
-                        # Only delete if extraction was successful
-                        os.remove(archive_path)
-                        self.log(f"Deleted archive: {filename}", "INFO")
-                    
-                    # Open the folder
-                    open_folder(extracted_folder)
-                else:
-                    self.log(f"Failed to extract: {filename}", "ERROR")
-            except Exception as e:
-                self.log(f"Error extracting {filename}: {e}", "ERROR")
-        
-        if not extracted_any:
-            self.log("No archives could be extracted", "WARNING")
+        for url, job_id in list(self.jobs_by_url.items()):
+            if job_id == worker_id:
+                del self.jobs_by_url[url]
+
+    def start_extraction(self, job_id, grouped_links):
+        self.downloads_model.update_job(job_id, status="Extracting...")
+        worker = ExtractWorker(job_id, grouped_links, self.settings.auto_delete)
+        self.extract_workers.add(worker)
+        worker.log_signal.connect(self.log, Qt.ConnectionType.DirectConnection)
+        worker.extracted_signal.connect(self.on_extracted)
+        worker.finished.connect(lambda: self.extract_workers.discard(worker))
+        worker.start()
+
+    def on_extracted(self, job_id, folders):
+        extract_state = "done" if folders else "failed"
+        self.job_store.update_job(job_id, extract_state=extract_state)
+        self.downloads_model.update_job(
+            job_id, status="Extracted" if folders else "Extract failed"
+        )
 
     def cancel_download(self, worker_id):
+        if self.awaiting_jobs.pop(worker_id, None) is not None:
+            self.downloads_model.update_job(
+                worker_id, status="Cancelled", action="Cancelled", active=False
+            )
+            self.job_store.update_job(worker_id, state="cancelled")
+            return True
+        if not self.is_job_active(worker_id):
+            return False
         if worker_id in self.download_workers:
             worker = self.download_workers[worker_id]
             worker.stop()
             self.log(f"Cancelled download: {worker_id}", "WARNING")
 
-        if worker_id in self.active_downloads:
-            download_info = self.active_downloads[worker_id]
-            download_info["status_item"].setText("Cancelled")
-            download_info["speed_item"].setText("")
-            download_info["progress_bar"].setEnabled(False)
+        self.downloads_model.update_job(
+            worker_id, status="Cancelled", speed="", action="Cancelled", active=False
+        )
+        return True
+
+    def pause_download(self, worker_id):
+        if not self.is_job_active(worker_id) or worker_id not in self.download_workers:
+            return False
+        self.download_workers[worker_id].pause()
+        self.downloads_model.update_job(worker_id, status="Paused", speed="")
+        self.log(f"Paused download: {worker_id}", "INFO")
+        return True
+
+    def resume_download(self, worker_id):
+        if not self.is_job_active(worker_id) or worker_id not in self.download_workers:
+            return False
+        self.download_workers[worker_id].resume()
+        self.downloads_model.update_job(worker_id, status="Resuming...")
+        self.log(f"Resumed download: {worker_id}", "INFO")
+        return True
+
+    def set_job_priority(self, worker_id, priority):
+        if self.downloads_model.job(worker_id) is None:
+            return False
+        self.downloads_model.update_job(worker_id, priority=priority)
+        self.job_store.update_job(worker_id, priority=priority)
+        if worker_id in self.awaiting_jobs:
+            self.awaiting_jobs[worker_id]["priority"] = priority
+        if worker_id in self.download_workers:
+            self.download_workers[worker_id].downloader.priority = priority
+            self.scheduler.update()
+        return True
 
-            action_widget = self.downloads_table.cellWidget(
-                download_info["row"], 4
-            )
-            if action_widget:
-                cancel_btn = action_widget.layout().itemAt(0).widget()
-                cancel_btn.setEnabled(False)
-                cancel_btn.setText("Cancelled")
+    def show_job_menu(self, pos):
+        index = self.downloads_table.indexAt(pos)
+        if not index.isValid():
+            return
+        job = index.data(DownloadsModel.JobRole)
+        if not job["active"]:
+            return
+        job_id = job["id"]
+
+        menu = QMenu(self)
+        if job_id in self.awaiting_jobs:
+            waiting = [i for i in self.selected_job_ids() if i in self.awaiting_jobs]
+            if len(waiting) > 1:
+                menu.addAction(f"Approve {len(waiting)} Selected", self.approve_selected)
+            else:
+                menu.addAction("Approve", lambda: self.approve_download(job_id))
+            menu.addAction("Approve All Waiting", self.approve_all)
+        elif job["status"] == "Paused":
+            menu.addAction("Resume", lambda: self.resume_download(job_id))
+        else:
+            menu.addAction("Pause", lambda: self.pause_download(job_id))
+        priority_menu = menu.addMenu("Priority")
+        for label, value in (("High", 10), ("Normal", 0), ("Low", -10)):
+            action = priority_menu.addAction(label, lambda value=value: self.set_job_priority(job_id, value))
+            action.setCheckable(True)
+            action.setChecked(job["priority"] == value)
+        menu.addSeparator()
+        menu.addAction("Cancel", lambda: self.cancel_download(job_id))
+        menu.exec(self.downloads_table.viewport().mapToGlobal(pos))
+
+    def job_snapshots(self):
+        """Plain dicts describing every job, for the control API"""
+        snapshots = []
+        for job in self.downloads_model.jobs:
+            info = self.active_downloads.get(job["id"], {})
+            snapshots.append({
+                "id": job["id"],
+                "title": job["title"],
+                "url": info.get("url"),
+                "status": job["status"],
+                "active": job["active"],
+                "priority": job["priority"],
+                "progress": job["progress"],
+                "speed": job["speed"],
+                "file": info.get("file", ""),
+                "bytes": info.get("bytes", 0),
+                "total": info.get("total", 0),
+            })
+        snapshots.sort(key=lambda job: -job["priority"])
+        return snapshots
+
+    def job_counts(self):
+        """Called from the metrics server thread, so only takes sizes"""
+        counts = self.scheduler.counts()
+        counts["awaiting_approval"] = len(self.awaiting_jobs)
+        counts["running"] = len(self.download_workers)
+        counts["extracting"] = len(self.extract_workers)
+        return counts
 
     def start_download(self):
         self.start_search()
 
+def report_first_window():
+    elapsed_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+    print(f"first_window_ms={elapsed_ms:.1f}", flush=True)
+    QApplication.instance().quit()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     gui = AudiozGUI()
     gui.show()
+    if "--startup-benchmark" in sys.argv:
+        # Runs once the show/paint events queued above have been processed
+        QTimer.singleShot(0, report_first_window)
     sys.exit(app.exec())
\ No newline at end of file
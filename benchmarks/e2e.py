@@ -0,0 +1,368 @@
+"""End-to-end download throughput against local stand-ins for every external service.
+
+Starts a child process that plays audioz (search and plugin pages), peeplink,
+the Real-Debrid unrestrict API and two Range-capable file hosters, each with
+configurable latency, bandwidth and failure injection. The benchmark then runs
+the code behind SearchWorker and DownloadWorker (search_page and
+ReleaseDownloader) against them and reports MB/s, time to first byte and the
+client's CPU use per scenario. The services run in their own process so the
+CPU numbers only cover the downloader.
+
+    python benchmarks/e2e.py
+    python benchmarks/e2e.py --scenario wan --scenario flaky --runs 3
+    python benchmarks/e2e.py --scenario custom --latency-ms 80 --bandwidth-mb 5 --failure-rate 0.2
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import audiozcore
+from audiozcore import (
+    DownloadHooks,
+    DownloadScheduler,
+    ReleaseDownloader,
+    TransferRegistry,
+    make_session,
+    metrics,
+    search_page,
+    tracer,
+)
+
+# latency_ms is added before every response, bandwidth_mb caps each hoster
+# connection, failure_rate cuts that share of transfers halfway, rd_failure_rate
+# answers that share of unrestrict calls with a 503, dead_mirror makes the
+# first mirror of every part answer 404 so each part falls back to the second
+SCENARIOS = {
+    "local": {},
+    "wan": {"latency_ms": 40, "bandwidth_mb": 20},
+    "slow": {"latency_ms": 150, "bandwidth_mb": 2},
+    "flaky": {"latency_ms": 20, "bandwidth_mb": 20, "failure_rate": 0.15, "rd_failure_rate": 0.1},
+    "dead_mirror": {"latency_ms": 20, "dead_mirror": True},
+}
+
+DEFAULTS = {
+    "latency_ms": 0,
+    "bandwidth_mb": 0,
+    "failure_rate": 0.0,
+    "rd_failure_rate": 0.0,
+    "dead_mirror": False,
+}
+
+def search_html(base, releases):
+    articles = "".join(
+        f'<article><h2>Bench Release {i}</h2>'
+        f'<a class="permalink" href="{base}/software/release-{i}.html">more</a>'
+        f'<span class="author">bench</span><time>today</time>'
+        f'<section class="descr">synthetic release {i}</section></article>'
+        for i in range(1, releases + 1)
+    )
+    return f"<html><body>{articles}</body></html>"
+
+def plugin_html(base, i):
+    return (
+        f"<html><body><h1>Bench Release {i}</h1>"
+        f'<div class="DL_Blocks download"><a href="{base}/peeplink.in/r{i}">Download</a></div>'
+        f"</body></html>"
+    )
+
+def peeplink_html(mirrors, i, parts, dead_mirror):
+    links = []
+    for n, mirror in enumerate(sorted(mirrors)):
+        # ReleaseDownloader tries hosts in sorted order, so the first one is the one to kill
+        folder = "dead" if dead_mirror and n == 0 else "files"
+        for part in range(1, parts + 1):
+            links.append(f'<a href="{mirror}/{folder}/release{i}.part{part}.rar">part {part}</a>')
+    return f"<html><body><article>{''.join(links)}</article></body></html>"
+
+def serve(config, ready):
+    """Child process: every stand-in service on two loopback ports"""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    payload = os.urandom(config["part_size"])
+    rng = random.Random(config.get("seed", 1))
+    rng_lock = threading.Lock()
+    bandwidth = config["bandwidth_mb"] * 1024 * 1024
+
+    def roll(rate):
+        with rng_lock:
+            return rng.random() < rate
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, body, status=200, content_type="text/html"):
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def wait_latency(self):
+            if config["latency_ms"]:
+                time.sleep(config["latency_ms"] / 1000)
+
+        def do_POST(self):
+            self.wait_latency()
+            length = int(self.headers.get("Content-Length") or 0)
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            path = urlparse(self.path).path
+            if path == "/rest/1.0/unrestrict/link":
+                if roll(config["rd_failure_rate"]):
+                    return self.send_body('{"error": "hoster_unavailable"}', 503, "application/json")
+                link = form.get("link", [""])[0]
+                if "/dead/" in link:
+                    # Real-Debrid checks the hoster first and refuses links to missing files
+                    return self.send_body('{"error": "unavailable_file"}', 503, "application/json")
+                return self.send_body(json.dumps({"download": link}), 200, "application/json")
+            if path == "/" and form.get("do") == ["search"]:
+                return self.send_body(search_html(config["base"], config["releases"]))
+            self.send_body("not found", 404)
+
+        def do_GET(self):
+            self.wait_latency()
+            path = urlparse(self.path).path
+            m = re.match(r"/software/release-(\d+)\.html$", path)
+            if m:
+                return self.send_body(plugin_html(config["base"], m.group(1)))
+            m = re.match(r"/peeplink\.in/r(\d+)$", path)
+            if m:
+                return self.send_body(
+                    peeplink_html(config["mirrors"], m.group(1), config["parts"], config["dead_mirror"])
+                )
+            if path.startswith("/files/"):
+                return self.send_file()
+            self.send_body("not found", 404)
+
+        def send_file(self):
+            start = 0
+            m = re.match(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if m:
+                start = int(m.group(1))
+                if start >= len(payload):
+                    return self.send_body("", 416)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(payload) - start))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+            # A cut transfer stops halfway through what was asked for
+            end = len(payload)
+            if roll(config["failure_rate"]):
+                end = start + (len(payload) - start) // 2
+            sent = 0
+            started = time.monotonic()
+            view = memoryview(payload)
+            try:
+                for offset in range(start, end, 64 * 1024):
+                    chunk = view[offset:min(offset + 64 * 1024, end)]
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    if bandwidth:
+                        ahead = sent / bandwidth - (time.monotonic() - started)
+                        if ahead > 0:
+                            time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            if end < len(payload):
+                self.close_connection = True
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            # Clients hanging up on a cut transfer are part of the test
+            pass
+
+    servers = [Server(("127.0.0.1", 0), Handler) for _ in range(2)]
+    config["base"] = f"http://127.0.0.1:{servers[0].server_address[1]}"
+    config["mirrors"] = [f"http://127.0.0.1:{s.server_address[1]}" for s in servers]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    ready.put((config["base"], hashlib.sha256(payload).hexdigest()))
+    threading.Event().wait()
+
+def counter_total(name):
+    return sum(value for (counter, _), value in metrics.counters.items() if counter == name)
+
+def run_scenario(name, config, args):
+    config = dict(DEFAULTS, **config)
+    config.update(
+        part_size=int(args.size_mb * 1024 * 1024),
+        parts=args.parts,
+        releases=args.releases,
+    )
+    ready = multiprocessing.Queue()
+    services = multiprocessing.Process(target=serve, args=(config, ready), daemon=True)
+    services.start()
+    base, digest = ready.get(timeout=30)
+    audiozcore.RD_API_URL = f"{base}/rest/1.0"
+
+    workdir = tempfile.mkdtemp(prefix="audioz-e2e-")
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    tracer.clear()
+    tracer.enabled = True
+    retries_before = counter_total("audioz_download_retries_total")
+    fallbacks_before = counter_total("audioz_download_fallbacks_total")
+    try:
+        # What SearchWorker does
+        session = make_session("")
+        search_started = time.perf_counter()
+        results = search_page(session, "bench", base)
+        search_ms = (time.perf_counter() - search_started) * 1000
+
+        # What DownloadWorker does, one thread per release sharing the app's registries
+        scheduler = DownloadScheduler(args.connections)
+        transfers = TransferRegistry()
+        outcomes = {}
+
+        def download(i, result):
+            downloader = ReleaseDownloader(
+                result["url"],
+                "",
+                base,
+                "bench-token",
+                job_id=f"release{i}",
+                max_retries=args.retries,
+                retry_delay=args.retry_delay,
+                transfers=transfers,
+                hooks=DownloadHooks(),
+                scheduler=scheduler,
+            )
+            outcomes[i] = downloader.run()
+
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        threads = [threading.Thread(target=download, args=(i, r)) for i, r in enumerate(results, 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+
+        intact = 0
+        downloaded = 0
+        for filename in os.listdir(audiozcore.DOWNLOADS_FOLDER):
+            path = os.path.join(audiozcore.DOWNLOADS_FOLDER, filename)
+            downloaded += os.path.getsize(path)
+            with open(path, "rb") as f:
+                intact += hashlib.sha256(f.read()).hexdigest() == digest
+    finally:
+        tracer.enabled = False
+        os.chdir(previous_dir)
+        services.terminate()
+
+    stages = tracer.summary()
+    expected_parts = args.releases * args.parts
+    return {
+        "scenario": name,
+        "config": {k: config[k] for k in DEFAULTS},
+        "releases_ok": sum(outcomes.values()),
+        "parts_intact": intact,
+        "parts_expected": expected_parts,
+        "mb": round(downloaded / 1024 / 1024, 2),
+        "seconds": round(wall, 3),
+        "mb_per_s": round(downloaded / 1024 / 1024 / wall, 2) if wall else 0,
+        "search_ms": round(search_ms, 1),
+        "ttfb_p50_ms": stages.get("ttfb", {}).get("p50_ms", 0),
+        "ttfb_p95_ms": stages.get("ttfb", {}).get("p95_ms", 0),
+        "rd_p50_ms": stages.get("rd_unrestrict", {}).get("p50_ms", 0),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_percent": round(cpu / wall * 100, 1) if wall else 0,
+        "cpu_ms_per_mb": round(cpu * 1000 / (downloaded / 1024 / 1024), 2) if downloaded else 0,
+        "retries": int(counter_total("audioz_download_retries_total") - retries_before),
+        "fallbacks": int(counter_total("audioz_download_fallbacks_total") - fallbacks_before),
+        "workdir": workdir,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS) + ["custom"],
+        help="run only these, repeatable (default: all named scenarios)",
+    )
+    parser.add_argument("--runs", type=int, default=1, help="runs per scenario, the median run is reported")
+    parser.add_argument("--releases", type=int, default=3, help="releases downloaded at the same time")
+    parser.add_argument("--parts", type=int, default=4, help="parts per release")
+    parser.add_argument("--size-mb", type=float, default=8, help="size of each part")
+    parser.add_argument("--connections", type=int, default=3, help="download slots, like Simultaneous Downloads")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--retry-delay", type=float, default=0.2)
+    parser.add_argument("--latency-ms", type=float, help="for --scenario custom")
+    parser.add_argument("--bandwidth-mb", type=float, help="for --scenario custom, per connection")
+    parser.add_argument("--failure-rate", type=float, help="for --scenario custom")
+    parser.add_argument("--rd-failure-rate", type=float, help="for --scenario custom")
+    parser.add_argument("--dead-mirror", action="store_true", help="for --scenario custom")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--keep", action="store_true", help="keep the downloaded files")
+    args = parser.parse_args()
+
+    custom = {
+        key: value
+        for key, value in (
+            ("latency_ms", args.latency_ms),
+            ("bandwidth_mb", args.bandwidth_mb),
+            ("failure_rate", args.failure_rate),
+            ("rd_failure_rate", args.rd_failure_rate),
+            ("dead_mirror", args.dead_mirror or None),
+        )
+        if value is not None
+    }
+    scenarios = dict(SCENARIOS, custom=custom)
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        runs = []
+        for _ in range(args.runs):
+            run = run_scenario(name, scenarios[name], args)
+            if not args.keep:
+                shutil.rmtree(run["workdir"], ignore_errors=True)
+            runs.append(run)
+        runs.sort(key=lambda run: run["mb_per_s"])
+        result = runs[len(runs) // 2]
+        if args.runs > 1:
+            result["mb_per_s_runs"] = [run["mb_per_s"] for run in runs]
+            result["mb_per_s_stdev"] = round(statistics.pstdev(result["mb_per_s_runs"]), 2)
+        results.append(result)
+        print(
+            f"{name:<12} {result['mb_per_s']:>8.1f} MB/s  "
+            f"ttfb p50 {result['ttfb_p50_ms']:>6.1f} ms p95 {result['ttfb_p95_ms']:>6.1f} ms  "
+            f"rd p50 {result['rd_p50_ms']:>6.1f} ms  "
+            f"cpu {result['cpu_percent']:>5.1f}% ({result['cpu_ms_per_mb']:.2f} ms/MB)  "
+            f"parts {result['parts_intact']}/{result['parts_expected']}  "
+            f"retries {result['retries']} fallbacks {result['fallbacks']}",
+            flush=True,
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Micro-benchmarks for the parsing, grouping and extraction hot paths.
+
+Every input is generated here, so runs are reproducible and nothing touches
+the network. Each benchmark reports the best time per call over several
+repeats. Results can be saved as a JSON baseline and later runs compared to
+it; anything slower than the threshold is flagged and the exit code is 1.
+
+    python benchmarks/micro.py --save                # record a baseline
+    python benchmarks/micro.py                       # compare against it
+    python benchmarks/micro.py --filter extract --repeat 3
+
+Multi-volume rar fixtures need the rar command and the rarfile module (which
+in turn needs unrar, unar, 7z or bsdtar to extract), those cases are skipped
+otherwise.
+"""
+import argparse
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import timeit
+import zipfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from audiozcore import (
+    extract_archive,
+    find_peeplink,
+    group_peeplink_links,
+    parse_cookie_string,
+    parse_search_results,
+)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "micro_baseline.json")
+BASE_URL = "https://audioz.download"
+HOSTS = ["rapidgator.net", "nitroflare.com", "ddownload.com", "katfile.com", "turbobit.net", "1fichier.com"]
+
+def filler(rng, paragraphs):
+    """Comment-section style markup that the parsers have to walk past"""
+    words = ["plugin", "preset", "wavetable", "synth", "vst3", "kontakt", "mixing", "update", "thanks", "works"]
+    blocks = []
+    for i in range(paragraphs):
+        text = " ".join(rng.choice(words) for _ in range(40))
+        blocks.append(
+            f'<div class="comment" id="c{i}"><span class="author">user{i}</span>'
+            f'<a href="/user/user{i}/">profile</a><p>{text}</p></div>'
+        )
+    return "".join(blocks)
+
+def search_page_html(results, rng):
+    articles = []
+    for i in range(results):
+        articles.append(
+            f'<article class="story"><h2><a href="/software/{i}-plugin.html">Vendor Plugin {i} v1.{i} WiN MAC</a></h2>'
+            f'<a class="permalink" href="/software/{i}-plugin.html">more</a>'
+            f'<img data-src="/uploads/posts/{i}.jpg" alt="">'
+            f'<span class="author">uploader{i % 7}</span><time>{1 + i % 28} Jan 2024</time>'
+            f'<section class="descr">{filler(rng, 1)}</section></article>'
+        )
+    return f"<html><body><div id=\"dle-content\">{''.join(articles)}</div></body></html>"
+
+def plugin_page_html(comments, rng, in_block=True):
+    link = "https://peeplink.in/a1b2c3d4e5"
+    if in_block:
+        download = f'<div class="DL_Blocks download"><a href="{link}">Download</a></div>'
+    else:
+        # Only reachable through the regex fallback at the end of find_peeplink
+        download = f"<script>var dl = '{link}';</script>"
+    return (
+        f"<html><head><title>Plugin</title></head><body><article><h1>Plugin</h1>"
+        f"{filler(rng, 3)}{download}</article><section id=\"comments\">{filler(rng, comments)}</section>"
+        f"</body></html>"
+    )
+
+def peeplink_html(files, parts, hosts):
+    links = []
+    for host in hosts:
+        for f in range(files):
+            for part in range(1, parts + 1):
+                links.append(f'<a href="https://{host}/file/{f}{part}/Vendor.Plugin.{f}.part{part}.rar">{host}</a><br>')
+    return f"<html><body><article><h1>Links</h1>{''.join(links)}</article></body></html>"
+
+def cookie_string(count):
+    return "; ".join(f"cookie_{i}=value{i}{'x' * (i % 30)}" for i in range(count))
+
+def random_bytes(rng, size):
+    return rng.getrandbits(size * 8).to_bytes(size, "little")
+
+def make_zip(folder, files, size, rng):
+    path = os.path.join(folder, "fixture.zip")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for i in range(files):
+            z.writestr(f"Samples/sample{i}.wav", random_bytes(rng, size // 2) + bytes(size // 2))
+    return path
+
+def make_tar(folder, files, size, rng):
+    path = os.path.join(folder, "fixture.tgz")
+    with tarfile.open(path, "w:gz") as t:
+        for i in range(files):
+            data = random_bytes(rng, size // 2) + bytes(size // 2)
+            info = tarfile.TarInfo(f"Samples/sample{i}.wav")
+            info.size = len(data)
+            t.addfile(info, io.BytesIO(data))
+    return path
+
+def make_multivolume_rar(folder, files, size, rng):
+    """First volume of a rar split into several parts, None without the tools"""
+    rar = shutil.which("rar")
+    if not rar or not importlib.util.find_spec("rarfile"):
+        return None
+    source = os.path.join(folder, "rar_source")
+    os.makedirs(source)
+    for i in range(files):
+        with open(os.path.join(source, f"sample{i}.wav"), "wb") as f:
+            f.write(random_bytes(rng, size))
+    volume_kb = max(64, files * size // 1024 // 4)
+    subprocess.run(
+        [rar, "a", "-ep1", "-m0", f"-v{volume_kb}k", os.path.join(folder, "fixture.rar"), source],
+        check=True,
+        capture_output=True,
+    )
+    volumes = sorted(f for f in os.listdir(folder) if f.startswith("fixture.part") and f.endswith(".rar"))
+    return os.path.join(folder, volumes[0]) if volumes else None
+
+def build_benchmarks(workdir):
+    """name -> zero-argument callable, in the order they are reported"""
+    rng = random.Random(1234)
+    benches = {}
+
+    for results in (30, 300):
+        html = search_page_html(results, rng)
+        benches[f"parse_search_results[{results} results]"] = lambda html=html: parse_search_results(html, BASE_URL)
+
+    for comments in (10, 200, 1000):
+        html = plugin_page_html(comments, rng)
+        benches[f"find_peeplink[{len(html) // 1024} KB]"] = lambda html=html: find_peeplink(html)
+    html = plugin_page_html(200, rng, in_block=False)
+    benches[f"find_peeplink[{len(html) // 1024} KB, regex fallback]"] = lambda html=html: find_peeplink(html)
+
+    for files, parts, hosts in ((1, 10, 3), (2, 50, 6), (4, 60, 6)):
+        html = peeplink_html(files, parts, HOSTS[:hosts])
+        links = files * parts * hosts
+        benches[f"group_peeplink_links[{links} links]"] = lambda html=html: group_peeplink_links(html)
+
+    for count in (5, 50):
+        text = cookie_string(count)
+        benches[f"parse_cookie_string[{count} cookies]"] = lambda text=text: parse_cookie_string(text)
+
+    fixtures = os.path.join(workdir, "fixtures")
+    os.makedirs(fixtures)
+    archives = [
+        ("zip", make_zip(fixtures, 40, 256 * 1024, rng)),
+        ("tar.gz", make_tar(fixtures, 40, 256 * 1024, rng)),
+        ("multi-volume rar", make_multivolume_rar(fixtures, 8, 512 * 1024, rng)),
+    ]
+    for label, path in archives:
+        if not path:
+            print(f"skipping extract_archive[{label}]: rar and rarfile are needed to build the fixture")
+            continue
+        destination = os.path.join(workdir, "out", label.replace(" ", "_"))
+
+        def extract(path=path, destination=destination):
+            shutil.rmtree(destination, ignore_errors=True)
+            if not extract_archive(path, destination):
+                raise RuntimeError(f"extract_archive failed on {path}")
+
+        benches[f"extract_archive[{label}, {os.path.getsize(path) // 1024} KB]"] = extract
+    return benches
+
+def measure(func, repeat):
+    """Best seconds per call, timeit picks the number of calls per repeat"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number, number
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.1f} us"
+    return f"{seconds * 1e3:9.2f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="repeats per benchmark, the best one counts")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="JSON file to compare against and --save to")
+    parser.add_argument("--save", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f).get("results", {})
+
+    workdir = tempfile.mkdtemp(prefix="audioz-micro-")
+    regressions = []
+    results = {}
+    try:
+        benches = build_benchmarks(workdir)
+        for name, func in benches.items():
+            if args.filter and args.filter not in name:
+                continue
+            seconds, number = measure(func, args.repeat)
+            results[name] = {"seconds": seconds, "calls": number}
+            line = f"{name:<52} {format_time(seconds)}"
+            old = baseline.get(name)
+            if old:
+                change = seconds / old["seconds"] - 1
+                line += f"  {change:+7.1%} vs baseline"
+                if change > args.threshold:
+                    line += "  REGRESSION"
+                    regressions.append(name)
+            print(line, flush=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(
+                {
+                    "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"baseline written to {args.baseline}")
+    elif not baseline:
+        print(f"no baseline at {args.baseline}, run with --save to record one")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
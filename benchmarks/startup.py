@@ -0,0 +1,69 @@
+"""Time from launching audiozdownloader.py to its first window being shown.
+
+Runs the app with --startup-benchmark several times and reports the
+in-process time (interpreter ready -> first window) and the wall time of
+the whole process including interpreter startup and shutdown.
+
+    python benchmarks/startup.py --runs 10
+
+Every run starts in a fresh temporary directory, so it measures a first
+launch with default settings and touches nothing of an existing install.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "audiozdownloader.py")
+
+def run_once(env):
+    # The app keeps settings, jobs.db, downloads and logs in its working directory,
+    # an empty one keeps it from resuming the jobs of a real install
+    with tempfile.TemporaryDirectory(prefix="audioz-startup-") as workdir:
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, APP, "--startup-benchmark"],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=workdir,
+            timeout=60,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+    for line in proc.stdout.splitlines():
+        if line.startswith("first_window_ms="):
+            return float(line.split("=", 1)[1]), wall_ms
+    raise RuntimeError(f"App did not report startup time:\n{proc.stdout}\n{proc.stderr}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--platform",
+        help="QT_QPA_PLATFORM to use (default: the environment's, else offscreen, which works without a display)",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.platform:
+        env["QT_QPA_PLATFORM"] = args.platform
+    else:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # First run warms the OS file cache and .pyc files, it is not counted
+    run_once(env)
+    first_window, wall = [], []
+    for _ in range(args.runs):
+        in_process_ms, wall_ms = run_once(env)
+        first_window.append(in_process_ms)
+        wall.append(wall_ms)
+
+    print(f"runs: {args.runs}")
+    print(f"time to first window: median {statistics.median(first_window):.1f} ms, min {min(first_window):.1f} ms")
+    print(f"process wall time:    median {statistics.median(wall):.1f} ms, min {min(wall):.1f} ms")
+
+if __name__ == "__main__":
+    main()